@@ -0,0 +1,123 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from api.session import HTTPSession
+from utils.config import TestData
+
+
+class AsyncUtility:
+    """
+    Asyncio counterpart of api.utility.Utility.
+
+    Requests are sent through the pooled HTTPSession on a worker pool sized to max_concurrency, using its
+    no-retry session so a request that timed out is not retried behind the caller's back. The timeout bounds
+    the whole request from the moment it is sent; time spent waiting for a free slot does not count.
+
+    Example:
+        util = AsyncUtility(max_concurrency=10)
+        responses = util.run_batch([
+            {'url': 'https://api.example.com/data/1'},
+            {'url': 'https://api.example.com/data', 'method': 'POST', 'data': {'key': 'value'}},
+        ])
+    """
+
+    SUPPORTED_METHODS = ('GET', 'POST', 'PUT', 'DELETE')
+
+    def __init__(self, max_concurrency=None, timeout=None):
+        self.max_concurrency = max_concurrency or TestData.API_MAX_CONCURRENCY
+        self.timeout = TestData.HTTP_TIMEOUT if timeout is None else timeout
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix='api-request')
+        self._semaphore = None
+        self._semaphore_loop = None
+
+    def _get_semaphore(self):
+        # a semaphore is bound to the loop it is first used in, so keep one per running loop
+        loop = asyncio.get_running_loop()
+        if self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def make_api_request(self, url, method='GET', headers=None, data=None, params=None, timeout=None):
+        """
+        Makes an API request without blocking the event loop.
+
+        Args:
+            url (str): The URL of the API endpoint.
+            method (str): The HTTP method (GET, POST, PUT or DELETE).
+            headers (dict): Optional headers to include in the request.
+            data: Optional data to include in the request body as JSON (ignored for GET and DELETE).
+            params (dict): Optional query parameters.
+            timeout (float): Seconds to wait for this request, defaults to the client timeout.
+
+        Returns:
+            requests.Response: The response object.
+
+        Raises:
+            ValueError: If the HTTP method is not supported.
+            TimeoutError: If connecting or waiting for the response takes longer than the timeout.
+        """
+        method = method.upper()
+        if method not in self.SUPPORTED_METHODS:
+            raise ValueError(f"Unsupported HTTP method: {method}")
+        body = data if method in ('POST', 'PUT') else None
+        timeout = self.timeout if timeout is None else timeout
+        message = f"{method} {url} timed out after {timeout} seconds"
+
+        def _send():
+            # the socket timeouts (connect and each read) make sure the worker thread is freed after a stalled
+            # request, asyncio.wait_for below bounds the request as a whole
+            try:
+                return HTTPSession.get_session(retries=False).request(method, url, headers=headers, params=params,
+                                                                      json=body, timeout=(timeout, timeout))
+            except requests.Timeout as e:
+                raise TimeoutError(message) from e
+
+        semaphore = self._get_semaphore()
+        await semaphore.acquire()
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._executor, _send)
+        # the slot stays taken until the worker thread is done, also when the caller stopped waiting for it
+        future.add_done_callback(lambda _: semaphore.release())
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError as e:
+            if future.done():
+                raise
+            raise TimeoutError(message) from e
+
+    async def send_get_request(self, url, headers=None, params=None, timeout=None):
+        return await self.make_api_request(url, 'GET', headers=headers, params=params, timeout=timeout)
+
+    async def send_post_request(self, url, json=None, headers=None, timeout=None):
+        return await self.make_api_request(url, 'POST', headers=headers, data=json, timeout=timeout)
+
+    async def send_put_request(self, url, json=None, headers=None, timeout=None):
+        return await self.make_api_request(url, 'PUT', headers=headers, data=json, timeout=timeout)
+
+    async def send_delete_request(self, url, headers=None, timeout=None):
+        return await self.make_api_request(url, 'DELETE', headers=headers, timeout=timeout)
+
+    async def gather(self, request_specs, return_exceptions=False):
+        """
+        Sends a batch of requests concurrently, at most max_concurrency at a time.
+
+        Args:
+            request_specs (list): Dicts with the make_api_request arguments, e.g.
+                {'url': ..., 'method': 'POST', 'headers': {...}, 'data': {...}, 'timeout': 5}.
+            return_exceptions (bool): Return exceptions in place of failed responses instead of raising.
+
+        Returns:
+            list: The responses, in the same order as request_specs.
+        """
+        return await asyncio.gather(*(self.make_api_request(**spec) for spec in request_specs),
+                                    return_exceptions=return_exceptions)
+
+    def run_batch(self, request_specs, return_exceptions=False):
+        """ Blocking wrapper around gather() for use from synchronous tests """
+        return asyncio.run(self.gather(request_specs, return_exceptions=return_exceptions))
+
+    def close(self):
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,136 @@
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib.parse import urldefrag, urlsplit
+
+from requests import RequestException
+
+from api.session import HTTPSession
+from utils.config import TestData
+
+LinkStatus = namedtuple('LinkStatus', ['url', 'status', 'ok', 'elapsed_ms', 'method', 'error'])
+
+# servers that do not implement HEAD answer with one of these, retry them with GET
+_HEAD_NOT_SUPPORTED = (403, 405, 501)
+
+
+class LinkChecker:
+    """
+    Checks that links resolve, in parallel, through the pooled HTTPSession.
+
+    Links are de-duplicated (fragments ignored), checked with HEAD (falling back to a streamed GET when HEAD is
+    not supported) with at most per_host_limit requests per host at a time. Definitive HTTP statuses are cached
+    for the rest of the run and a link being checked by another thread is waited for, so a link shared by many
+    pages is only checked once; timeouts, connection errors and TestData.HTTP_RETRY_STATUSES are checked again.
+
+    eg:
+        report = LinkChecker().check_page(driver.current_url, [link.href for link in login_page.find_links()])
+        assert not report['broken'], report['broken']
+    """
+    _cache = {}
+    _in_flight = {}
+    _cache_lock = threading.Lock()
+
+    def __init__(self, max_workers=None, per_host_limit=None, timeout=None):
+        self.max_workers = max_workers or TestData.LINK_CHECK_MAX_WORKERS
+        self.per_host_limit = per_host_limit or TestData.LINK_CHECK_PER_HOST
+        self.timeout = timeout or TestData.HTTP_TIMEOUT
+        self._host_limits = {}
+        self._host_lock = threading.Lock()
+
+    @classmethod
+    def clear_cache(cls):
+        with cls._cache_lock:
+            cls._cache.clear()
+
+    @staticmethod
+    def normalize(urls):
+        """ http(s) links without their fragment, de-duplicated in first-seen order """
+        unique = {}
+        for url in urls:
+            if not url:
+                continue
+            url = urldefrag(url.strip())[0]
+            if urlsplit(url).scheme in ('http', 'https'):
+                unique.setdefault(url, None)
+        return list(unique)
+
+    def _host_limit(self, url):
+        host = urlsplit(url).netloc
+        with self._host_lock:
+            limit = self._host_limits.get(host)
+            if limit is None:
+                limit = self._host_limits[host] = threading.BoundedSemaphore(self.per_host_limit)
+        return limit
+
+    def _request(self, method, url):
+        session = HTTPSession.get_session()
+        response = session.request(method, url, allow_redirects=True, timeout=self.timeout,
+                                   stream=method == 'GET')
+        response.close()
+        return response.status_code
+
+    def _check(self, url):
+        with self._cache_lock:
+            cached = self._cache.get(url)
+            if cached is not None:
+                return cached
+            pending = self._in_flight.get(url)
+            if pending is None:
+                future = self._in_flight[url] = Future()
+        if pending is not None:
+            return pending.result()
+        try:
+            result = self._fetch(url)
+        except BaseException as e:
+            with self._cache_lock:
+                del self._in_flight[url]
+            future.set_exception(e)
+            raise
+        with self._cache_lock:
+            if result.status is not None and result.status not in TestData.HTTP_RETRY_STATUSES:
+                self._cache[url] = result
+            del self._in_flight[url]
+        future.set_result(result)
+        return result
+
+    def _fetch(self, url):
+        start = time.perf_counter()
+        method, status, error = 'HEAD', None, None
+        with self._host_limit(url):
+            try:
+                status = self._request(method, url)
+                if status in _HEAD_NOT_SUPPORTED:
+                    method = 'GET'
+                    status = self._request(method, url)
+            except RequestException as e:
+                error = str(e)
+        return LinkStatus(url, status, status is not None and status < 400,
+                          round((time.perf_counter() - start) * 1000, 1), method, error)
+
+    def check(self, urls):
+        """
+        Checks the given links concurrently.
+        :param urls: iterable of links, duplicates and non-http(s) links are skipped
+        :return: list of LinkStatus in first-seen order
+        """
+        urls = self.normalize(urls)
+        if not urls:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(urls)),
+                                thread_name_prefix='link-check') as executor:
+            return list(executor.map(self._check, urls))
+
+    def check_page(self, page_url, urls):
+        """
+        Checks the links of one page.
+        :return: dict with the page url, number of links checked, broken LinkStatus list and all results
+        """
+        results = self.check(urls)
+        return {
+            'page': page_url,
+            'checked': len(results),
+            'broken': [result for result in results if not result.ok],
+            'results': results,
+        }
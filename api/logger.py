@@ -1,19 +1,111 @@
+import atexit
+import os
+import queue
+import threading
 from datetime import datetime
 
+from utils.config import TestData
+
+
+class BufferedFileSink:
+    """
+    Keeps the log file open and writes records from a background thread in batches.
+
+    Callers only enqueue the record; date prefixing, writing and flushing happen on the writer thread.
+    """
+    _STOP = object()
+
+    def __init__(self, path, batch_size=None):
+        self.path = path
+        self.batch_size = batch_size or TestData.API_LOG_BATCH_SIZE
+        self._queue = queue.Queue()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, 'a', encoding='utf-8')
+        self._thread = threading.Thread(target=self._run, name='api-log-writer', daemon=True)
+        self._thread.start()
+
+    def write(self, text, with_date):
+        self._queue.put((datetime.now() if with_date else None, text))
+
+    def flush(self):
+        """ Blocks until every record queued so far is written and flushed to disk """
+        if self._thread.is_alive():
+            self._queue.join()
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(self._STOP)
+            self._thread.join()
+        self._file.close()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            try:
+                while len(batch) < self.batch_size:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+            stop = self._write_batch(batch)
+            for _ in batch:
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _write_batch(self, batch):
+        stop = False
+        lines = []
+        for record in batch:
+            if record is self._STOP:
+                stop = True
+                continue
+            date, text = record
+            if date is not None:
+                prefix = f'{date} - '
+                text = prefix + text.replace('\n', '\n' + prefix)
+            lines.append(text + '\n')
+        self._file.writelines(lines)
+        self._file.flush()
+        return stop
+
 
 class Logger:
+    console_enabled = TestData.API_LOG_TO_CONSOLE
+    file_enabled = TestData.API_LOG_TO_FILE
+    log_file = TestData.API_LOG_FILE
+
+    _sink = None
+    _sink_lock = threading.Lock()
+
+    @classmethod
+    def configure(cls, to_console=None, to_file=None, log_file=None):
+        """
+        Switches the console and file outputs on or off for all following log calls.
+
+        Args:
+            to_console (bool): Print log records to the console.
+            to_file (bool): Write log records to the log file.
+            log_file (str): Path of the log file. Pending records are flushed to the previous file first.
+        """
+        if to_console is not None:
+            cls.console_enabled = to_console
+        if to_file is not None:
+            cls.file_enabled = to_file
+        if log_file is not None and log_file != cls.log_file:
+            cls.close()
+            cls.log_file = log_file
 
     @classmethod
     def log(cls, text, to_console=True, to_file=True, with_date=True):
-        if to_console:
+        if to_console and cls.console_enabled:
             print(text)
-        if to_file:
+        if to_file and cls.file_enabled:
             cls.write_to_file(text, with_date)
 
     @classmethod
     def log_request(cls, request_type, url, params, response_status_code):
         text = '\n'.join([
-            f'Executed {request_type.__name__.upper()} request',
+            f'Executed {request_type.upper()} request',
             f'URL: {url}',
             f'PARAMETERS: {params}',
             f'RESPONSE STATUS CODE: {response_status_code}'
@@ -45,8 +137,30 @@ class Logger:
 
     @classmethod
     def write_to_file(cls, text, with_date):
-        current_date_n_time = datetime.now()
-        if with_date:
-            text = '\n'.join([f'{current_date_n_time} - {l}' for l in text.split('\n')])
-        with open('tests_output.log', 'a', encoding='utf-8') as f:
-            f.write(text)
\ No newline at end of file
+        cls._get_sink().write(text, with_date)
+
+    @classmethod
+    def _get_sink(cls):
+        if cls._sink is None:
+            with cls._sink_lock:
+                if cls._sink is None:
+                    cls._sink = BufferedFileSink(cls.log_file)
+        return cls._sink
+
+    @classmethod
+    def flush(cls):
+        """ Waits until all pending log records are on disk """
+        if cls._sink is not None:
+            cls._sink.flush()
+
+    @classmethod
+    def close(cls):
+        """ Flushes pending log records and closes the log file; the next log call reopens it """
+        with cls._sink_lock:
+            sink, cls._sink = cls._sink, None
+        if sink is not None:
+            sink.close()
+
+
+# flush whatever is still queued when the interpreter exits, including after an unhandled exception
+atexit.register(Logger.close)
@@ -1,17 +1,181 @@
 import json
+import threading
+
 import requests
 from requests import RequestException
-from logger import Logger
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+from api.logger import Logger
+from utils.config import TestData
+
+
+class ConnectionStats:
+    """ Thread-safe counters for connection reuse across the pooled session """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.misses = 0
+
+    def record_checkout(self):
+        with self._lock:
+            self.checkouts += 1
+
+    def record_miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.misses = 0
+
+    def snapshot(self):
+        """
+        Returns the current counters.
+
+        Returns:
+            dict: 'hits' (requests served by a kept-alive connection), 'misses' (new connections opened)
+            and 'requests' (total connection checkouts).
+        """
+        with self._lock:
+            return {
+                'hits': self.checkouts - self.misses,
+                'misses': self.misses,
+                'requests': self.checkouts,
+            }
+
+
+class _CountingPoolMixin:
+    stats = None
+
+    def _get_conn(self, timeout=None):
+        self.stats.record_checkout()
+        return super()._get_conn(timeout)
+
+    def _new_conn(self):
+        self.stats.record_miss()
+        return super()._new_conn()
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """ HTTPAdapter whose per-host pools report connection reuse to a ConnectionStats instance """
+
+    def __init__(self, stats, **kwargs):
+        self.stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        super().init_poolmanager(connections, maxsize, block, **pool_kwargs)
+        stats = self.stats
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': type('CountingHTTPConnectionPool', (_CountingPoolMixin, HTTPConnectionPool), {'stats': stats}),
+            'https': type('CountingHTTPSConnectionPool', (_CountingPoolMixin, HTTPSConnectionPool), {'stats': stats}),
+        }
 
 
 class HTTPSession:
     URL = 'https://api.test.virta-ev.com/v4/'
 
-    @staticmethod
-    def send_request(request_type, endpoint, params):
+    _session = None
+    _no_retry_session = None
+    _settings = {}
+    _lock = threading.Lock()
+    stats = ConnectionStats()
+
+    @classmethod
+    def configure(cls, pool_connections=None, pool_maxsize=None, pool_block=None, max_retries=None,
+                  backoff_factor=None, retry_statuses=None, timeout=None):
+        """
+        Overrides the pool settings from TestData. The current session is closed and rebuilt on next use.
+
+        Args:
+            pool_connections (int): Number of per-host connection pools to keep alive.
+            pool_maxsize (int): Max connections kept per host.
+            pool_block (bool): Wait for a free connection instead of opening more than pool_maxsize per host.
+            max_retries (int): Retries for failed connections and retry_statuses responses.
+            backoff_factor (float): Backoff factor between retries.
+            retry_statuses (tuple): Response status codes that trigger a retry.
+            timeout (float): Default request timeout in seconds.
+        """
+        overrides = {
+            'pool_connections': pool_connections,
+            'pool_maxsize': pool_maxsize,
+            'pool_block': pool_block,
+            'max_retries': max_retries,
+            'backoff_factor': backoff_factor,
+            'retry_statuses': retry_statuses,
+            'timeout': timeout,
+        }
+        with cls._lock:
+            cls._settings.update({key: value for key, value in overrides.items() if value is not None})
+        cls.close()
+
+    @classmethod
+    def setting(cls, name):
+        return cls._settings.get(name, getattr(TestData, 'HTTP_' + name.upper()))
+
+    @classmethod
+    def get_session(cls, retries=True):
+        """
+        Returns the shared keep-alive session, creating it on first use.
+
+        Args:
+            retries (bool): False returns a second shared session that never retries, for callers that enforce
+                their own timeout and must not keep a request running after giving up on it.
+        """
+        attribute = '_session' if retries else '_no_retry_session'
+        if getattr(cls, attribute) is None:
+            with cls._lock:
+                if getattr(cls, attribute) is None:
+                    setattr(cls, attribute, cls._create_session(retries))
+        return getattr(cls, attribute)
+
+    @classmethod
+    def _create_session(cls, retries=True):
+        if retries:
+            retries = Retry(
+                total=cls.setting('max_retries'),
+                backoff_factor=cls.setting('backoff_factor'),
+                status_forcelist=cls.setting('retry_statuses'),
+                raise_on_status=False,
+            )
+        else:
+            retries = Retry(total=0, read=False, raise_on_status=False)
+        adapter = PooledHTTPAdapter(
+            cls.stats,
+            pool_connections=cls.setting('pool_connections'),
+            pool_maxsize=cls.setting('pool_maxsize'),
+            pool_block=cls.setting('pool_block'),
+            max_retries=retries,
+        )
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    @classmethod
+    def close(cls):
+        """ Closes the shared sessions and all of their pooled connections """
+        with cls._lock:
+            sessions = (cls._session, cls._no_retry_session)
+            cls._session = cls._no_retry_session = None
+        for session in sessions:
+            if session is not None:
+                session.close()
+
+    @classmethod
+    def connection_stats(cls):
+        return cls.stats.snapshot()
+
+    @classmethod
+    def send_request(cls, request_type, endpoint, params):
         do_logging = params.pop('do_logging', True)
         try:
-            response = request_type(endpoint, params)
+            response = cls.get_session().request(request_type, endpoint, params=params,
+                                                 timeout=cls.setting('timeout'))
             if do_logging:
                 Logger.log_request(request_type, endpoint, params, response.status_code)
             return response.status_code, json.loads(response.text)
@@ -20,7 +184,10 @@ class HTTPSession:
 
 
 class RequestTypes:
-    GET = requests.get
+    GET = 'GET'
+    POST = 'POST'
+    PUT = 'PUT'
+    DELETE = 'DELETE'
 
 
 class Endpoints:
@@ -28,4 +195,4 @@ class Endpoints:
 
 
 class StatusCodes:
-    STATUS_200 = '200'
\ No newline at end of file
+    STATUS_200 = '200'
@@ -1,5 +1,5 @@
 import json
-from datetime import time
+import time
 
 import pytest
 import requests
@@ -9,9 +9,9 @@ class Utility:
 
     @staticmethod
     def measure_time(function):
-        start = time()
+        start = time.perf_counter()
         result = function()
-        end = time()
+        end = time.perf_counter()
         return end - start, result
 
     # Utility function to make an API request
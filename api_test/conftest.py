@@ -0,0 +1,56 @@
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from api.async_utility import AsyncUtility
+from api.logger import Logger
+from api.session import HTTPSession
+from utils import duration_history, impact_selection, timing_plugin
+from utils.data_store import data_store  # noqa: F401 (session fixture)
+
+
+def pytest_configure(config):
+    """ Times the API tests and their pooled requests and runs them longest-first """
+    timing_plugin.register(config)
+    duration_history.register(config)
+    impact_selection.register(config)
+
+
+@pytest.fixture
+def serve():
+    """ Starts local HTTP servers for request handler classes: serve(handler) returns the base url, without a slash """
+    servers = []
+
+    def start(handler):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f'http://127.0.0.1:{server.server_port}'
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture(scope="session")
+def http_session():
+    """ Shares one pooled keep-alive HTTP session across the API tests and closes it at the end of the run """
+    yield HTTPSession
+    HTTPSession.close()
+
+
+@pytest.fixture(scope="session")
+def async_api():
+    """ Concurrent API client sharing the pooled HTTP session """
+    client = AsyncUtility()
+    yield client
+    client.close()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def api_log():
+    """ Flushes the buffered API log at the end of the run """
+    yield Logger
+    Logger.close()
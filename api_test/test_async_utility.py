@@ -0,0 +1,98 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from api.async_utility import AsyncUtility
+from api.session import HTTPSession
+
+
+class _SlowHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    lock = threading.Lock()
+    in_flight = 0
+    max_in_flight = 0
+    hits = []
+
+    def do_GET(self):
+        if self.path.startswith('/trickle'):
+            # every byte arrives well within a socket read timeout, the whole body takes 1.2 s
+            self.send_response(200)
+            self.send_header('Content-Length', '6')
+            self.end_headers()
+            for _ in range(6):
+                self.wfile.write(b'x')
+                self.wfile.flush()
+                time.sleep(0.2)
+            return
+        cls = type(self)
+        with cls.lock:
+            cls.hits.append(self.path)
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        time.sleep(1.0 if self.path.startswith('/slow') else 0.2)
+        with cls.lock:
+            cls.in_flight -= 1
+        self.send_response(200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def slow_server(serve):
+    _SlowHandler.in_flight = _SlowHandler.max_in_flight = 0
+    _SlowHandler.hits = []
+    yield serve(_SlowHandler)
+    HTTPSession.close()
+
+
+class TestAsyncUtility:
+
+    def test_concurrency_is_limited(self, slow_server):
+        client = AsyncUtility(max_concurrency=2)
+        try:
+            responses = client.run_batch([{'url': f'{slow_server}/item/{i}'} for i in range(6)])
+        finally:
+            client.close()
+
+        assert [response.status_code for response in responses] == [200] * 6
+        assert _SlowHandler.max_in_flight == 2
+
+    def test_timeout_is_not_retried(self, slow_server):
+        client = AsyncUtility(timeout=0.2)
+        try:
+            with pytest.raises(TimeoutError):
+                client.run_batch([{'url': f'{slow_server}/slow'}])
+            # give a background retry the time to reach the server
+            time.sleep(1.2)
+        finally:
+            client.close()
+
+        assert _SlowHandler.hits == ['/slow']
+
+    def test_timeout_excludes_time_waiting_for_a_free_slot(self, slow_server):
+        client = AsyncUtility(max_concurrency=1, timeout=0.5)
+        try:
+            # every request takes 0.2 s, the last one waits 0.4 s for its turn before it is sent
+            responses = client.run_batch([{'url': f'{slow_server}/item/{i}'} for i in range(3)])
+        finally:
+            client.close()
+
+        assert [response.status_code for response in responses] == [200] * 3
+
+    def test_timeout_bounds_the_whole_request(self, slow_server):
+        client = AsyncUtility(timeout=0.5)
+        try:
+            start = time.perf_counter()
+            with pytest.raises(TimeoutError):
+                client.run_batch([{'url': f'{slow_server}/trickle'}])
+            elapsed = time.perf_counter() - start
+        finally:
+            client.close()
+
+        assert elapsed < 1.0
@@ -0,0 +1,102 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+import requests
+
+from api.link_checker import LinkChecker
+
+
+class _LinkHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    requests_seen = []
+
+    def _respond(self, body):
+        self.requests_seen.append((self.command, self.path))
+        if self.path.startswith('/slow'):
+            time.sleep(0.2)
+        if self.path.startswith('/missing'):
+            status = 404
+        elif self.path.startswith('/no-head') and self.command == 'HEAD':
+            status = 405
+        else:
+            status = 200
+        self.send_response(status)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        if body:
+            self.wfile.write(b'ok')
+
+    def do_HEAD(self):
+        self._respond(body=False)
+
+    def do_GET(self):
+        self._respond(body=True)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def local_site(serve):
+    _LinkHandler.requests_seen = []
+    LinkChecker.clear_cache()
+    yield serve(_LinkHandler)
+    LinkChecker.clear_cache()
+
+
+class TestLinkChecker:
+
+    def test_check_page_reports_broken_links(self, local_site):
+        links = [f'{local_site}/a', f'{local_site}/a#top', f'{local_site}/missing', f'{local_site}/no-head',
+                 'mailto:someone@example.com', None]
+
+        report = LinkChecker(per_host_limit=2).check_page(f'{local_site}/page', links)
+
+        assert report['checked'] == 3
+        assert [result.url for result in report['broken']] == [f'{local_site}/missing']
+        no_head = report['results'][2]
+        assert (no_head.status, no_head.method, no_head.ok) == (200, 'GET', True)
+
+    def test_results_are_cached_across_checks(self, local_site):
+        LinkChecker().check([f'{local_site}/a'])
+        LinkChecker().check([f'{local_site}/a', f'{local_site}/b'])
+
+        assert _LinkHandler.requests_seen == [('HEAD', '/a'), ('HEAD', '/b')]
+
+    def test_concurrent_checks_of_a_link_share_one_request(self, local_site):
+        start = threading.Barrier(3)
+        results = []
+
+        def check():
+            start.wait()
+            results.extend(LinkChecker().check([f'{local_site}/slow']))
+
+        threads = [threading.Thread(target=check) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert _LinkHandler.requests_seen == [('HEAD', '/slow')]
+        assert len(results) == 3 and all(result.ok for result in results)
+
+    def test_failures_without_a_definitive_status_are_checked_again(self, local_site, monkeypatch):
+        unreachable = f'{local_site}/unreachable'
+        request = LinkChecker._request
+
+        def failing_request(checker, method, url):
+            if url == unreachable:
+                raise requests.ConnectionError(f'Max retries exceeded with url: {url}')
+            return request(checker, method, url)
+
+        monkeypatch.setattr(LinkChecker, '_request', failing_request)
+        checker = LinkChecker()
+
+        first = checker.check([unreachable, f'{local_site}/missing'])
+        second = checker.check([unreachable, f'{local_site}/missing'])
+
+        assert first[0].error and second[0].error and first[0] is not second[0]
+        assert second[1] is first[1]
+        assert _LinkHandler.requests_seen == [('HEAD', '/missing')]
@@ -0,0 +1,118 @@
+import threading
+
+import pytest
+
+from api.logger import BufferedFileSink, Logger
+
+
+@pytest.fixture
+def sink(tmp_path):
+    sink = BufferedFileSink(str(tmp_path / 'logs' / 'api.log'), batch_size=2)
+    yield sink
+    sink.close()
+
+
+@pytest.fixture
+def logger(tmp_path):
+    """ Points the Logger at a file in tmp_path and restores the session settings afterwards """
+    Logger.close()
+    saved = Logger.console_enabled, Logger.file_enabled, Logger.log_file
+    Logger.configure(to_console=False, to_file=True, log_file=str(tmp_path / 'api.log'))
+    yield Logger
+    Logger.close()
+    Logger.console_enabled, Logger.file_enabled, Logger.log_file = saved
+
+
+def read(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+class TestBufferedFileSink:
+
+    def test_records_are_on_disk_after_flush(self, sink):
+        sink.write('first', with_date=False)
+        sink.write('second\nline', with_date=True)
+        sink.flush()
+
+        lines = read(sink.path).splitlines()
+        assert lines[0] == 'first'
+        assert lines[1].endswith(' - second')
+        assert lines[2].endswith(' - line')
+        assert lines[1].split(' - ')[0] == lines[2].split(' - ')[0]
+
+    def test_close_writes_pending_records(self, sink):
+        for i in range(5):
+            sink.write(f'record {i}', with_date=False)
+        sink.close()
+
+        assert read(sink.path) == ''.join(f'record {i}\n' for i in range(5))
+
+    def test_queued_records_are_written_in_batches(self, sink):
+        blocked, release = threading.Event(), threading.Event()
+        batches = []
+        writelines = sink._file.writelines
+
+        def record_batch(lines):
+            batches.append(list(lines))
+            if len(batches) == 1:
+                blocked.set()
+                release.wait(5)
+            writelines(lines)
+
+        sink._file.writelines = record_batch
+        sink.write('r0', with_date=False)
+        assert blocked.wait(5)
+        # the writer thread is busy, so these queue up and are picked up batch_size at a time
+        for i in range(1, 6):
+            sink.write(f'r{i}', with_date=False)
+        release.set()
+        sink.flush()
+
+        assert batches == [['r0\n'], ['r1\n', 'r2\n'], ['r3\n', 'r4\n'], ['r5\n']]
+        assert read(sink.path) == ''.join(f'r{i}\n' for i in range(6))
+
+
+class TestLogger:
+
+    def test_flush_and_close(self, logger):
+        logger.log('after flush', with_date=False)
+        logger.flush()
+        assert read(logger.log_file) == 'after flush\n'
+
+        logger.log('after close', with_date=False)
+        logger.close()
+        assert read(logger.log_file) == 'after flush\nafter close\n'
+
+    def test_log_reopens_the_file_after_close(self, logger):
+        logger.log('before', with_date=False)
+        logger.close()
+        logger.log('after', with_date=False)
+        logger.flush()
+
+        assert read(logger.log_file) == 'before\nafter\n'
+
+    def test_file_output_can_be_switched_off(self, logger):
+        logger.log('written', with_date=False)
+        logger.configure(to_file=False)
+        logger.log('not written', with_date=False)
+        logger.flush()
+
+        assert read(logger.log_file) == 'written\n'
+
+    def test_console_output_can_be_switched(self, logger, capsys):
+        logger.log('silent', to_file=False)
+        logger.configure(to_console=True)
+        logger.log('printed', to_file=False)
+
+        assert capsys.readouterr().out == 'printed\n'
+
+    def test_changing_the_log_file_flushes_the_previous_one(self, logger, tmp_path):
+        first = logger.log_file
+        logger.log('first file', with_date=False)
+        logger.configure(log_file=str(tmp_path / 'other.log'))
+        logger.log('second file', with_date=False)
+        logger.flush()
+
+        assert read(first) == 'first file\n'
+        assert read(logger.log_file) == 'second file\n'
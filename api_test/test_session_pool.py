@@ -0,0 +1,53 @@
+import json
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from api.session import HTTPSession, RequestTypes
+
+
+class _JsonHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = json.dumps({'path': self.path}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def local_server(serve):
+    return serve(_JsonHandler) + '/'
+
+
+class TestSessionPool:
+
+    def test_requests_reuse_pooled_connection(self, local_server):
+        HTTPSession.close()
+        HTTPSession.stats.reset()
+
+        for _ in range(5):
+            status_code, data = HTTPSession.send_request(RequestTypes.GET, local_server + 'stations',
+                                                         {'do_logging': False})
+            assert status_code == 200
+            assert data == {'path': '/stations'}
+
+        assert HTTPSession.connection_stats() == {'hits': 4, 'misses': 1, 'requests': 5}
+        HTTPSession.close()
+
+    def test_configure_rebuilds_session(self, monkeypatch):
+        # the override lives in a throwaway dict, monkeypatch puts the shared settings back afterwards
+        monkeypatch.setattr(HTTPSession, '_settings', {})
+        session = HTTPSession.get_session()
+        HTTPSession.configure(pool_maxsize=2)
+        try:
+            assert HTTPSession.get_session() is not session
+            assert HTTPSession.get_session().get_adapter('http://').poolmanager.connection_pool_kw['maxsize'] == 2
+        finally:
+            HTTPSession.close()
@@ -1,22 +1,122 @@
-import json
+import functools
+import keyword
 import logging
-import os
-import time
+import re
+from collections import namedtuple
 from datetime import datetime
 
+import numpy as np
 import pandas as pd
-import pyautogui
 from bs4 import BeautifulSoup
-from selenium.common import ElementNotVisibleException
+from selenium.common import ElementNotVisibleException, NoSuchElementException, StaleElementReferenceException, \
+    TimeoutException
 from selenium.webdriver import ActionChains
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.select import Select
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+from api.link_checker import LinkChecker
 from utils.config import TestData
 from utils.db_connection import DatabaseHelper
+from utils.download_manager import DownloadManager
+from utils import highlight
+from utils.action_pipeline import ActionPipeline
 from utils.enums import WaitType
+from utils.network_monitor import NetworkMonitor
+from utils.page_metrics import PageMetrics
+from utils.waits import AdaptiveWait, document_ready, resources_settled
+
+# reads the text (and optional attributes) of every cell of every row of arguments[0] in one call
+_GRID_DATA_SCRIPT = """
+var grid = arguments[0], cellTag = arguments[1].toUpperCase(), attributes = arguments[2];
+// only the rows of the grid itself, not those of tables nested in its cells
+var rows = grid.querySelectorAll(':scope > tr, :scope > thead > tr, :scope > tbody > tr, :scope > tfoot > tr');
+var data = new Array(rows.length);
+for (var r = 0; r < rows.length; r++) {
+    var cells = rows[r].cells || rows[r].children, values = [];
+    for (var c = 0; c < cells.length; c++) {
+        if (cells[c].tagName !== cellTag) { continue; }
+        var text = cells[c].innerText.trim();
+        if (attributes.length) {
+            var value = {text: text};
+            for (var a = 0; a < attributes.length; a++) { value[attributes[a]] = cells[c].getAttribute(attributes[a]); }
+            values.push(value);
+        } else {
+            values.push(text);
+        }
+    }
+    data[r] = values;
+}
+return data;
+"""
+
+# reads the requested properties of every element in arguments[0] in one call
+_SCRAPE_ELEMENTS_SCRIPT = """
+var elements = arguments[0], properties = arguments[1], rows = new Array(elements.length);
+for (var e = 0; e < elements.length; e++) {
+    var el = elements[e], row = new Array(properties.length);
+    for (var p = 0; p < properties.length; p++) {
+        var name = properties[p];
+        if (name === 'text') {
+            row[p] = (el.innerText === undefined ? el.textContent : el.innerText).trim();
+        } else if (name === 'visible') {
+            var style = window.getComputedStyle(el);
+            row[p] = style.visibility !== 'hidden' && style.display !== 'none' && el.getClientRects().length > 0;
+        } else if (name === 'tag') {
+            row[p] = el.tagName.toLowerCase();
+        } else if (name in el && typeof el[name] !== 'object' && typeof el[name] !== 'function') {
+            row[p] = el[name];
+        } else {
+            row[p] = el.getAttribute(name);
+        }
+    }
+    rows[e] = row;
+}
+return rows;
+"""
+
+
+@functools.lru_cache(maxsize=None)
+def _element_record_type(properties):
+    fields = [re.sub(r'[^0-9a-zA-Z_]', '_', name) for name in properties]
+    return namedtuple('ElementRecord', [field + '_' if keyword.iskeyword(field) else field for field in fields],
+                      rename=True)
+
+# locator types resolve_locators() can find in the browser with a single script call
+_BULK_LOCATOR_TYPES = (By.CSS_SELECTOR, By.XPATH, By.ID, By.NAME, By.CLASS_NAME, By.TAG_NAME)
+
+# class names getElementsByClassName and Selenium agree on; compound or dotted names are left to find_element
+_SIMPLE_CLASS_NAME = re.compile(r'-?[_a-zA-Z][_a-zA-Z0-9-]*$')
+
+# returns the first element of every [by, value] pair in arguments[0], or null when there is none
+_RESOLVE_LOCATORS_SCRIPT = """
+var locators = arguments[0], found = new Array(locators.length);
+for (var i = 0; i < locators.length; i++) {
+    var by = locators[i][0], value = locators[i][1], el = null;
+    if (by === 'css selector') {
+        el = document.querySelector(value);
+    } else if (by === 'xpath') {
+        el = document.evaluate(value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    } else if (by === 'id') {
+        el = document.getElementById(value);
+    } else if (by === 'name') {
+        el = document.getElementsByName(value)[0] || null;
+    } else if (by === 'class name') {
+        el = document.getElementsByClassName(value)[0] || null;
+    } else if (by === 'tag name') {
+        el = document.getElementsByTagName(value)[0] || null;
+    }
+    found[i] = el;
+}
+return found;
+"""
+
+
+def _pyautogui():
+    """ pyautogui, imported on first use of a robot action: it needs a display, the rest of the page object does not """
+    import pyautogui
+    return pyautogui
 
 
 class BasePage:
@@ -27,19 +127,143 @@ class BasePage:
         self._long_wait = WebDriverWait(self.driver, WaitType.LONG.value)
         self._fluent_wait = WebDriverWait(self.driver, WaitType.FLUENT.value, poll_frequency=1,
                                           ignored_exceptions=[ElementNotVisibleException])
+        self._adaptive_wait = AdaptiveWait(self.driver)
+        self._element_cache = {}
+        self.element_cache_stats = {'hits': 0, 'misses': 0, 'stale': 0}
+        self.last_action_timings = []
+        self.page_metrics = []
         self.db = DatabaseHelper(TestData.HOST, TestData.USER_NAME, TestData.PASSWORD, TestData.DB_NAME, TestData.PORT)
 
     def open_url(self, url):
+        self.invalidate_element_cache()
+        try:
+            self.network_monitor.navigated()
+        except Exception:
+            # no performance log on this browser
+            pass
         self.driver.get(url)
-        time.sleep(5)
+        self.wait_for_document_ready()
+        self.capture_page_metrics("open_url")
 
-    def get_element(self, locator):
-        return self.driver.find_element(locator)
+    def capture_page_metrics(self, label=None):
+        """
+        Record navigation/resource timing and the network requests since the previous capture for the current test.
+        Call it after page actions other than open_url that load content.
+        :param label: name of the page action
+        :return: dict of metrics
+        """
+        try:
+            records = self.network_monitor.new_records('page_metrics')
+        except Exception:
+            records = None
+        metrics = PageMetrics.collect(self.driver, records, label)
+        self.page_metrics.append(metrics)
+        PageMetrics.record(self.driver, metrics)
+        return metrics
+
+    def assert_performance_budget(self, max_load_ms=None, max_bytes=None, max_requests=None, max_ttfb_ms=None):
+        """
+        Assert that every page captured by this page object stays within the budgets.
+        eg: self.assert_performance_budget(max_load_ms=3000, max_bytes=2 * 1024 * 1024)
+        """
+        PageMetrics.assert_budget(self.page_metrics, max_load_ms, max_bytes, max_requests, max_ttfb_ms)
+
+    def wait_until(self, condition, timeout=WaitType.DEFAULT.value, name=None):
+        """
+        Wait until condition(driver) is truthy, polling at adaptive intervals, and return its value.
+        :param condition: callable taking the driver, e.g. an expected_conditions instance or a lambda
+        :param timeout: max seconds to wait
+        :param name: label of the wait in get_wait_timings()
+        :return:
+        eg: self.wait_until(lambda driver: len(driver.window_handles) == 2, name="new window")
+        """
+        return self._adaptive_wait.until(condition, timeout, name)
+
+    def wait_for_document_ready(self, timeout=WaitType.DEFAULT.value):
+        """ Wait until document.readyState is complete """
+        self.wait_until(document_ready, timeout, "document_ready")
+
+    def wait_for_network_idle(self, quiet_ms=500, max_inflight=0, timeout=WaitType.DEFAULT.value):
+        """
+        Wait until at most max_inflight requests are open and no network activity happened for quiet_ms
+        milliseconds. Browsers without the Chrome performance log fall back to Resource Timing, where only
+        quiet_ms applies.
+        :param quiet_ms:
+        :param max_inflight: requests allowed to stay open, e.g. long polling or websockets
+        :param timeout:
+        :return:
+        """
+        try:
+            self.network_monitor.poll()
+        except Exception:
+            self.wait_until(resources_settled(quiet_ms), timeout)
+            return
+        self.wait_until(lambda driver: self.network_monitor.is_idle(quiet_ms, max_inflight), timeout,
+                        f"network_idle({quiet_ms}ms, {max_inflight} inflight)")
+
+    def get_wait_timings(self):
+        """
+        Get how long every wait actually took, per page.
+        :return: dict of page url -> list of (wait name, seconds)
+        """
+        return dict(self._adaptive_wait.timings)
+
+    def get_element(self, locator, use_cache=True):
+        """
+        Find an element, reusing the element found earlier for the same locator on this page. A cached element can
+        be stale, act on it through with_element/with_elements to have it looked up again.
+        :param locator: locator tuple, e.g. (By.ID, "username")
+        :param use_cache: look the element up again and refresh the cached one
+        :return: WebElement
+        """
+        locator = tuple(locator)
+        if use_cache:
+            element = self._element_cache.get(locator)
+            if element is not None:
+                self.element_cache_stats['hits'] += 1
+                return element
+        self.element_cache_stats['misses'] += 1
+        element = self._element_cache[locator] = self.driver.find_element(*locator)
+        return element
+
+    def with_element(self, locator, action):
+        """
+        Run action(element) on the cached element of the locator; when the element went stale (the page navigated
+        or re-rendered it), look it up again and retry once.
+        :param locator:
+        :param action: callable taking the WebElement
+        :return: the value returned by the action
+        """
+        return self.with_elements([locator], action)
+
+    def with_elements(self, locators, action):
+        """
+        Run action(*elements) on the cached elements of the locators; when any of them went stale, look all of them
+        up again and retry once.
+        :param locators: list of locator tuples
+        :param action: callable taking one WebElement per locator
+        :return: the value returned by the action
+        """
+        try:
+            return action(*[self.get_element(locator) for locator in locators])
+        except StaleElementReferenceException:
+            self.element_cache_stats['stale'] += 1
+            return action(*[self.get_element(locator, use_cache=False) for locator in locators])
+
+    def invalidate_element_cache(self):
+        """ Forget every cached element, e.g. after an action that navigates to another page """
+        self._element_cache.clear()
+
+    def get_element_cache_stats(self):
+        """ Hits, misses and stale re-lookups of the element cache """
+        return dict(self.element_cache_stats)
 
     def click_element(self, locator):
-        element = self.get_element(locator)
-        self.highlight_element(element, "green")
-        element.click()
+        def _click(element):
+            highlight.before_click(self.driver, element, "green")
+            element.click()
+
+        self.with_element(locator, _click)
 
     def click_with_Js(self, locator):
         self.driver.execute_script("arguments[0].click();", locator)
@@ -67,17 +291,47 @@ class BasePage:
             return False
 
     def input_text(self, locator, text):
-        element = self.get_element(locator)
-        element.clear()
-        element.send_keys(text)
+        def _input(element):
+            element.clear()
+            element.send_keys(text)
+
+        self.with_element(locator, _input)
 
     def get_text(self, locator):
         element = self._wait.until(EC.visibility_of_element_located(locator))
         return element.text
 
+    def check_links(self, locator=(By.TAG_NAME, 'a'), link_checker=None):
+        """
+        Collect the hrefs of all elements matching the locator in one call and check that they resolve.
+        :param locator: links to check, every anchor of the page by default
+        :param link_checker: LinkChecker to use, e.g. with different concurrency limits
+        :return: report dict with 'page', 'checked', 'broken' and 'results'
+        """
+        hrefs = [record.href for record in self.scrape_elements(locator, ['href'])]
+        return (link_checker or LinkChecker()).check_page(self.driver.current_url, hrefs)
+
     def get_all_text_from_elements(self, locator):
         elements = self._wait.until(EC.presence_of_all_elements_located(locator))
-        return [element.text for element in elements]
+        return [record.text for record in self.scrape_elements(elements, ['text'])]
+
+    def scrape_elements(self, locator, properties=('text',)):
+        """
+        Read properties of every element matching a locator in a single script call.
+        :param locator: locator tuple, or a list of already located WebElements
+        :param properties: 'text' (rendered text), 'visible' (computed visibility), 'tag', or any DOM property
+        (e.g. 'href', 'value', 'checked') or attribute name (e.g. 'data-id', 'aria-label')
+        :return: list of records (named tuples) with one field per property, '-' and ':' replaced by '_' and
+        Python keywords suffixed with '_' (e.g. 'class' -> class_)
+        eg: for link in self.scrape_elements((By.TAG_NAME, "a"), ["text", "href", "visible"]): print(link.href)
+        """
+        properties = list(properties)
+        elements = self.driver.find_elements(*locator) if isinstance(locator, tuple) else list(locator)
+        if not elements:
+            return []
+        record_type = _element_record_type(tuple(properties))
+        rows = self.driver.execute_script(_SCRAPE_ELEMENTS_SCRIPT, elements, properties)
+        return [record_type(*row) for row in rows]
 
     @staticmethod
     def get_tooltip_text(self, element):
@@ -117,18 +371,20 @@ class BasePage:
         self._wait.until(EC.presence_of_element_located((By.TAG_NAME, 'body')))
 
     def select_dropdown_option(self, locator, option, select_by='text'):
-        element = self.get_element(locator)
-        select = Select(element)
-
-        if select_by == 'text':
-            select.select_by_visible_text(option)
-        elif select_by == 'value':
-            select.select_by_value(option)
-        elif select_by == 'index':
-            select.select_by_index(option)
-        else:
+        if select_by not in ('text', 'value', 'index'):
             raise ValueError("Invalid 'select_by' option. Use 'text', 'value', or 'index'.")
 
+        def _select(element):
+            select = Select(element)
+            if select_by == 'text':
+                select.select_by_visible_text(option)
+            elif select_by == 'value':
+                select.select_by_value(option)
+            else:
+                select.select_by_index(option)
+
+        self.with_element(locator, _select)
+
     def double_click(self, element):
         action_chains = ActionChains(self.driver)
         action_chains.double_click(element).perform()
@@ -143,11 +399,12 @@ class BasePage:
         return element.text
 
     def scroll_to_element(self, locator):
-        self.driver.execute_script("argument[0].scrollIntoView(true);", self.get_element(locator))
+        self.with_element(locator,
+                          lambda element: self.driver.execute_script("arguments[0].scrollIntoView(true);", element))
 
     def get_page_max_umber(self, locator):
         """ get the max number from the web-table pagination"""
-        html = self.get_element(locator).get_attribute("outerHtml")
+        html = self.with_element(locator, lambda element: element.get_attribute("outerHtml"))
         soup = BeautifulSoup(html, 'lxml')
         soup.select_one('div.pagination > span').text.split(' ')[-1]
 
@@ -178,99 +435,99 @@ class BasePage:
         soup = BeautifulSoup(content, 'lxml')
         return soup.prettify()
 
-    def perform_actions(self, actions_list):
-        # """
-        #  # Example: Performing a sequence of actions
-        # actions_list = [
-        #     {'action': 'move_to_element', 'by': By.ID, 'value': 'exampleElement1'},
-        #     {'action': 'click', 'by': By.XPATH, 'value': "//button[@id='exampleButton']"},
-        #     {'action': 'double_click', 'by': By.CLASS_NAME, 'value': 'exampleClass'},
-        #     # Add more actions as needed
-        # ]
-        # :param actions_list:
-        # :return:
-        # """
-        action_chains = ActionChains(self.driver)
-        for action in actions_list:
-            if action['action'] == 'move_to_element':
-                element = self.get_element(action['by'], action['value'])
-                action_chains.move_to_element(element)
-            elif action['action'] == 'click':
-                element = self.get_element(action['by'], action['value'])
-                action_chains.click(element)
-            elif action['action'] == 'double_click':
-                element = self.get_element(action['by'], action['value'])
-                action_chains.double_click(element)
-            elif action['action'] == 'context_click':
-                element = self.get_element(action['by'], action['value'])
-                action_chains.context_click(element)
-            # Add more actions as needed
-
-        action_chains.perform()
+    def resolve_locators(self, locators):
+        """
+        Find the elements of many locators at once: CSS, XPath, id, name, (single) class name and tag name locators
+        are resolved in a single script call, other locator types with find_element. Found elements are cached.
+        :param locators: list of locator tuples
+        :return: dict of locator -> WebElement
+        """
+        locators = [tuple(locator) for locator in locators]
+        scripted = [locator for locator in locators if locator[0] in _BULK_LOCATOR_TYPES and
+                    (locator[0] != By.CLASS_NAME or _SIMPLE_CLASS_NAME.match(locator[1]))]
+        elements = {}
+        if scripted:
+            found = self.driver.execute_script(_RESOLVE_LOCATORS_SCRIPT, [list(locator) for locator in scripted])
+            elements.update(zip(scripted, found))
+        for locator in locators:
+            if locator not in elements:
+                elements[locator] = self.driver.find_element(*locator)
+        missing = [locator for locator, element in elements.items() if element is None]
+        if missing:
+            raise NoSuchElementException(f"Unable to locate elements: {missing}")
+        self._element_cache.update(elements)
+        self.element_cache_stats['misses'] += len(elements)
+        return elements
+
+    def perform_actions(self, actions_list, profile=False):
+        """
+        Validate the actions once, resolve all their locators in one call and send them as a single W3C Actions
+        payload, whose time is kept in the pipeline's elapsed_ms.
+        :param actions_list: list of action dicts (see utils.action_pipeline.ActionPipeline) or a compiled
+        ActionPipeline
+        :param profile: send every step separately, with its locators resolved right before it, to record its own
+        latency
+        :return: list of StepTiming(index, action, segment, elapsed_ms), also kept in self.last_action_timings;
+        elapsed_ms is None unless profile is set
+        eg:
+        actions_list = [
+            {'action': 'move_to_element', 'by': By.ID, 'value': 'exampleElement1'},
+            {'action': 'click', 'by': By.XPATH, 'value': "//button[@id='exampleButton']"},
+            {'action': 'double_click', 'by': By.CLASS_NAME, 'value': 'exampleClass'},
+        ]
+        """
+        pipeline = actions_list if isinstance(actions_list, ActionPipeline) else ActionPipeline(actions_list)
+        self.last_action_timings = pipeline.run(self, profile)
+        return self.last_action_timings
 
     def drag_and_drop(self, source_by, source_locator, target_locator):
-        source_element = self.get_element(source_locator)
-        target_element = self.get_element(target_locator)
-
-        action_chains = ActionChains(self.driver)
-        action_chains.drag_and_drop(source_element, target_element).perform()
+        self.with_elements([source_locator, target_locator],
+                           lambda source, target: ActionChains(self.driver).drag_and_drop(source, target).perform())
 
     @staticmethod
     def click_element_with_robot(element):
         location = element.location_once_scrolled_into_view
-        pyautogui.click(location['x'], location['y'])
+        _pyautogui().click(location['x'], location['y'])
 
     def perform_robot_actions(self, actions_list):
-        # """
-        #     # Example: Performing robot actions
-        # actions_list = [
-        #     {'action': 'click', 'by': By.ID, 'value': 'exampleButton'},
-        #     {'action': 'type', 'by': By.NAME, 'value': 'exampleInput', 'text': 'Hello, World!'},
-        #     {'action': 'scroll', 'direction': 'down', 'amount': 3},
-        # ]
-        # web_driver_utils.perform_robot_actions(actions_list)
-        # :param actions_list:
-        # :return:
-        # """
-        for action in actions_list:
-            if action['action'] == 'click':
-                element = self.get_element(action['by'], action['value'])
-                self.click_element_with_robot(element)
-            elif action['action'] == 'type':
-                element = self.get_element(action['by'], action['value'])
-                self.type_with_robot(element, action['text'])
-            elif action['action'] == 'scroll':
-                self.scroll_with_robot(action['direction'], action['amount'])
-
-            # Add more actions as needed
+        """
+        Run robot (pyautogui) actions, resolving the locators of each step right before it and recording its time.
+        :param actions_list: list of action dicts or a compiled ActionPipeline(..., robot=True)
+        :return: list of StepTiming, also kept in self.last_action_timings
+        eg:
+        actions_list = [
+            {'action': 'click', 'by': By.ID, 'value': 'exampleButton'},
+            {'action': 'type', 'by': By.NAME, 'value': 'exampleInput', 'text': 'Hello, World!'},
+            {'action': 'scroll', 'direction': 'down', 'amount': 3},
+        ]
+        """
+        pipeline = actions_list if isinstance(actions_list, ActionPipeline) else ActionPipeline(actions_list, robot=True)
+        self.last_action_timings = pipeline.run(self)
+        return self.last_action_timings
 
     # pyautogui: This is the Python library for GUI automation, which includes functions for simulating mouse and
     # keyboard actions. pip install pyautogui
 
     @staticmethod
-    def type_with_robot(self, element, text):
+    def type_with_robot(element, text):
         element.click()
-        pyautogui.typewrite(text)
+        _pyautogui().typewrite(text)
 
     @staticmethod
-    def scroll_with_robot(self, direction, amount):
+    def scroll_with_robot(direction, amount):
         if direction == 'up':
-            pyautogui.scroll(amount)
+            _pyautogui().scroll(amount)
         elif direction == 'down':
-            pyautogui.scroll(-amount)
+            _pyautogui().scroll(-amount)
 
     def highlight_element(self, element, color):
-        original_style = element.get_attribute("style")
-        new_style = "background-color:yellow;border: 1px solid " + color + original_style
-        self.driver.execute_script("arguments[0].setAttribute('style', 'border: 2px solid red;');", element)
-        self.driver.execute_script("arguments[0].setAttribute('style', arguments[1]);", element, new_style)
+        highlight.highlight(self.driver, element, color)
 
     def get_page_source(self):
         return self.driver.page_source
 
     def assert_element_locator(self, locator, expected_text):
-        element = self.get_element(locator)
-        actual_text = element.text
+        actual_text = self.with_element(locator, lambda element: element.text)
         assert expected_text in actual_text, f"Assertion failed: Expected '{expected_text}', but got '{actual_text}'."
 
     @staticmethod
@@ -291,63 +548,88 @@ class BasePage:
         assert expected_text in self.get_page_source_usingJs(
             locator), f"Expected text '{expected_text}' not found in the page source"
 
-    def validate_grid(self, grid_locator, expected_data):
+    def get_grid_data(self, grid_locator, attributes=None, cell_tag='td'):
+        """
+        Read every cell of a grid in a single script call instead of one driver call per row and per cell.
+        :param grid_locator: locator of the table (or any element containing tr rows)
+        :param attributes: optional attribute names to read with the text of every cell
+        :param cell_tag: tag name of the cells, 'td' by default
+        :return: list of rows, one list of cell texts per tr (empty for header rows without such cells);
+        with attributes every cell is a dict {'text': ..., <attribute>: ...}
+        eg: self.get_grid_data((By.ID, "stations"), attributes=["data-id"])
+        """
         grid = self._wait.until(EC.presence_of_element_located(grid_locator))
-        actual_data = [cell.text for cell in grid.find_elements(By.TAG_NAME, 'td')]
+        return self.driver.execute_script(_GRID_DATA_SCRIPT, grid, cell_tag, list(attributes or []))
+
+    @staticmethod
+    def compare_grid_data(actual_data, expected_data):
+        """
+        Compare two 2-D grids cell by cell with NumPy and return every mismatch.
+        :param actual_data: list of rows
+        :param expected_data: list of rows
+        :return: list of (row number, column number, expected, actual), 1-based; missing cells are None
+        """
+        rows = max(len(actual_data), len(expected_data))
+        cols = max((len(row) for row in list(actual_data) + list(expected_data)), default=0)
+        missing = object()
+        actual = np.full((rows, cols), missing, dtype=object)
+        expected = np.full((rows, cols), missing, dtype=object)
+        for grid, data in ((actual, actual_data), (expected, expected_data)):
+            for row_index, row in enumerate(data):
+                grid[row_index, :len(row)] = list(row)
+        row_indexes, col_indexes = np.nonzero(actual != expected)
+        return [(int(row) + 1, int(col) + 1,
+                 None if expected[row, col] is missing else expected[row, col],
+                 None if actual[row, col] is missing else actual[row, col])
+                for row, col in zip(row_indexes, col_indexes)]
+
+    def validate_grid(self, grid_locator, expected_data):
+        actual_data = [text for row in self.get_grid_data(grid_locator) for text in row]
 
         assert actual_data == expected_data, f"Grid validation failed. Expected: {expected_data}, Actual: {actual_data}"
 
     def iterate_grid_rows(self, grid_locator):
-        grid = self._wait.until(EC.presence_of_element_located(grid_locator))
-        rows = grid.find_elements(By.TAG_NAME, 'tr')
-
-        for row in rows:
+        for row in self.get_grid_data(grid_locator):
             # Process each cell in the row
-            cells = row.find_elements(By.TAG_NAME, 'td')
-            for cell in cells:
-                print(cell.text)
+            for text in row:
+                print(text)
 
     def iterate_grid(self, grid_locator):
-        grid = self._wait.until(EC.presence_of_element_located(grid_locator))
-        rows = grid.find_elements(By.TAG_NAME, 'tr')
-
-        for row in rows:
-            cells = row.find_elements(By.TAG_NAME, 'td')
-
-            for cell in cells:
-                print(f"Row: {rows.index(row) + 1}, Column: {cells.index(cell) + 1}, Text: {cell.text}")
+        for row_number, row in enumerate(self.get_grid_data(grid_locator), start=1):
+            for col_number, text in enumerate(row, start=1):
+                print(f"Row: {row_number}, Column: {col_number}, Text: {text}")
 
     def validate_grid_data(self, grid_locator, expected_data):
-        grid = self._wait.until(EC.presence_of_element_located(grid_locator))
-        rows = grid.find_elements(By.TAG_NAME, 'tr')
-
-        for row_index, row in enumerate(rows):
-            cells = row.find_elements(By.TAG_NAME, 'td')
-
-            for col_index, cell in enumerate(cells):
-                actual_data = cell.text
-                expected_value = expected_data[row_index][col_index]
-
-                assert actual_data == expected_value, f"Grid validation failed at Row {row_index + 1}, Column {col_index + 1}. Expected: {expected_value}, Actual: {actual_data}"
+        """ Compare the whole grid against expected_data (list of rows) and report every mismatching cell at once """
+        mismatches = self.compare_grid_data(self.get_grid_data(grid_locator), expected_data)
+        errors = [f"Row {row}, Column {col}. Expected: {expected}, Actual: {actual}"
+                  for row, col, expected, actual in mismatches]
+        assert not errors, "Grid validation failed at:\n" + "\n".join(errors)
 
     def upload_file(self, file_input_locator, file_path):
         file_input = self._wait.until(EC.presence_of_element_located(file_input_locator))
         file_input.send_keys(file_path)
 
-    def get_network_performance(self):
-        performance_logs = self.driver.get_log('performance')
-
-        # Read network logs
-        network_logs = [json.loads(log['message'])['message'] for log in performance_logs if
-                        'Network' in log['message']]
+    @property
+    def network_monitor(self):
+        """ Incremental reader of the performance log, shared by every page object of the driver """
+        return NetworkMonitor.for_driver(self.driver)
 
-        # Extract network information
-        network_info = [entry['params'] for entry in network_logs if 'params' in entry]
-
-        # Extract status codes from network information
-        status_codes = [entry['response']['status'] for entry in network_info if 'response' in entry]
+    def get_network_performance(self):
+        """
+        Get the status codes of every request the driver finished since it was handed to the current test.
+        Only the log entries added since the previous read are parsed.
+        """
+        return self.network_monitor.status_codes()
 
-        return status_codes
+    def get_network_timings(self):
+        """
+        Get per-request timing of the page.
+        :return: list of RequestTiming(request_id, url, method, resource_type, status, ttfb_ms, download_ms, size,
+        failed)
+        """
+        self.network_monitor.poll()
+        return list(self.network_monitor.records)
 
     def current_date(self, formate):
         """
@@ -363,50 +645,74 @@ class BasePage:
         current_date = datetime.now().strftime(date_format)
         return current_date
 
-    def read_csv_from_downloads(self, file_name, locator, button):
-
-        user_profile = os.environ.get("USERPROFILE")
-        if user_profile:
-            download_dir = os.path.join(user_profile, 'Downloads')
-        else:
-            print("Failed to retrieve user profile directory")
-            return None
-        # Construct the full path to the CSV file
-        file_path = os.path.join(download_dir, file_name)
-
-        if os.path.exists(file_path):
-            print(f"The '{file_name}' already exists in the Downloads directory. Removing it. ")
-            os.remove(file_path)
+    def read_csv_from_downloads(self, file_name, locator, button, chunked=False):
+        """
+        Download a CSV file into the configured download folder and read it as soon as the download completes.
+        :param file_name: name of the downloaded file
+        :param locator: input to fill in before downloading
+        :param button: download button
+        :param chunked: get an iterator of DataFrames of TestData.CSV_CHUNK_SIZE rows instead of one DataFrame, for
+        large files
+        :return:
+        """
+        downloads = DownloadManager()
+        downloads.prepare(file_name)
 
         print("Downloading CSV file...")
-        # define the method in base page and call it here
         self.csv_download_file(locator, button)
 
-        if os.path.exists(file_path):
-            try:
-                df = pd.read_csv(file_path)
-                return df
-            except Exception as e:
-                print("Error: ", e)
-        else:
-            print(f"File '{file_name}' not found in Downloads directory.")
+        try:
+            file_path = downloads.wait_for_download(file_name)
+        except TimeoutException:
+            print(f"File '{file_name}' not found in the download folder {downloads.folder}.")
             return None
+        try:
+            return downloads.read_csv(file_path, chunked=chunked)
+        except Exception as e:
+            print("Error: ", e)
 
     def csv_download_file(self, locator, button):
+        """ Start the download; wait for it with DownloadManager.wait_for_download (see read_csv_from_downloads) """
         self.clear_text(locator)
         self.send_text(locator, "URL")
         self.click_element(button)
-        time.sleep(5)
-        pyautogui.hotkey('enter')
-        time.sleep(5)
 
     def connect_database(self, query):
         return self.db.execute_query(query)
 
-    def get_all_rows_columns(self, query):
+    def get_all_rows_columns(self, query, columnar=False):
+        """
+        Fetch the records of a query.
+        :param query:
+        :param columnar: return a pandas DataFrame filled batch by batch instead of one dict per row
+        :return:
+        """
         logging.info("Validating records from database")
+        if columnar:
+            return self.db.fetch_columns(query)
         return self.db.fetch_rows_with_column_names(query)
 
+    def assert_db_data(self, query, expected_data):
+        """
+        Compare the records of a query against the expected data column by column and report every
+        mismatching cell at once.
+        :param query:
+        :param expected_data: DataFrame or dict of column name -> list of values, in row order
+        :return:
+        eg: self.assert_db_data("select id, name from stations order by id", {"id": [1, 2], "name": ["a", "b"]})
+        """
+        actual = self.get_all_rows_columns(query, columnar=True)
+        expected = pd.DataFrame(expected_data)
+        assert list(actual.columns) == list(expected.columns), \
+            f"Column mismatch. Expected: {list(expected.columns)}, Actual: {list(actual.columns)}"
+        assert len(actual) == len(expected), f"Row count mismatch. Expected: {len(expected)}, Actual: {len(actual)}"
+        expected.index = actual.index
+        mismatch = actual.ne(expected) & ~(actual.isna() & expected.isna())
+        rows, cols = mismatch.to_numpy().nonzero()
+        errors = [f"Row {row + 1}, Column '{actual.columns[col]}': Expected: {expected.iat[row, col]}, "
+                  f"Actual: {actual.iat[row, col]}" for row, col in zip(rows, cols)]
+        assert not errors, "Database validation failed:\n" + "\n".join(errors)
+
     def del_records_from_table(self, query):
         logging.info("Deleting records from the table")
         self.db.delete_query(query)
@@ -16,10 +16,15 @@ class LoginPage(BasePage):
         self.open_url(TestData.BASE_URL)
 
     def find_links(self):
-        list_links = self.driver.find_elements(By.XPATH, self.links1)
+        list_links = self.scrape_elements(self.links, ['text', 'href'])
         for link in list_links:
             print(link.text)
-            # print(self.get_hyper_links(self.links))
+        return list_links
+
+    def verify_links(self):
+        report = self.check_links(self.links)
+        assert not report['broken'], f"Broken links on {report['page']}: {report['broken']}"
+        return report
 
     def get_network_status(self):
         self.get_network_performance()
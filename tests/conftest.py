@@ -1,14 +1,19 @@
+import sqlite3
+
 import pytest
 from datetime import datetime
 from pathlib import Path
 import os
 from py.xml import html
 
-from selenium import webdriver
-from selenium.common import NoSuchDriverException
-from selenium.webdriver import DesiredCapabilities
-from selenium.webdriver.chrome.service import Service
+from utils import highlight
+from utils.browser_pool import BrowserPool
 from utils.config import TestData
+from utils.db_connection import DatabaseHelper
+from utils.page_metrics import PageMetrics
+from utils.screenshots import ScreenshotPipeline
+from utils import duration_history, impact_selection, stream_report, timing_plugin
+from utils.data_store import data_store  # noqa: F401 (session fixture)
 
 
 def pytest_addoption(parser):
@@ -19,55 +24,54 @@ def pytest_addoption(parser):
 
 
 @pytest.fixture(scope="session")
-def setup(request):
-    """ Here we are doing setup for browser and the url """
-    global driver
-    services = None
-    # Getting the driver name and instantiating the driver
-    browser_name = request.config.getoption("browser_name")
-    if browser_name == "chrome":
-        chrome_options = webdriver.ChromeOptions
-        chrome_options.add_experimental_option("prefs", {
-            "download.default_directory": TestData.DOWNLOAD_FOLDER,
-            "download.prompt_for_download": False,
-            "download,directory_upgrade": True,
-            "safebrowsing.enabled": True,
-            'w3c': False
-        })
-
-        # Set up Chrome DevTools Protocol capabilities
-        caps = DesiredCapabilities.CHROME.copy()
-        caps['goog:loggingPrefs'] = {'performance': 'ALL'}  # Enable performance logs
-
-        if TestData.HEADLESS:
-            chrome_options.add_argument('--headless')
-
-        services = Service(executable_path=f"{TestData.DRIVER_PATH}\chromedriver.exe", options=chrome_options, desired_capabilities=caps)
-    elif browser_name == "firefox":
-        services = Service(executable_path=f"{TestData.DRIVER_PATH}\geckodriver.exe")
-    elif browser_name == "IE":
-        services = Service(executable_path=f"{TestData.DRIVER_PATH}\geckodriver.exe")
-    try:
-        driver = webdriver.Chrome(service=services)
-    except NoSuchDriverException:
-        print()
-        print(*25 * '*', sep='')
-        print("\033[1mChrome driver path is correct, please check and update the driver")
-        print(*25 * '*', sep='')
-    except Exception as e:
-        print(e)
-
-    driver.maximize_window()
-    request.cls.driver = driver
+def browser_pool(request):
+    """ Browser pool of this worker process, sized by TestData.BROWSER_POOL_SIZE """
+    pool = BrowserPool(request.config.getoption("browser_name"))
+    yield pool
+    pool.close_all()
+
+
+@pytest.fixture
+def setup(request, browser_pool):
+    """ Hands the test its own driver from the browser pool and resets it for the next test afterwards """
+    driver = browser_pool.acquire()
+    highlight.forget(driver)
+    request.node.driver = driver
+    if request.instance is not None:
+        request.instance.driver = driver
+    PageMetrics.start(driver, request.node.nodeid)
     yield driver
-    driver.close()
+    PageMetrics.finish(driver)
+    browser_pool.release(driver)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def db_pool():
+    """ Keeps the database connection pools open for the whole run and closes them at the end """
+    yield
+    DatabaseHelper.close_all_pools()
+
 
-    reports_dir = ''
+@pytest.fixture
+def db(tmp_path):
+    """ DatabaseHelper backed by a sqlite3 file instead of PostgreSQL """
+    db_file = str(tmp_path / "stations.db")
+
+    def connect():
+        return sqlite3.connect(db_file, check_same_thread=False)
+
+    helper = DatabaseHelper("localhost", "user", "pwd", db_file, 5432, connection_factory=connect)
+    helper.delete_query("create table stations (id integer, name text)")
+    helper.delete_query("insert into stations values (?, ?)", (1, "a"))
+    with helper.pooled_connection() as connection:
+        connection.executemany("insert into stations values (?, ?)", [(i, f"s{i}") for i in range(2, 26)])
+    yield helper
+    DatabaseHelper.close_all_pools()
 
 
 def create_report_folder():
-    """ Creates a report folder with the datetime stamp """
-    global reports_dir
+    """ Creates a report folder with the datetime stamp and the screenshot pipeline writing into it """
+    global reports_dir, screenshots
     # if config is set to create individual report then create individual report with timestamp else create single
     # report
     if TestData.INDIVIDUAL_REPORT:
@@ -77,6 +81,7 @@ def create_report_folder():
         reports_dir = Path(TestData.REPORT_FOLDER)
         if not os.path.exists(reports_dir):
             reports_dir.mkdir(parents=True, exist_ok=False)
+    screenshots = ScreenshotPipeline(reports_dir / 'screenshots')
 
 
 @pytest.hookimpl(tryfirst=True)
@@ -84,62 +89,77 @@ def pytest_configure(config):
     """ Updates the default configurations of pytes """
     # Create the project folder
     create_report_folder()
-    # custom report file
-    report = reports_dir / "report.html"
-    # adjust plugin options (Updating the report path)
-    config.option.htmlpath = report
-    config.option.self_contained_html = True
+    if TestData.REPORT_MODE == 'stream':
+        # records are streamed as tests finish instead of one html file written at the end
+        config.option.htmlpath = None
+        stream_report.register(config, reports_dir)
+    else:
+        # custom report file
+        report = reports_dir / "report.html"
+        # adjust plugin options (Updating the report path)
+        config.option.htmlpath = report
+        config.option.self_contained_html = True
+    timing_plugin.register(config)
+    duration_history.register(config)
+    impact_selection.register(config)
 
 
 def pytest_html_results_table_header(cells):
-    """ Adds two columns (Description and time) to the report table """
+    """ Adds Description and per-test timing columns to the report table """
     cells.insert(2, html.th('Description'))
-    cells.insert(3, html.th('Time', class_='sortable time', col='time'))
+    cells.insert(3, html.th('Test time (s)', class_='sortable', col='test-time'))
+    cells.insert(4, html.th('Max page load (ms)', class_='sortable', col='page-load'))
+    cells.insert(5, html.th('Max page size (KB)', class_='sortable', col='page-size'))
     cells.pop()
 
 
 def pytest_html_results_table_row(report, cells):
-    """ Adds row two column values to the row """
-    cells.insert(2, html.td("report.description"))
-    cells.insert(3, html.td(datetime.now(), class_='col-time'))
+    """ Adds the description and timing values to the row """
+    page_summary = getattr(report, 'page_summary', {})
+    max_load_ms = page_summary.get('max_load_ms')
+    max_bytes = page_summary.get('max_bytes')
+    # collection errors are reported without a duration
+    duration = getattr(report, 'duration', None)
+    cells.insert(2, html.td(getattr(report, 'description', '')))
+    cells.insert(3, html.td(f"{duration:.2f}" if duration is not None else '', class_='col-test-time'))
+    cells.insert(4, html.td(f"{max_load_ms:.0f}" if max_load_ms is not None else '', class_='col-page-load'))
+    cells.insert(5, html.td(f"{max_bytes / 1024:.1f}" if max_bytes is not None else '', class_='col-page-size'))
     cells.pop()
 
 
 @pytest.hookimpl(hookwrapper=True)
 def pytest_runtest_makereport(item):
     """
-    Extends the PyTest Plugin to take and embed screenshot in html report, whenever test fails.
+    Extends the PyTest Plugin to take a screenshot whenever a test fails and link its thumbnail in the html report.
     :param item:
     """
     pytest_html = item.config.pluginmanager.getplugin('html')
     outcome = yield
     report = outcome.get_result()
     report.description = str(item.function.__doc__)
+    driver = getattr(item, 'driver', None)
+    if driver is not None:
+        report.page_summary = PageMetrics.summary(PageMetrics.peek(driver))
     extra = getattr(report, 'extra', [])
     if report.when == 'call' or report.when == "setup":
         xfail = hasattr(report, 'wasxfail')
-        if (report.skipped and xfail) or (report.failed and not xfail):
-            file_name = report.nodeid.replace("::", "_") + ".png"
-            _capture_screenshot(file_name)
-            if file_name:
-                html = '<div><img src="%s" alt="screenshot" style="width:304px;height:228px;" ' \
-                       'onclick="window.open(this.src)" align="right"/></div>' % file_name
+        if ((report.skipped and xfail) or (report.failed and not xfail)) and driver is not None:
+            if TestData.HIGHLIGHT_MODE == 'on_failure':
+                highlight.highlight_last_element(driver)
+            # only the PNG bytes are grabbed here, encoding and thumbnailing happen in the background
+            paths = screenshots.capture(driver)
+            if paths:
+                image, thumbnail = paths
+                html = '<div><a href="%s" target="_blank"><img src="%s" alt="screenshot" loading="lazy" ' \
+                       'style="max-width:304px;max-height:228px;" align="right"/></a></div>' % (image, thumbnail)
                 extra.append(pytest_html.extras.html(html))
         report.extra = extra
 
 
-def _capture_screenshot(name):
-    """ Saves the captured screenshot to the report directory """
-    global reports_dir
-    # crate the test folder inside the report
-    reports_dir = str(Path(reports_dir))
-    if not os.path.exists(reports_dir + '/tests'):
-        os.makedirs(reports_dir + '/tests')
-    # save the screenshot
-    try:
-        driver.get_screenshot_as_file(reports_dir + '/' + name)
-    except Exception as e:
-        print(e)
+@pytest.hookimpl(tryfirst=True)
+def pytest_sessionfinish(session):
+    """ Waits for the queued screenshots before the report is written """
+    screenshots.close()
 
 
 def pytest_html_report_title(report):
@@ -0,0 +1,85 @@
+import pytest
+
+from utils.action_pipeline import ActionPipeline
+
+
+class _Driver:
+
+    def __init__(self):
+        self.commands = []
+
+    def execute(self, command, params=None):
+        self.commands.append(command)
+        return {'value': None}
+
+
+class _RobotPage:
+    """ Page object stand-in whose elements only exist once the step before them ran """
+
+    def __init__(self):
+        self.driver = _Driver()
+        self.visible = {('id', 'menu')}
+        self.resolved = []
+        self.events = []
+
+    def resolve_locators(self, locators):
+        self.resolved.append(list(locators))
+        missing = [locator for locator in locators if locator not in self.visible]
+        if missing:
+            raise LookupError(missing)
+        return {locator: locator[1] for locator in locators}
+
+    def click_element_with_robot(self, element):
+        self.events.append(('click', element))
+        self.visible.add(('id', 'item'))
+
+    def type_with_robot(self, element, text):
+        self.events.append(('type', element, text))
+
+    def scroll_with_robot(self, direction, amount):
+        self.events.append(('scroll', direction, amount))
+
+
+class TestActionPipeline:
+
+    def test_invalid_actions_are_reported_together(self):
+        with pytest.raises(ValueError) as error:
+            ActionPipeline([{'action': 'hover'}, {'action': 'click', 'by': 'id'}])
+        assert "step 0: unsupported action 'hover'" in str(error.value)
+        assert "step 1 (click): 'by' and 'value' are required" in str(error.value)
+
+    def test_robot_steps_resolve_their_locators_right_before_running(self):
+        page = _RobotPage()
+        pipeline = ActionPipeline([
+            {'action': 'click', 'by': 'id', 'value': 'menu'},
+            {'action': 'type', 'by': 'id', 'value': 'item', 'text': 'abc'},
+            {'action': 'scroll', 'direction': 'down', 'amount': 3},
+        ], robot=True)
+
+        timings = pipeline.run(page)
+
+        assert page.resolved == [[('id', 'menu')], [('id', 'item')]]
+        assert page.events == [('click', 'menu'), ('type', 'item', 'abc'), ('scroll', 'down', 3)]
+        assert [timing.segment for timing in timings] == [0, 1, 2]
+        assert all(timing.elapsed_ms is not None for timing in timings)
+
+    def test_batched_steps_share_one_payload_without_step_times(self):
+        page = _RobotPage()
+        pipeline = ActionPipeline([{'action': 'send_keys', 'text': 'abc'}, {'action': 'pause', 'seconds': 0}])
+
+        timings = pipeline.run(page)
+
+        assert len(page.driver.commands) == 1
+        assert page.resolved == []
+        assert [(timing.segment, timing.elapsed_ms) for timing in timings] == [(0, None), (0, None)]
+        assert pipeline.elapsed_ms is not None
+
+    def test_profile_sends_every_step_on_its_own(self):
+        page = _RobotPage()
+        pipeline = ActionPipeline([{'action': 'send_keys', 'text': 'abc'}, {'action': 'pause', 'seconds': 0}])
+
+        timings = pipeline.run(page, profile=True)
+
+        assert len(page.driver.commands) == 2
+        assert [timing.segment for timing in timings] == [0, 1]
+        assert all(timing.elapsed_ms is not None for timing in timings)
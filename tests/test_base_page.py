@@ -0,0 +1,103 @@
+import pytest
+from selenium.common import StaleElementReferenceException
+from selenium.webdriver.common.by import By
+
+from pages.BasePage import BasePage
+
+
+@pytest.fixture
+def page(db):
+    """ BasePage without a browser, querying the sqlite3 stand-in database """
+    base_page = BasePage(None)
+    base_page.db = db
+    return base_page
+
+
+class TestAssertDbData:
+
+    def test_matching_data_passes(self, page):
+        page.assert_db_data("select id, name from stations where id <= 2 order by id",
+                            {"id": [1, 2], "name": ["a", "s2"]})
+
+    def test_every_mismatching_cell_is_reported(self, page):
+        with pytest.raises(AssertionError) as error:
+            page.assert_db_data("select id, name from stations where id <= 3 order by id",
+                                {"id": [1, 2, 30], "name": ["a", "x", "s3"]})
+
+        message = str(error.value)
+        assert "Row 2, Column 'name': Expected: x, Actual: s2" in message
+        assert "Row 3, Column 'id': Expected: 30, Actual: 3" in message
+
+    def test_row_count_mismatch(self, page):
+        with pytest.raises(AssertionError, match="Row count mismatch"):
+            page.assert_db_data("select id from stations where id <= 2", {"id": [1]})
+
+
+class _Element:
+
+    def __init__(self, locator):
+        self.locator = locator
+        self.stale = False
+
+    def get_attribute(self, name):
+        if self.stale:
+            raise StaleElementReferenceException("element is not attached to the page document")
+        return self.locator[1]
+
+
+class _Driver:
+
+    def __init__(self):
+        self.found = []
+        self.scripted = []
+
+    def execute_script(self, script, locators):
+        self.scripted.extend(locators)
+        return [_Element(tuple(locator)) for locator in locators]
+
+    def find_element(self, by, value):
+        self.found.append(_Element((by, value)))
+        return self.found[-1]
+
+
+class TestElementCache:
+
+    def test_stale_cached_elements_are_looked_up_again(self):
+        page = BasePage(_Driver())
+        source, target = (By.ID, "source"), (By.ID, "target")
+        read = lambda *elements: [element.get_attribute("id") for element in elements]
+
+        assert page.with_elements([source, target], read) == ["source", "target"]
+        page.get_element(target).stale = True
+        assert page.with_elements([source, target], read) == ["source", "target"]
+
+        assert len(page.driver.found) == 4
+        assert page.get_element_cache_stats() == {'hits': 3, 'misses': 4, 'stale': 1}
+
+    def test_compound_class_names_are_left_to_find_element(self):
+        page = BasePage(_Driver())
+
+        elements = page.resolve_locators([(By.CLASS_NAME, "button"), (By.CLASS_NAME, "button primary")])
+
+        assert page.driver.scripted == [[By.CLASS_NAME, "button"]]
+        assert [element.locator for element in page.driver.found] == [(By.CLASS_NAME, "button primary")]
+        assert len(elements) == 2
+
+
+class TestCompareGridData:
+
+    def test_equal_grids_have_no_mismatches(self):
+        assert BasePage.compare_grid_data([["a", "1"], ["b", "2"]], [["a", "1"], ["b", "2"]]) == []
+
+    def test_every_mismatching_cell_is_reported(self):
+        mismatches = BasePage.compare_grid_data([["a", "1"], ["b", "3"]], [["a", "2"], ["c", "3"]])
+
+        assert mismatches == [(1, 2, "2", "1"), (2, 1, "c", "b")]
+
+    def test_missing_rows_and_cells_are_none(self):
+        mismatches = BasePage.compare_grid_data([["a"], ["b", "2"]], [["a", "1"], ["b", "2"], ["c"]])
+
+        assert mismatches == [(1, 2, "1", None), (3, 1, "c", None)]
+
+    def test_empty_grids(self):
+        assert BasePage.compare_grid_data([], []) == []
@@ -0,0 +1,131 @@
+import json
+import threading
+
+import pytest
+
+from utils import browser_pool
+from utils.browser_pool import BrowserPool
+
+
+class _SwitchTo:
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, handle):
+        self.driver.current_handle = handle
+
+
+class _Driver:
+    """ Stand-in driver recording the reset calls """
+
+    def __init__(self, fail_reset=False):
+        self.window_handles = ['main', 'popup']
+        self.switch_to = _SwitchTo(self)
+        self.fail_reset = fail_reset
+        self.calls = []
+        self.log = []
+        self.quit_called = False
+
+    def close(self):
+        self.window_handles.remove(self.current_handle)
+
+    def request(self, url):
+        self.log.append({'message': json.dumps({'message': {
+            'method': 'Network.requestWillBeSent',
+            'params': {'requestId': url, 'request': {'url': url, 'method': 'GET'}, 'timestamp': 1.0}}})})
+
+    def get_log(self, log_type):
+        entries, self.log = self.log, []
+        return entries
+
+    def execute_script(self, script):
+        if self.fail_reset:
+            raise RuntimeError('browser crashed')
+        self.calls.append('clear storage')
+
+    def execute_cdp_cmd(self, command, params):
+        self.calls.append((command, params.get('origin')))
+
+    def delete_all_cookies(self):
+        self.calls.append('delete_all_cookies')
+
+    def get(self, url):
+        self.calls.append(url)
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture
+def launched(monkeypatch):
+    """ Drivers launched by the pool, in launch order """
+    drivers = []
+
+    def create_driver(browser_name):
+        drivers.append(_Driver())
+        return drivers[-1]
+
+    monkeypatch.setattr(browser_pool, 'create_driver', create_driver)
+    return drivers
+
+
+class TestBrowserPool:
+
+    def test_released_driver_is_reset_and_reused(self, launched):
+        pool = BrowserPool('chrome', size=1, max_reuse=5)
+        driver = pool.acquire()
+        driver.request('https://shop.example.com/cart')
+        driver.request('https://login.example.com/')
+
+        pool.release(driver)
+
+        assert pool.acquire() is driver and len(launched) == 1
+        assert driver.window_handles == ['main']
+        assert driver.calls == [
+            'clear storage',
+            ('Network.clearBrowserCookies', None),
+            ('Storage.clearDataForOrigin', 'https://login.example.com'),
+            ('Storage.clearDataForOrigin', 'https://shop.example.com'),
+            'about:blank',
+        ]
+
+    def test_other_browsers_delete_cookies_through_webdriver(self, launched):
+        pool = BrowserPool('firefox', size=1, max_reuse=5)
+        driver = pool.acquire()
+        driver.window_handles = ['main']
+
+        pool.release(driver)
+
+        assert driver.calls == ['clear storage', 'delete_all_cookies', 'about:blank']
+
+    def test_driver_is_relaunched_after_max_reuse(self, launched):
+        pool = BrowserPool('chrome', size=1, max_reuse=2)
+        first = pool.acquire()
+        pool.release(first)
+        assert pool.acquire() is first
+        pool.release(first)
+
+        second = pool.acquire()
+
+        assert second is not first and first.quit_called
+        assert len(launched) == 2
+
+    def test_driver_whose_reset_fails_is_discarded(self, launched):
+        pool = BrowserPool('chrome', size=1, max_reuse=5)
+        driver = pool.acquire()
+        driver.fail_reset = True
+
+        pool.release(driver)
+
+        assert driver.quit_called
+        assert pool.acquire() is launched[1]
+
+    def test_acquire_waits_for_a_release_when_the_pool_is_full(self, launched):
+        pool = BrowserPool('chrome', size=1, max_reuse=5)
+        driver = pool.acquire()
+        threading.Timer(0.1, pool.release, args=(driver,)).start()
+
+        assert pool.acquire() is driver
+        pool.close_all()
+        assert driver.quit_called
@@ -0,0 +1,69 @@
+import os
+
+import pytest
+
+from utils.data_store import DataStore
+
+
+@pytest.fixture
+def stations_csv(tmp_path):
+    path = tmp_path / "stations.csv"
+    path.write_text("id,country,status\n1,FI,active\n2,SE,active\n3,FI,retired\n")
+    return str(path)
+
+
+@pytest.fixture
+def store(monkeypatch):
+    """ DataStore counting how often a file is parsed """
+    store = DataStore()
+    store.parse_count = 0
+    parse = DataStore._parse
+
+    def counting_parse(path, sheet_name):
+        store.parse_count += 1
+        return parse(path, sheet_name)
+
+    monkeypatch.setattr(DataStore, '_parse', staticmethod(counting_parse))
+    return store
+
+
+def _touch(path, seconds=10):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + seconds * 10 ** 9))
+
+
+class TestDataStore:
+
+    def test_lookups_by_single_and_composite_key(self, store, stations_csv):
+        assert store.lookup(stations_csv, "id", 2)["country"] == "SE"
+        assert [row["id"] for row in store.lookup_all(stations_csv, ["country", "status"], ("FI", "active"))] == [1]
+        assert store.lookup(stations_csv, "id", 99) is None
+
+    def test_single_column_list_key(self, store, stations_csv):
+        assert store.lookup(stations_csv, ["id"], (2,))["country"] == "SE"
+        assert store.lookup(stations_csv, ["id"], 2)["country"] == "SE"
+        assert store.parse_count == 1
+
+    def test_touched_but_unchanged_file_is_not_parsed_again(self, store, stations_csv):
+        store.load(stations_csv)
+        _touch(stations_csv)
+
+        store.load(stations_csv)
+
+        assert store.parse_count == 1
+
+    def test_changed_file_is_parsed_again(self, store, stations_csv):
+        assert store.lookup(stations_csv, "id", 4) is None
+        with open(stations_csv, "a") as file:
+            file.write("4,NO,active\n")
+        _touch(stations_csv)
+
+        assert store.lookup(stations_csv, "id", 4)["country"] == "NO"
+        assert store.parse_count == 2
+
+    def test_invalidate(self, store, stations_csv):
+        store.load(stations_csv)
+        store.invalidate(stations_csv)
+        store.load(stations_csv)
+
+        assert store.parse_count == 2
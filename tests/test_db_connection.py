@@ -0,0 +1,62 @@
+import sqlite3
+import threading
+
+import pytest
+
+from utils.db_connection import ConnectionPool, DatabaseHelper, PoolTimeoutError
+
+
+class TestDatabaseHelper:
+
+    def test_queries_reuse_pooled_connection(self, db):
+        pool = db.pool
+        connection = pool.getconn()
+        pool.putconn(connection)
+
+        assert db.execute_query("select count(*) from stations") == [(25,)]
+        assert db.pool is pool
+        assert pool.getconn() is connection
+
+    def test_pool_opens_connections_on_demand(self):
+        opened = []
+
+        def connect():
+            opened.append(sqlite3.connect(":memory:", check_same_thread=False))
+            return opened[-1]
+
+        pool = ConnectionPool(connect, minconn=0, maxconn=2)
+        assert opened == []
+        first, second = pool.getconn(), pool.getconn()
+        pool.putconn(first)
+        pool.putconn(second)
+        assert pool.getconn() in (first, second)
+        assert len(opened) == 2
+        pool.closeall()
+
+    def test_fetch_rows_with_column_names(self, db):
+        rows = db.fetch_rows_with_column_names("select id, name from stations where id <= ?", (2,))
+        assert rows == [{"id": 1, "name": "a"}, {"id": 2, "name": "s2"}]
+
+    def test_stream_query_yields_batches(self, db):
+        batches = list(db.stream_query("select id from stations order by id", batch_size=10))
+        assert [len(batch) for batch in batches] == [10, 10, 5]
+        assert [row[0] for row in db.iter_rows("select id from stations order by id", batch_size=7)] == \
+            list(range(1, 26))
+
+    def test_pool_blocks_at_max_connections(self):
+        pool = ConnectionPool(lambda: sqlite3.connect(":memory:", check_same_thread=False), minconn=0,
+                              maxconn=1, timeout=0.1)
+        connection = pool.getconn()
+        with pytest.raises(PoolTimeoutError):
+            pool.getconn()
+        threading.Timer(0.05, pool.putconn, args=(connection,)).start()
+        pool.timeout = 1
+        assert pool.getconn() is connection
+        pool.closeall()
+
+    def test_fetch_columns(self, db):
+        frame = db.fetch_columns("select id, name from stations order by id", batch_size=10)
+        assert list(frame.columns) == ["id", "name"]
+        assert frame["id"].tolist() == list(range(1, 26))
+        arrays = db.fetch_columns("select id from stations where id > ? order by id", (23,), as_frame=False)
+        assert arrays["id"].tolist() == [24, 25]
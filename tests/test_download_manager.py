@@ -0,0 +1,79 @@
+import os
+import threading
+
+import pytest
+from selenium.common import TimeoutException
+
+from utils.config import TestData
+from utils.download_manager import DownloadManager
+
+
+@pytest.fixture
+def downloads(tmp_path):
+    return DownloadManager(str(tmp_path))
+
+
+def _finish_later(folder, file_name, content, delay=0.2):
+    """ Writes file_name like Chrome does: into a .crdownload file renamed once complete """
+    partial = os.path.join(folder, file_name + ".crdownload")
+    with open(partial, "w") as file:
+        file.write(content[:5])
+
+    def finish():
+        with open(partial, "a") as file:
+            file.write(content[5:])
+        os.rename(partial, os.path.join(folder, file_name))
+
+    timer = threading.Timer(delay, finish)
+    timer.start()
+    return timer
+
+
+class TestDownloadManager:
+
+    def test_download_completes_after_crdownload_rename(self, downloads):
+        downloads.prepare("report.csv")
+        timer = _finish_later(downloads.folder, "report.csv", "id,name\n1,a\n2,b\n")
+
+        path = downloads.wait_for_download("report.csv", timeout=5)
+
+        timer.join()
+        assert path == os.path.join(downloads.folder, "report.csv")
+        assert downloads.read_csv(path)["name"].tolist() == ["a", "b"]
+
+    def test_first_new_file_without_name(self, downloads):
+        with open(os.path.join(downloads.folder, "old.csv"), "w") as file:
+            file.write("id\n1\n")
+        downloads.prepare()
+        timer = _finish_later(downloads.folder, "export-123.csv", "id,name\n1,a\n")
+
+        path = downloads.wait_for_download(timeout=5)
+
+        timer.join()
+        assert os.path.basename(path) == "export-123.csv"
+
+    def test_partial_file_from_before_prepare_is_ignored(self, downloads):
+        open(os.path.join(downloads.folder, "stale.csv.crdownload"), "w").close()
+        downloads.prepare()
+        with open(os.path.join(downloads.folder, "export-123.csv"), "w") as file:
+            file.write("id\n1\n")
+
+        path = downloads.wait_for_download(timeout=2)
+
+        assert os.path.basename(path) == "export-123.csv"
+
+    def test_unfinished_download_times_out(self, downloads):
+        downloads.prepare("report.csv")
+        open(os.path.join(downloads.folder, "report.csv.crdownload"), "w").close()
+
+        with pytest.raises(TimeoutException):
+            downloads.wait_for_download("report.csv", timeout=0.3)
+
+    def test_chunked_read(self, downloads, monkeypatch):
+        path = os.path.join(downloads.folder, "report.csv")
+        with open(path, "w") as file:
+            file.write("id\n" + "\n".join(str(index) for index in range(5)) + "\n")
+        monkeypatch.setattr(TestData, "CSV_CHUNK_SIZE", 2)
+
+        assert [len(chunk) for chunk in downloads.read_csv(path, chunked=True)] == [2, 2, 1]
+        assert len(downloads.read_csv(path)) == 5
@@ -0,0 +1,137 @@
+import json
+import os
+
+import pytest
+
+from utils.duration_history import XDIST_INTERNALS, DurationHistory, DurationSchedulerPlugin, assign_shards
+
+pytest_plugins = ['pytester']
+
+ROOT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class _Config:
+
+    def getvalue(self, name):
+        return 'load'
+
+
+class _LoadScheduling:
+    """ Stand-in for xdist's LoadScheduling, with the internals the longest-first scheduler relies on """
+
+    def __init__(self, config, log):
+        for name in XDIST_INTERNALS:
+            setattr(self, name, None)
+
+
+class _ChangedLoadScheduling:
+    """ LoadScheduling of a pytest-xdist version that renamed its internals """
+
+    def __init__(self, config, log):
+        self.config = config
+
+
+@pytest.fixture
+def history(tmp_path):
+    return DurationHistory(str(tmp_path / "metrics" / "duration_history.json"))
+
+
+class TestDurationHistory:
+
+    def test_update_blends_with_previous_runs(self, history):
+        history.update({'a': 10.0, 'b': 1.0})
+        history.update({'a': 20.0})
+
+        reloaded = DurationHistory(history.path)
+        assert reloaded.durations == {'a': 15.0, 'b': 1.0}
+
+    def test_estimate_for_unknown_tests(self, history):
+        history.update({'a': 1.0, 'b': 3.0, 'c': 5.0})
+
+        assert history.estimate('a') == 1.0
+        assert history.estimate('new', ['slow', 'regression']) == 120.0
+        assert history.estimate('new') == 3.0
+
+    def test_shards_are_balanced_by_duration(self):
+        durations = [120.0, 100.0, 30.0, 20.0, 10.0, 5.0, 1.0, 1.0]
+
+        shards = assign_shards(durations, 2)
+
+        totals = [sum(d for d, shard in zip(durations, shards) if shard == index) for index in range(2)]
+        assert shards[:2] == [0, 1]
+        assert abs(totals[0] - totals[1]) <= 10
+
+
+@pytest.fixture
+def scheduled(pytester, monkeypatch):
+    """ pytester project running the duration plugin with a history of test_fast.py < test_slow.py """
+    history_path = pytester.path / "duration_history.json"
+    history_path.write_text(json.dumps({
+        "test_fast.py::test_a": 0.1, "test_fast.py::test_b": 0.2,
+        "test_slow.py::TestSlow::test_a": 1.0, "test_slow.py::TestSlow::test_b": 5.0,
+        "test_slow.py::test_c": 3.0, "test_slow.py::test_d": 0.5,
+    }))
+    pytester.makeconftest(f"""
+        from utils import duration_history
+        from utils.config import TestData
+
+        TestData.DURATION_HISTORY_FILE = {str(history_path)!r}
+
+        def pytest_configure(config):
+            duration_history.register(config)
+    """)
+    pytester.makepyfile(test_fast="""
+        def test_a():
+            pass
+
+        def test_b():
+            pass
+    """, test_slow="""
+        class TestSlow:
+            def test_a(self):
+                pass
+
+            def test_b(self):
+                pass
+
+        def test_c():
+            pass
+
+        def test_d():
+            pass
+    """)
+    monkeypatch.setenv("PYTHONPATH", ROOT_PATH)
+    return pytester
+
+
+class TestLongestFirst:
+
+    def test_modules_and_classes_stay_together(self, scheduled):
+        result = scheduled.runpytest_subprocess("--collect-only", "-q", "-p", "no:xdist")
+
+        assert [line for line in result.outlines if "::" in line] == [
+            "test_slow.py::TestSlow::test_b", "test_slow.py::TestSlow::test_a", "test_slow.py::test_c",
+            "test_slow.py::test_d", "test_fast.py::test_b", "test_fast.py::test_a",
+        ]
+
+    def test_xdist_run_completes(self, scheduled):
+        pytest.importorskip("xdist")
+
+        result = scheduled.runpytest_subprocess("-n", "2", timeout=120)
+
+        result.assert_outcomes(passed=6)
+
+    @pytest.mark.parametrize("load_scheduling, longest_first", [(_LoadScheduling, True),
+                                                                 (_ChangedLoadScheduling, False)])
+    def test_scheduler_falls_back_without_the_xdist_internals(self, monkeypatch, load_scheduling, longest_first):
+        scheduler_module = pytest.importorskip("xdist.scheduler")
+        monkeypatch.setattr(scheduler_module, "LoadScheduling", load_scheduling)
+        plugin = DurationSchedulerPlugin(_Config())
+
+        if longest_first:
+            scheduler = plugin.pytest_xdist_make_scheduler(_Config(), None)
+            assert type(scheduler).__name__ == "LongestFirstScheduling"
+        else:
+            with pytest.warns(UserWarning, match="node2collection"):
+                scheduler = plugin.pytest_xdist_make_scheduler(_Config(), None)
+            assert type(scheduler) is _ChangedLoadScheduling
@@ -0,0 +1,93 @@
+import openpyxl
+import pandas as pd
+import pytest
+
+from utils.excel_parser import Excel_Parser
+
+
+@pytest.fixture
+def sheet_rows(monkeypatch):
+    """ Rows returned by iter_excel_rows, set by the test """
+    rows = []
+    monkeypatch.setattr(Excel_Parser, 'iter_excel_rows', staticmethod(lambda excel_path, sheet_name: iter(rows)))
+    return rows
+
+
+class TestReadFromExcel:
+
+    def test_workbook_rows_and_columns(self, tmp_path):
+        path = str(tmp_path / "data.xlsx")
+        work_book = openpyxl.Workbook()
+        sheet = work_book.active
+        sheet.title = "stations"
+        for row in (("id", "name"), (1, "a"), (2, "b")):
+            sheet.append(row)
+        work_book.save(path)
+
+        parser = Excel_Parser()
+        assert parser.read_from_excel("stations", path) == [1, "a", 2, "b"]
+        assert parser.read_from_excel("stations", path, orient='rows') == [{"id": 1, "name": "a"},
+                                                                           {"id": 2, "name": "b"}]
+        assert parser.read_from_excel("stations", path, orient='columns') == {"id": [1, 2], "name": ["a", "b"]}
+
+    def test_ragged_workbook(self, tmp_path):
+        path = str(tmp_path / "ragged.xlsx")
+        work_book = openpyxl.Workbook()
+        sheet = work_book.active
+        sheet.title = "stations"
+        for row in (("id", "name", "power"), (1, "a"), (2, "b", 22), (3,)):
+            sheet.append(row)
+        work_book.save(path)
+
+        parser = Excel_Parser()
+        assert parser.read_from_excel("stations", path) == [1, "a", None, 2, "b", 22, 3, None, None]
+        assert parser.read_from_excel("stations", path, orient='columns') == {
+            "id": [1, 2, 3], "name": ["a", "b", None], "power": [None, 22, None]}
+
+    def test_short_rows_are_padded_in_every_orientation(self, sheet_rows):
+        sheet_rows.extend([("id", "name", "power"), (1, "a"), (2, "b", 22, "extra")])
+
+        flat = Excel_Parser().read_from_excel("stations", "data.xlsx")
+        rows = Excel_Parser().read_from_excel("stations", "data.xlsx", orient='rows')
+        columns = Excel_Parser().read_from_excel("stations", "data.xlsx", orient='columns')
+
+        assert flat == [1, "a", None, 2, "b", 22]
+        assert rows == [{"id": 1, "name": "a", "power": None}, {"id": 2, "name": "b", "power": 22}]
+        assert columns == {"id": [1, 2], "name": ["a", "b"], "power": [None, 22]}
+
+    def test_repeated_headers_are_renamed(self, sheet_rows):
+        sheet_rows.extend([("id", "name", "name"), (1, "a", "b")])
+
+        columns = Excel_Parser().read_from_excel("stations", "data.xlsx", orient='columns')
+
+        assert columns == {"id": [1], "name": ["a"], "name.1": ["b"]}
+
+
+@pytest.fixture
+def stations():
+    return pd.DataFrame({
+        "id": [1, 2, 3, 4, 5],
+        "country": ["FI", "SE", "FI", "NO", "FI"],
+        "power": [11, 22, 50, 150, 22],
+    })
+
+
+class TestQueryData:
+
+    def test_operators_are_combined(self, stations):
+        data = Excel_Parser.query_data(stations, {"country": ["FI", "SE"], "power": {"ge": 22, "lt": 150}},
+                                       retrieve_columns=["id"])
+        assert data == {"id": [2, 3, 5]}
+
+    def test_between_equality_and_sorting(self, stations):
+        data = Excel_Parser.query_data(stations, {"power": {"between": (20, 60)}, "country": "FI"},
+                                       sort_by="power", ascending=False, retrieve_columns=["id", "power"])
+        assert data == {"id": [3, 5], "power": [50, 22]}
+
+    def test_unknown_operator(self, stations):
+        with pytest.raises(ValueError, match="Unsupported operator 'like'"):
+            Excel_Parser.query_data(stations, {"country": {"like": "F%"}})
+
+    def test_get_csv_data_keys_columns_in_order(self, stations):
+        data = Excel_Parser.get_csv_data(stations, ["country"], ["FI"], ["power", "id"], sort_by="id")
+        assert data == {"col1": [11, 50, 22], "col2": [1, 3, 5]}
@@ -0,0 +1,41 @@
+import pytest
+
+from utils import highlight
+from utils.config import TestData
+
+
+class _Driver:
+
+    def __init__(self):
+        self.highlighted = []
+
+    def execute_script(self, script, element, color):
+        self.highlighted.append((element, color))
+
+
+@pytest.fixture
+def on_failure(monkeypatch):
+    monkeypatch.setattr(TestData, "HIGHLIGHT_MODE", "on_failure")
+
+
+class TestHighlight:
+
+    def test_last_clicked_element_is_highlighted_once(self, on_failure):
+        driver = _Driver()
+        highlight.before_click(driver, "first")
+        highlight.before_click(driver, "second")
+
+        highlight.highlight_last_element(driver)
+        highlight.highlight_last_element(driver)
+
+        assert driver.highlighted == [("second", "red")]
+
+    def test_forget_drops_the_element_of_a_previous_test(self, on_failure):
+        driver = _Driver()
+        highlight.before_click(driver, "from a passed test")
+
+        highlight.forget(driver)
+        highlight.highlight_last_element(driver)
+
+        assert driver.highlighted == []
+        assert driver not in highlight._last_elements
@@ -0,0 +1,20 @@
+import pytest
+
+pytest_plugins = ['pytester']
+
+
+def test_collection_error_is_reported_in_the_html_report(pytester):
+    pytest.importorskip('pytest_html')
+    pytester.makeconftest("""
+        from tests.conftest import pytest_html_results_table_header, pytest_html_results_table_row  # noqa: F401
+    """)
+    pytester.makepyfile(test_broken="""
+        raise KeyError('DISPLAY')
+    """)
+
+    result = pytester.runpytest('--html', 'report.html')
+
+    assert 'INTERNALERROR' not in result.stdout.str()
+    result.assert_outcomes(errors=1)
+    assert result.ret == pytest.ExitCode.INTERRUPTED
+    assert (pytester.path / 'report.html').exists()
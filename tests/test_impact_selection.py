@@ -0,0 +1,130 @@
+import json
+import os
+import sys
+import threading
+
+import pytest
+
+from utils.config import TestData
+from utils.impact_selection import ImpactMap
+
+pytest_plugins = ['pytester']
+
+
+@pytest.fixture
+def impact(tmp_path, monkeypatch):
+    monkeypatch.setattr(TestData, 'TEST_IMPACT_PATHS', ('lib', 'tests'))
+    (tmp_path / 'lib').mkdir()
+    (tmp_path / 'lib' / 'a.py').write_text('A = 1\n')
+    return ImpactMap(str(tmp_path / 'impact.json'), str(tmp_path))
+
+
+class TestImpactMap:
+
+    def test_relative_paths(self, impact, monkeypatch):
+        assert impact.relative(os.path.join(impact.root, 'lib', 'a.py')) == 'lib/a.py'
+        assert impact.relative(os.path.join(impact.root, 'lib', 'data.json')) is None
+        assert impact.relative(os.path.join(impact.root, 'other', 'b.py')) is None
+        assert impact.relative(os.path.join(impact.root, 'utils', 'config.py')) == 'utils/config.py'
+
+        def other_drive(path, start):
+            raise ValueError("path is on mount 'D:', start on mount 'C:'")
+
+        monkeypatch.setattr(os.path, 'relpath', other_drive)
+        assert impact.relative('D:\\lib\\a.py') is None
+
+    def test_changed_files(self, impact):
+        impact.record('test_a', ['lib/a.py'])
+        impact.save(['test_a'])
+        assert impact.changed_files('test_a') == []
+        assert impact.changed_files('test_new') is None
+
+        with open(os.path.join(impact.root, 'lib', 'a.py'), 'w') as file:
+            file.write('A = 2\n')
+        assert ImpactMap(impact.path, impact.root).changed_files('test_a') == ['lib/a.py']
+
+
+@pytest.fixture
+def project(pytester, monkeypatch):
+    """ pytester project recording the files of its tests into impact.json """
+    monkeypatch.setattr(TestData, 'TEST_IMPACT_MODE', 'record')
+    monkeypatch.setattr(TestData, 'ROOT_PATH', str(pytester.path))
+    monkeypatch.setattr(TestData, 'TEST_IMPACT_FILE', str(pytester.path / 'impact.json'))
+    monkeypatch.setattr(TestData, 'TEST_IMPACT_PATHS', ('lib', 'tests'))
+    pytester.syspathinsert()
+    pytester.mkpydir('lib')
+    pytester.makepyfile(**{
+        'lib/a': 'def used():\n    return 1\n',
+        'lib/b': 'def helper():\n    return 2\n',
+        'lib/c': 'def in_thread():\n    return 3\n',
+        'lib/d': 'def cleanup():\n    return 4\n',
+        'lib/plugin': (
+            'class CallPlugin:\n'
+            '    def pytest_runtest_call(self, item):\n'
+            '        self.note(item)\n\n'
+            '    def note(self, item):\n'
+            '        item.noted = True\n'
+        ),
+    })
+    pytester.makeconftest("""
+        import importlib
+
+        import pytest
+
+        from lib.plugin import CallPlugin
+        from utils import impact_selection
+
+
+        def pytest_configure(config):
+            impact_selection.register(config)
+            config.pluginmanager.register(CallPlugin(), 'call_plugin')
+
+
+        @pytest.fixture
+        def prepared():
+            yield importlib.import_module('lib.b').helper()
+            importlib.import_module('lib.d').cleanup()
+    """)
+    pytester.mkdir('tests')
+    pytester.makepyfile(**{'tests/test_x': """
+        import importlib
+        import threading
+
+
+        def test_direct(prepared):
+            assert importlib.import_module('lib.a').used() == 1
+
+
+        def test_thread():
+            thread = threading.Thread(target=importlib.import_module('lib.c').in_thread)
+            thread.start()
+            thread.join()
+    """})
+    return pytester
+
+
+class TestImpactSelection:
+
+    def test_records_files_run_by_the_test_and_its_fixtures(self, project):
+        trace, thread_trace = sys.gettrace(), threading.gettrace()
+
+        project.runpytest().assert_outcomes(passed=2)
+
+        assert (sys.gettrace(), threading.gettrace()) == (trace, thread_trace)
+        with open(TestData.TEST_IMPACT_FILE) as file:
+            recorded = {nodeid: sorted(files) for nodeid, files in json.load(file).items()}
+        assert recorded == {
+            'tests/test_x.py::test_direct': ['lib/a.py', 'lib/b.py', 'lib/d.py', 'tests/test_x.py',
+                                            'utils/config.py'],
+            'tests/test_x.py::test_thread': ['lib/c.py', 'tests/test_x.py', 'utils/config.py'],
+        }
+
+    def test_select_runs_tests_with_changed_files(self, project, monkeypatch):
+        project.runpytest().assert_outcomes(passed=2)
+        (project.path / 'lib' / 'c.py').write_text('def in_thread():\n    return 4\n')
+        monkeypatch.setattr(TestData, 'TEST_IMPACT_MODE', 'select')
+
+        result = project.runpytest()
+
+        result.assert_outcomes(passed=1, deselected=1)
+        result.stdout.fnmatch_lines(['*Test impact: 1 of 2 tests affected by changes*'])
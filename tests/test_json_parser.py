@@ -0,0 +1,46 @@
+import json
+import os
+
+import pytest
+
+from utils.json_parser import JsonParser
+
+
+def _write_records(path, records, mtime_offset=0):
+    with open(path, 'w') as file:
+        for record in records:
+            file.write(json.dumps(record) + "\n")
+            file.write("\n")
+    if mtime_offset:
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + mtime_offset * 10 ** 9))
+
+
+@pytest.fixture(params=[False, True], ids=["file", "mmap"])
+def records_file(request, tmp_path):
+    path = str(tmp_path / "stations.jsonl")
+    _write_records(path, [{"id": i} for i in range(5)])
+    with JsonParser(path, use_mmap=request.param) as parser:
+        yield path, parser
+
+
+class TestJsonParser:
+
+    def test_random_access(self, records_file):
+        path, parser = records_file
+
+        assert parser.record_count() == 5
+        assert parser.get_record(3) == {"id": 3}
+        assert parser.get_record(-1) == {"id": 4}
+        assert parser.get_records([4, 0]) == [{"id": 4}, {"id": 0}]
+        assert [record["id"] for record in parser.iter_records()] == list(range(5))
+
+    def test_rewritten_file_is_read_again(self, records_file):
+        path, parser = records_file
+        assert parser.get_record(1) == {"id": 1}
+
+        _write_records(path, [{"id": i, "name": f"station {i}"} for i in range(10, 17)], mtime_offset=10)
+
+        assert parser.record_count() == 7
+        assert parser.get_record(1) == {"id": 11, "name": "station 11"}
+        assert parser.get_record(-1) == {"id": 16, "name": "station 16"}
@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+from utils.config import TestData
+from utils.network_monitor import NetworkMonitor
+
+
+class _LogDriver:
+    """ Stand-in driver whose performance log, like Chrome's, is emptied by every read """
+
+    def __init__(self):
+        self.entries = []
+
+    def log(self, method, **params):
+        self.entries.append({'message': json.dumps({'message': {'method': method, 'params': params}})})
+
+    def request(self, request_id, url, timestamp=1.0):
+        self.log('Network.requestWillBeSent', requestId=request_id, request={'url': url, 'method': 'GET'},
+                 type='Document', timestamp=timestamp)
+
+    def finish(self, request_id, timestamp=1.5):
+        self.log('Network.responseReceived', requestId=request_id, response={'status': 200}, timestamp=timestamp)
+        self.log('Network.loadingFinished', requestId=request_id, encodedDataLength=100, timestamp=timestamp)
+
+    def get_log(self, log_type):
+        entries, self.entries = self.entries, []
+        return entries
+
+
+@pytest.fixture
+def driver():
+    return _LogDriver()
+
+
+class TestNetworkMonitor:
+
+    def test_one_monitor_per_driver(self, driver):
+        assert NetworkMonitor.for_driver(driver) is NetworkMonitor.for_driver(driver)
+        assert NetworkMonitor.for_driver(_LogDriver()) is not NetworkMonitor.for_driver(driver)
+
+    def test_consumers_each_see_every_record_once(self, driver):
+        monitor = NetworkMonitor.for_driver(driver)
+        driver.request('1', 'https://example.com/')
+        driver.finish('1')
+
+        assert [record.url for record in monitor.new_records('metrics')] == ['https://example.com/']
+        assert monitor.status_codes() == [200]
+        assert monitor.new_records('metrics') == []
+
+        monitor.clear()
+        driver.request('2', 'https://example.com/next')
+        driver.finish('2')
+        assert [record.request_id for record in monitor.new_records('metrics')] == ['2']
+        assert [record.request_id for record in monitor.new_records('other')] == ['2']
+
+    def test_requests_without_finish_event_expire(self, driver, monkeypatch):
+        monitor = NetworkMonitor.for_driver(driver)
+        driver.request('1', 'https://example.com/aborted')
+        assert not monitor.is_idle(quiet_ms=0)
+
+        monkeypatch.setattr(TestData, 'NETWORK_INFLIGHT_MAX_AGE', 0)
+        assert monitor.is_idle(quiet_ms=0)
+
+    def test_navigation_and_reset_forget_open_requests(self, driver):
+        monitor = NetworkMonitor.for_driver(driver)
+        driver.request('1', 'https://example.com/aborted')
+        monitor.navigated()
+        assert monitor.inflight_count == 0
+
+        driver.request('2', 'https://example.com/')
+        driver.finish('2')
+        monitor.reset()
+        assert monitor.records == [] and driver.entries == []
@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+from utils.network_monitor import RequestTiming
+from utils.page_metrics import PageMetrics
+
+
+class _Driver:
+    """ Stand-in driver returning fixed navigation/resource timing """
+
+    def __init__(self, **timing):
+        self.timing = dict(url='https://example.com/', ttfb_ms=50.0, dom_content_loaded_ms=300.0, load_ms=800.0,
+                           document_bytes=1000, resource_count=4, resource_bytes=9000, **timing)
+
+    def execute_script(self, script):
+        return dict(self.timing)
+
+
+def _request(size, failed=False):
+    return RequestTiming('1', 'https://example.com/', 'GET', 'Document', 200, 10.0, 5.0, size, failed)
+
+
+def _page(label='open_url', **values):
+    page = dict(url='https://example.com/', label=label, load_ms=800.0, ttfb_ms=50.0, total_bytes=10000,
+                resource_count=4)
+    page.update(values)
+    return page
+
+
+class TestPageMetrics:
+
+    def test_collect_prefers_the_larger_network_byte_count(self):
+        metrics = PageMetrics.collect(_Driver(), [_request(30000), _request(None, failed=True)], 'open_url')
+
+        assert (metrics['requests'], metrics['failed_requests'], metrics['network_bytes']) == (2, 1, 30000)
+        assert metrics['total_bytes'] == 30000
+        assert PageMetrics.collect(_Driver(), None)['total_bytes'] == 10000
+
+    def test_metrics_are_kept_per_test_and_written_at_finish(self, tmp_path):
+        driver, path = _Driver(), str(tmp_path / 'metrics' / 'page_metrics.jsonl')
+        PageMetrics.record(driver, _page())
+        assert PageMetrics.peek(driver) == []
+
+        PageMetrics.start(driver, 'test_a')
+        PageMetrics.record(driver, _page())
+        PageMetrics.record(driver, _page('search', load_ms=1200.0, total_bytes=5000))
+
+        assert len(PageMetrics.peek(driver)) == 2
+        assert len(PageMetrics.finish(driver, path)) == 2
+        assert PageMetrics.finish(driver, path) == []
+        with open(path) as file:
+            lines = [json.loads(line) for line in file]
+        assert [(line['test'], len(line['pages'])) for line in lines] == [('test_a', 2)]
+
+    def test_summary(self):
+        summary = PageMetrics.summary([_page(load_ms=None, total_bytes=20000), _page(load_ms=900.0),
+                                       _page(load_ms=400.0)])
+
+        assert summary == {'max_load_ms': 900.0, 'max_bytes': 20000}
+        assert PageMetrics.summary([]) == {'max_load_ms': None, 'max_bytes': None}
+
+    def test_budget_within_limits(self):
+        PageMetrics.assert_budget([_page(), _page(load_ms=None)], max_load_ms=1000, max_bytes=10000,
+                                  max_requests=5, max_ttfb_ms=100)
+
+    def test_budget_exceeded_lists_every_violation(self):
+        pages = [_page(), _page('search', load_ms=2500.0, ttfb_ms=400.0, total_bytes=50000, requests=12)]
+
+        with pytest.raises(AssertionError) as error:
+            PageMetrics.assert_budget(pages, max_load_ms=1000, max_bytes=10000, max_requests=10, max_ttfb_ms=100)
+
+        message = str(error.value)
+        assert 'open_url' not in message
+        assert 'search https://example.com/: load time 2500 ms exceeds 1000 ms' in message
+        assert 'TTFB 400 ms exceeds 100 ms' in message
+        assert '50000 bytes exceeds 10000 bytes' in message
+        assert '12 requests exceeds 10' in message
@@ -0,0 +1,59 @@
+import io
+import os
+
+import pytest
+
+from utils import screenshots
+from utils.screenshots import ScreenshotPipeline
+
+
+class _Driver:
+
+    def __init__(self, png):
+        self.png = png
+
+    def get_screenshot_as_png(self):
+        if isinstance(self.png, Exception):
+            raise self.png
+        return self.png
+
+
+@pytest.fixture
+def pipeline(tmp_path):
+    pipeline = ScreenshotPipeline(tmp_path / "screenshots")
+    yield pipeline
+    pipeline.close()
+
+
+class TestScreenshotPipeline:
+
+    def test_without_pillow_png_is_stored_once_as_its_own_thumbnail(self, pipeline, monkeypatch):
+        monkeypatch.setattr(screenshots, "Image", None)
+        png = b"\x89PNG not really an image"
+
+        first = pipeline.capture(_Driver(png))
+        second = pipeline.capture(_Driver(png))
+        pipeline.flush()
+
+        image, thumbnail = first
+        assert first == second and image == thumbnail and image.endswith(".png")
+        assert os.listdir(pipeline.folder) == [os.path.basename(image)]
+        with open(os.path.join(pipeline.folder, os.path.basename(image)), "rb") as file:
+            assert file.read() == png
+
+    def test_failed_capture(self, pipeline):
+        assert pipeline.capture(_Driver(RuntimeError("no session"))) is None
+        assert not os.path.exists(pipeline.folder)
+
+    def test_downscaled_jpeg_and_thumbnail(self, pipeline, monkeypatch):
+        Image = pytest.importorskip("PIL.Image")
+        monkeypatch.setattr(screenshots.TestData, "SCREENSHOT_MAX_WIDTH", 100)
+        buffer = io.BytesIO()
+        Image.new("RGB", (400, 200), "red").save(buffer, "PNG")
+
+        image, thumbnail = pipeline.capture(_Driver(buffer.getvalue()))
+        pipeline.flush()
+
+        with Image.open(os.path.join(pipeline.folder, os.path.basename(image))) as stored:
+            assert stored.size == (100, 50)
+        assert os.path.exists(os.path.join(pipeline.folder, os.path.basename(thumbnail)))
@@ -0,0 +1,106 @@
+import json
+
+import pytest
+
+from utils.config import TestData
+
+pytest_plugins = ['pytester']
+
+
+@pytest.fixture
+def streamed_run(pytester):
+    """ Runs a pytester project with the streaming report and returns its records """
+    reports_dir = pytester.mkdir('reports')
+    pytester.makeconftest(f"""
+        import pytest
+
+        from utils import stream_report
+
+
+        def pytest_configure(config):
+            stream_report.register(config, {str(reports_dir)!r})
+
+
+        @pytest.fixture
+        def broken_teardown():
+            yield
+            raise RuntimeError('teardown broke')
+
+
+        @pytest.fixture
+        def broken_setup():
+            raise RuntimeError('setup broke')
+    """)
+    pytester.makepyfile(test_outcomes="""
+        import pytest
+
+
+        def test_passes():
+            pass
+
+
+        def test_fails():
+            assert False
+
+
+        def test_fails_and_teardown_errors(broken_teardown):
+            assert False, 'call failed'
+
+
+        def test_teardown_errors(broken_teardown):
+            pass
+
+
+        def test_setup_errors(broken_setup):
+            pass
+
+
+        def test_skipped():
+            pytest.skip('not here')
+
+
+        @pytest.mark.xfail
+        def test_xfails():
+            assert False
+    """)
+
+    def run():
+        result = pytester.runpytest()
+        with open(reports_dir / TestData.STREAM_REPORT_RECORDS, encoding='utf-8') as file:
+            return result, [json.loads(line) for line in file]
+    return run
+
+
+class TestStreamReport:
+
+    def test_one_record_per_test(self, streamed_run):
+        result, records = streamed_run()
+
+        assert [record['type'] for record in records] == ['session'] + ['test'] * 7 + ['summary']
+        tests = {record['nodeid'].split('::')[-1]: record for record in records[1:-1]}
+        assert {name: record['outcome'] for name, record in tests.items()} == {
+            'test_passes': 'passed',
+            'test_fails': 'failed',
+            'test_fails_and_teardown_errors': 'failed',
+            'test_teardown_errors': 'error',
+            'test_setup_errors': 'error',
+            'test_skipped': 'skipped',
+            'test_xfails': 'xfailed',
+        }
+        assert records[-1]['outcomes'] == {'passed': 1, 'failed': 2, 'error': 2, 'skipped': 1, 'xfailed': 1}
+
+    def test_failure_logs_of_every_phase_are_kept(self, streamed_run):
+        _, records = streamed_run()
+
+        tests = {record['nodeid'].split('::')[-1]: record for record in records[1:-1]}
+        log = tests['test_fails_and_teardown_errors']['log']
+        assert 'call failed' in log and 'teardown broke' in log
+        assert (tests['test_teardown_errors']['when'], tests['test_setup_errors']['when']) == ('teardown', 'setup')
+        assert tests['test_passes']['log'] == ''
+
+    def test_viewer_is_written_next_to_the_records(self, streamed_run, pytester):
+        result, _ = streamed_run()
+
+        viewer = (pytester.path / 'reports' / TestData.STREAM_REPORT_VIEWER).read_text(encoding='utf-8')
+        assert TestData.STREAM_REPORT_RECORDS in viewer
+        result.stdout.fnmatch_lines(['*Streamed report: *'])
@@ -0,0 +1,119 @@
+import json
+
+import pytest
+
+from api.logger import Logger
+from utils.config import TestData
+from utils import timing_plugin
+from utils.timing_plugin import TimingPlugin, TimingRecorder, _query_label, instrument
+
+pytest_plugins = ['pytester']
+
+
+class _Page:
+
+    def open(self):
+        return self.find()
+
+    def find(self):
+        return 'element'
+
+    @staticmethod
+    def wait():
+        return 'ready'
+
+
+class _Database:
+
+    def execute_query(self, query, params=None):
+        return [(1,)]
+
+
+@pytest.fixture
+def recorder():
+    TimingRecorder.start_test('test')
+    yield TimingRecorder
+    TimingRecorder.finish_test()
+
+
+class TestInstrument:
+
+    def test_only_the_outermost_call_is_recorded(self, recorder):
+        instrument(_Page, 'page')
+        instrument(_Page, 'page')
+
+        assert _Page().open() == 'element'
+        assert _Page.wait() == 'ready'
+
+        assert [(category, name) for category, name, _ in recorder.finish_test()] == \
+            [('page', '_Page.open'), ('page', '_Page.wait')]
+        assert not getattr(_Page.open.__wrapped__, '__timed__', False)
+
+    def test_label_factory_names_the_operation(self, recorder):
+        instrument(_Database, 'db', ['execute_query'], _query_label)
+
+        _Database().execute_query("select id\n  from stations")
+
+        assert [name for _, name, _ in recorder.finish_test()] == ['execute_query: select id from stations']
+
+    def test_unnamed_operation_is_named_after_the_function(self, recorder):
+        find = TimingRecorder.timed('page', None, _Page.find)
+
+        find(_Page())
+
+        assert [name for _, name, _ in recorder.finish_test()] == ['_Page.find']
+
+    def test_missing_module_warns(self, monkeypatch):
+        monkeypatch.setattr(timing_plugin, 'INSTRUMENTED', [('no_such_module', 'Page', 'page', None, None)])
+
+        with pytest.warns(UserWarning, match='no_such_module is not instrumented'):
+            TimingPlugin(None)
+
+
+@pytest.fixture
+def timed_run(pytester, tmp_path, monkeypatch):
+    monkeypatch.setattr(TestData, 'TEST_TIMINGS_FILE', str(tmp_path / 'metrics' / 'test_timings.json'))
+    logged = []
+    monkeypatch.setattr(Logger, 'log_test_start', classmethod(lambda cls, function: logged.append(function.__name__)))
+    pytester.makeconftest("""
+        from utils import timing_plugin
+
+        def pytest_configure(config):
+            timing_plugin.register(config)
+    """)
+    pytester.makepyfile("""
+        import time
+
+        def test_slow():
+            time.sleep(0.05)
+
+        def test_fails():
+            assert False
+    """)
+
+    def run():
+        result = pytester.runpytest()
+        with open(TestData.TEST_TIMINGS_FILE) as file:
+            return result, json.load(file), logged
+    return run
+
+
+class TestTimingPlugin:
+
+    def test_timings_file_and_summary(self, timed_run):
+        result, timings, logged = timed_run()
+
+        result.assert_outcomes(passed=1, failed=1)
+        result.stdout.fnmatch_lines(['*slowest tests*', '*test_slow*'])
+        tests = {test['nodeid'].split('::')[-1]: test for test in timings['tests']}
+        assert set(tests['test_slow']['phases']) == {'setup', 'call', 'teardown'}
+        assert tests['test_slow']['phases']['call'] >= 0.05
+        assert tests['test_fails']['outcome'] == 'failed'
+        assert logged == []
+
+    def test_test_lifecycle_logging_is_opt_in(self, timed_run, monkeypatch):
+        monkeypatch.setattr(TestData, 'API_LOG_TEST_LIFECYCLE', True)
+
+        _, _, logged = timed_run()
+
+        assert logged == ['test_slow', 'test_fails']
@@ -0,0 +1,154 @@
+import time
+from collections import namedtuple
+
+from selenium.webdriver import ActionChains
+
+# timing of one step; steps sent in the same W3C Actions payload share their segment, elapsed_ms is only measured
+# for steps sent on their own (profile or robot mode) and is None for batched steps
+StepTiming = namedtuple('StepTiming', ['index', 'action', 'segment', 'elapsed_ms'])
+
+Step = namedtuple('Step', ['index', 'action', 'locator', 'target', 'params'])
+
+
+class ActionPipeline:
+    """
+    Compiled list of dict-based user actions.
+
+    The action list is validated once when the pipeline is built. On run() WebDriver steps are sent as one
+    W3C Actions payload, with the locators of all steps resolved in a single script call just before it; the
+    time of the payload is kept in elapsed_ms. In profile and robot mode every step is run on its own, with its
+    locators resolved right before it (so it can act on elements the previous steps made appear), and its time
+    recorded in timings. A pipeline can be built once and run many times.
+
+    WebDriver actions (by/value locate the element, optional where marked *):
+        {'action': 'move_to_element', 'by': ..., 'value': ...}
+        {'action': 'click' | 'double_click' | 'context_click', 'by'*: ..., 'value'*: ...}
+        {'action': 'send_keys', 'text': ..., 'by'*: ..., 'value'*: ...}
+        {'action': 'drag_and_drop', 'by': ..., 'value': ..., 'target_by': ..., 'target_value': ...}
+        {'action': 'pause', 'seconds': ...}
+    Robot (pyautogui) actions, with robot=True:
+        {'action': 'click', 'by': ..., 'value': ...}
+        {'action': 'type', 'by': ..., 'value': ..., 'text': ...}
+        {'action': 'scroll', 'direction': 'up' | 'down', 'amount': ...}
+    """
+
+    # action -> (locator required, locator optional, other required keys)
+    WEBDRIVER_ACTIONS = {
+        'move_to_element': (True, False, ()),
+        'click': (False, True, ()),
+        'double_click': (False, True, ()),
+        'context_click': (False, True, ()),
+        'send_keys': (False, True, ('text',)),
+        'drag_and_drop': (True, False, ('target_by', 'target_value')),
+        'pause': (False, False, ('seconds',)),
+    }
+    ROBOT_ACTIONS = {
+        'click': (True, False, ()),
+        'type': (True, False, ('text',)),
+        'scroll': (False, False, ('direction', 'amount')),
+    }
+
+    def __init__(self, actions_list, robot=False):
+        self.robot = robot
+        self.steps = self._compile(actions_list)
+        self.timings = []
+        self.elapsed_ms = None
+
+    def _compile(self, actions_list):
+        supported = self.ROBOT_ACTIONS if self.robot else self.WEBDRIVER_ACTIONS
+        steps, errors = [], []
+        for index, action in enumerate(actions_list):
+            name = action.get('action')
+            if name not in supported:
+                errors.append(f"step {index}: unsupported action '{name}', use one of {list(supported)}")
+                continue
+            locator_required, locator_optional, required_keys = supported[name]
+            has_locator = 'by' in action or 'value' in action
+            if (locator_required or has_locator) and not ('by' in action and 'value' in action):
+                errors.append(f"step {index} ({name}): 'by' and 'value' are required")
+            elif has_locator and not (locator_required or locator_optional):
+                errors.append(f"step {index} ({name}): does not take a locator")
+            missing = [key for key in required_keys if key not in action]
+            if missing:
+                errors.append(f"step {index} ({name}): missing {missing}")
+            if name == 'scroll' and action.get('direction') not in ('up', 'down', None):
+                errors.append(f"step {index} (scroll): direction must be 'up' or 'down'")
+            locator = (action['by'], action['value']) if 'by' in action and 'value' in action else None
+            target = (action['target_by'], action['target_value']) if name == 'drag_and_drop' and not missing \
+                else None
+            params = {key: value for key, value in action.items()
+                      if key not in ('action', 'by', 'value', 'target_by', 'target_value')}
+            steps.append(Step(index, name, locator, target, params))
+        if errors:
+            raise ValueError("Invalid actions:\n" + "\n".join(errors))
+        return steps
+
+    def locators(self, steps=None):
+        """ Unique locators used by the steps (by default all steps of the pipeline), in first-use order """
+        unique = {}
+        for step in self.steps if steps is None else steps:
+            for locator in (step.locator, step.target):
+                if locator is not None:
+                    unique.setdefault(locator, None)
+        return list(unique)
+
+    def run(self, page, profile=False):
+        """
+        Runs the pipeline on a page object.
+        :param page: BasePage instance, used to resolve locators and for the robot actions
+        :param profile: send every WebDriver step as its own payload to get exact per-step latency
+        :return: list of StepTiming, also kept in self.timings
+        """
+        per_step = self.robot or profile
+        if per_step:
+            segments = [[step] for step in self.steps]
+        else:
+            segments = [self.steps] if self.steps else []
+
+        self.timings = []
+        start_run = time.perf_counter()
+        for segment_index, segment in enumerate(segments):
+            locators = self.locators(segment)
+            elements = page.resolve_locators(locators) if locators else {}
+            start = time.perf_counter()
+            if self.robot:
+                self._run_robot_step(page, segment[0], elements)
+            else:
+                self._run_webdriver_segment(page.driver, segment, elements)
+            elapsed_ms = round((time.perf_counter() - start) * 1000, 1) if per_step else None
+            self.timings.extend(StepTiming(step.index, step.action, segment_index, elapsed_ms) for step in segment)
+        self.elapsed_ms = round((time.perf_counter() - start_run) * 1000, 1)
+        return self.timings
+
+    @staticmethod
+    def _run_webdriver_segment(driver, segment, elements):
+        action_chains = ActionChains(driver)
+        for step in segment:
+            element = elements.get(step.locator)
+            if step.action == 'move_to_element':
+                action_chains.move_to_element(element)
+            elif step.action == 'click':
+                action_chains.click(element)
+            elif step.action == 'double_click':
+                action_chains.double_click(element)
+            elif step.action == 'context_click':
+                action_chains.context_click(element)
+            elif step.action == 'send_keys':
+                if element is not None:
+                    action_chains.send_keys_to_element(element, step.params['text'])
+                else:
+                    action_chains.send_keys(step.params['text'])
+            elif step.action == 'drag_and_drop':
+                action_chains.drag_and_drop(element, elements[step.target])
+            elif step.action == 'pause':
+                action_chains.pause(step.params['seconds'])
+        action_chains.perform()
+
+    @staticmethod
+    def _run_robot_step(page, step, elements):
+        if step.action == 'click':
+            page.click_element_with_robot(elements[step.locator])
+        elif step.action == 'type':
+            page.type_with_robot(elements[step.locator], step.params['text'])
+        elif step.action == 'scroll':
+            page.scroll_with_robot(step.params['direction'], step.params['amount'])
@@ -0,0 +1,154 @@
+import os
+import threading
+
+from selenium import webdriver
+from selenium.common import NoSuchDriverException
+from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.firefox.service import Service as FirefoxService
+
+from utils.config import TestData
+from utils.error_handler import ErrorHandler, ErrorType
+from utils.network_monitor import NetworkMonitor
+
+
+def worker_id():
+    """ Name of the current pytest-xdist worker (gw0, gw1, ...) or 'master' when not running distributed """
+    return os.environ.get('PYTEST_XDIST_WORKER', 'master')
+
+
+def worker_download_folder():
+    """ Download folder of the current worker, so parallel workers never write into the same folder """
+    if worker_id() == 'master':
+        return TestData.DOWNLOAD_FOLDER
+    return os.path.join(TestData.DOWNLOAD_FOLDER, worker_id())
+
+
+def create_driver(browser_name):
+    """ Launches a new browser for the given browser name """
+    try:
+        if browser_name == "chrome":
+            chrome_options = webdriver.ChromeOptions()
+            chrome_options.add_experimental_option("prefs", {
+                "download.default_directory": worker_download_folder(),
+                "download.prompt_for_download": False,
+                "download.directory_upgrade": True,
+                "safebrowsing.enabled": True,
+            })
+            # Enable performance logs (Chrome DevTools Protocol network events)
+            chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+            if TestData.HEADLESS:
+                chrome_options.add_argument('--headless')
+            services = ChromeService(executable_path=os.path.join(TestData.DRIVER_PATH, "chromedriver.exe"))
+            driver = webdriver.Chrome(service=services, options=chrome_options)
+        elif browser_name == "firefox":
+            firefox_options = webdriver.FirefoxOptions()
+            if TestData.HEADLESS:
+                firefox_options.add_argument('--headless')
+            services = FirefoxService(executable_path=os.path.join(TestData.DRIVER_PATH, "geckodriver.exe"))
+            driver = webdriver.Firefox(service=services, options=firefox_options)
+        else:
+            ErrorHandler.raise_error(ErrorType.UNSUPPORTED_DRIVER_TYPE, browser_name)
+    except NoSuchDriverException:
+        print()
+        print(*25 * '*', sep='')
+        print("\033[1mChrome driver path is correct, please check and update the driver")
+        print(*25 * '*', sep='')
+        raise
+    driver.maximize_window()
+    return driver
+
+
+class BrowserPool:
+    """
+    Pool of browsers for one pytest worker process.
+
+    acquire() hands out an idle driver, launching a new one while fewer than size drivers exist and waiting
+    otherwise. release() resets the driver cheaply (cookies, storage, extra windows, pending logs) and puts it
+    back, instead of relaunching the browser for every test. Drivers are relaunched after max_reuse tests or
+    when the reset fails.
+    """
+
+    def __init__(self, browser_name, size=None, max_reuse=None):
+        self.browser_name = browser_name
+        self.size = size or TestData.BROWSER_POOL_SIZE
+        self.max_reuse = max_reuse or TestData.BROWSER_MAX_REUSE
+        self._idle = []
+        self._uses = {}
+        self._launching = 0
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        with self._condition:
+            while not self._idle and len(self._uses) + self._launching >= self.size:
+                self._condition.wait()
+            if self._idle:
+                driver = self._idle.pop()
+                self._uses[driver] += 1
+                return driver
+            # count the launch before starting the browser so concurrent acquire() calls respect the pool size
+            self._launching += 1
+        try:
+            driver = create_driver(self.browser_name)
+        except Exception:
+            with self._condition:
+                self._launching -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self._launching -= 1
+            self._uses[driver] = 1
+        return driver
+
+    def release(self, driver):
+        with self._condition:
+            worn_out = self._uses.get(driver, 0) >= self.max_reuse
+        if worn_out or not self._reset(driver):
+            self._discard(driver)
+            return
+        with self._condition:
+            self._idle.append(driver)
+            self._condition.notify()
+
+    def _reset(self, driver):
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            driver.execute_script("try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}")
+            if self.browser_name == "chrome":
+                # cookies of every domain, and the storage of every origin the test sent requests to, not only
+                # the origin loaded last
+                monitor = NetworkMonitor.for_driver(driver)
+                driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+                for origin in sorted(monitor.visited_origins()):
+                    driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+                # drop the network events of the previous test
+                monitor.reset()
+            else:
+                driver.delete_all_cookies()
+            driver.get("about:blank")
+            return True
+        except Exception as e:
+            print(f"Could not reset the browser, relaunching it: {e}")
+            return False
+
+    def _discard(self, driver):
+        with self._condition:
+            self._uses.pop(driver, None)
+            self._condition.notify()
+        try:
+            driver.quit()
+        except Exception as e:
+            print(e)
+
+    def close_all(self):
+        with self._condition:
+            drivers = list(self._uses)
+            self._idle, self._uses = [], {}
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception as e:
+                print(e)
@@ -11,15 +11,72 @@ class TestData:
     DRIVER_PATH = os.path.join(BASE_DIRECTORY, 'drivers')  # use os.path.join to create a path
     WEB_DRIVER_WAIT = 60
     HEADLESS = False
+    # element highlighting on click: 'off' (CI, one round-trip per click), 'debug' (highlight every click)
+    # or 'on_failure' (highlight the last clicked element only in the screenshot of a failing test)
+    HIGHLIGHT_MODE = os.environ.get('HIGHLIGHT_MODE', 'off')
     ACTION_DELAY = 2
+    WAIT_POLL_MIN = 0.05  # first polling interval of utils.waits.AdaptiveWait, in seconds
+    WAIT_POLL_MAX = 0.5  # polling interval cap, the interval grows by WAIT_POLL_BACKOFF per poll
+    WAIT_POLL_BACKOFF = 1.5
+    NETWORK_INFLIGHT_MAX_AGE = 30  # seconds after which a request without a finish event no longer counts as open
     DOWNLOAD_WAIT_TIME = 60
     DOWNLOAD_FOLDER = os.path.join(BASE_DIRECTORY, 'results', 'media', 'download')
+    CSV_CHUNK_SIZE = 100000  # rows per chunk when reading downloaded CSV files
+    BROWSER_POOL_SIZE = 1  # drivers per pytest(-xdist) worker process
+    BROWSER_MAX_REUSE = 50  # tests served by one driver before it is relaunched
 
     # Reporting
     REPORT_TITLE = "Python automation Testing"
     REPORT_FOLDER = os.path.join(BASE_DIRECTORY, 'results', 'reports')
     INDIVIDUAL_REPORT = False
+    # 'html' (one self-contained pytest-html report written at the end) or 'stream' (utils.stream_report: JSONL
+    # records appended as tests finish, read by a paginated viewer page while the run goes on)
+    REPORT_MODE = os.environ.get('REPORT_MODE', 'html')
+    STREAM_REPORT_RECORDS = 'results.jsonl'
+    STREAM_REPORT_VIEWER = 'report_viewer.html'
+    STREAM_REPORT_PAGE_SIZE = 100  # rows per viewer page
+    STREAM_REPORT_REFRESH = 5  # seconds between reloads while the viewer follows a running test session
+    STREAM_REPORT_MAX_LOG = 20000  # characters of the failure traceback kept per record
     LOG_FOLDER = os.path.join(BASE_DIRECTORY, 'results', 'logs')
+    # failure screenshots (utils.screenshots), downscaled and thumbnailed in the background when Pillow is installed
+    SCREENSHOT_MAX_WIDTH = 1280
+    SCREENSHOT_THUMB_SIZE = (304, 228)
+    SCREENSHOT_JPEG_QUALITY = 80
+    PAGE_METRICS_FILE = os.path.join(BASE_DIRECTORY, 'results', 'metrics', 'page_metrics.jsonl')
+    TEST_TIMINGS_FILE = os.path.join(BASE_DIRECTORY, 'results', 'metrics', 'test_timings.json')
+    # number of slowest tests and operations listed in the terminal summary
+    TIMING_SUMMARY_COUNT = 10
+    # test durations across runs, used to run the tests longest-first (utils.duration_history)
+    DURATION_HISTORY_FILE = os.path.join(BASE_DIRECTORY, 'results', 'metrics', 'duration_history.json')
+    DURATION_HISTORY_WEIGHT = 0.5  # weight of the latest run in the stored duration
+    DURATION_MARKER_DEFAULTS = {'slow': 120.0, 'webtest': 30.0}  # seconds assumed for tests without history
+    # split the run into SHARD_COUNT duration-balanced shards and run shard SHARD_INDEX (0-based), e.g. per CI job
+    SHARD_COUNT = int(os.environ.get('SHARD_COUNT', 1))
+    SHARD_INDEX = int(os.environ.get('SHARD_INDEX', 0))
+    # change-aware test selection (utils.impact_selection): 'off', 'record' (run all tests and record the files
+    # each one depends on) or 'select' (run only the tests whose files changed since they last passed)
+    TEST_IMPACT_MODE = os.environ.get('TEST_IMPACT', 'off')
+    TEST_IMPACT_FILE = os.path.join(BASE_DIRECTORY, 'results', 'metrics', 'test_impact.json')
+    TEST_IMPACT_PATHS = ('pages', 'api', 'utils', 'tests', 'api_test')  # project folders tracked, from ROOT_PATH
+    TEST_IMPACT_ALWAYS = ('utils/config.py',)  # every test depends on these
+
+    # API client (pooled keep-alive session used by api.session.HTTPSession)
+    HTTP_POOL_CONNECTIONS = 10  # number of per-host pools kept alive
+    HTTP_POOL_MAXSIZE = 20  # max connections kept per host
+    HTTP_POOL_BLOCK = False  # block instead of opening extra connections once a host hits HTTP_POOL_MAXSIZE
+    HTTP_MAX_RETRIES = 3
+    HTTP_BACKOFF_FACTOR = 0.3
+    HTTP_RETRY_STATUSES = (502, 503, 504)
+    HTTP_TIMEOUT = 30
+    API_MAX_CONCURRENCY = 20  # in-flight requests for api.async_utility.AsyncUtility; keep <= HTTP_POOL_MAXSIZE
+    LINK_CHECK_MAX_WORKERS = 16  # links checked in parallel by api.link_checker.LinkChecker
+    LINK_CHECK_PER_HOST = 4  # parallel link checks against a single host
+    API_LOG_FILE = os.path.join(LOG_FOLDER, 'tests_output.log')
+    API_LOG_TO_CONSOLE = True
+    API_LOG_TO_FILE = True
+    API_LOG_BATCH_SIZE = 500  # max records written per flush by the background log writer
+    # 'on' logs TEST STARTED/FINISHED around every test (utils.timing_plugin)
+    API_LOG_TEST_LIFECYCLE = os.environ.get('API_LOG_TEST_LIFECYCLE', 'off') == 'on'
 
     # Error handling
     ROOT_DIR = os.path.dirname(os.path.dirname(__file__))
@@ -37,3 +94,7 @@ class TestData:
     PASSWORD = "<pwd>"
     PORT = 3422
     DB_NAME = "<database_name"
+    DB_POOL_MIN_CONN = 1
+    DB_POOL_MAX_CONN = 5
+    DB_POOL_TIMEOUT = 30  # seconds to wait for a free pooled connection
+    DB_FETCH_BATCH_SIZE = 10000  # rows fetched per round-trip by DatabaseHelper.stream_query
@@ -0,0 +1,136 @@
+import hashlib
+import json
+import os
+import threading
+
+import pandas as pd
+import pytest
+
+from utils.config import TestData
+
+
+class _Entry:
+    def __init__(self, frame, mtime, size, digest):
+        self.frame = frame
+        self.mtime = mtime
+        self.size = size
+        self.digest = digest
+        self.indexes = {}
+
+
+class DataStore:
+    """
+    Session-wide cache of parsed test data files (csv, xls/xlsx, json, jsonl).
+
+    Each file (and sheet) is parsed once into a DataFrame. Entries are re-validated with a stat() call on
+    every access: when the mtime or size changed, the file content hash is compared and the entry is
+    re-parsed only if the content really changed. Hash indexes on the key columns used by lookup() are built
+    once per entry, so lookups by key do not rescan the data.
+
+    eg:
+        user = data_store.lookup("users.xlsx", "username", "admin", sheet_name="Login")
+        rows = data_store.lookup_all("stations.csv", ["country", "status"], ("FI", "active"))
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def resolve_path(path):
+        return path if os.path.isabs(path) else os.path.join(TestData.DATA_FILES_PATH, path)
+
+    @staticmethod
+    def _file_digest(path):
+        digest = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _parse(path, sheet_name):
+        extension = os.path.splitext(path)[1].lower()
+        if extension == '.csv':
+            return pd.read_csv(path)
+        if extension in ('.xls', '.xlsx'):
+            return pd.read_excel(path, sheet_name=sheet_name or 0)
+        if extension == '.jsonl':
+            return pd.read_json(path, lines=True)
+        if extension == '.json':
+            with open(path, 'r') as json_file:
+                data = json.load(json_file)
+            return pd.json_normalize(data[sheet_name] if sheet_name else data)
+        raise ValueError(f"Unsupported test data file type: {extension}")
+
+    def _entry(self, path, sheet_name):
+        path = self.resolve_path(path)
+        key = (path, sheet_name)
+        with self._lock:
+            stat = os.stat(path)
+            entry = self._entries.get(key)
+            if entry is not None and (entry.mtime, entry.size) == (stat.st_mtime_ns, stat.st_size):
+                return entry
+            digest = self._file_digest(path)
+            if entry is not None and entry.digest == digest:
+                # touched but unchanged, keep the parsed data and indexes
+                entry.mtime, entry.size = stat.st_mtime_ns, stat.st_size
+                return entry
+            entry = self._entries[key] = _Entry(self._parse(path, sheet_name), stat.st_mtime_ns, stat.st_size,
+                                                digest)
+            return entry
+
+    def load(self, path, sheet_name=None):
+        """ Returns the parsed file as a DataFrame; treat it as read-only, it is shared by every caller """
+        return self._entry(path, sheet_name).frame
+
+    def _index(self, entry, key_columns):
+        key_columns = (key_columns,) if isinstance(key_columns, str) else tuple(key_columns)
+        index = entry.indexes.get(key_columns)
+        if index is None:
+            grouper = key_columns[0] if len(key_columns) == 1 else list(key_columns)
+            index = entry.indexes[key_columns] = entry.frame.groupby(grouper, sort=False, dropna=False).indices
+        return index
+
+    def lookup_all(self, path, key_columns, key, sheet_name=None):
+        """
+        Returns every record whose key_columns equal key.
+
+        :param path: file name inside TestData.DATA_FILES_PATH or an absolute path
+        :param key_columns: column name, or list of column names for a composite key
+        :param key: value, or tuple of values for a composite key
+        :param sheet_name: sheet of an Excel workbook, or top-level key of a JSON object
+        :return: list of dicts
+        """
+        if not isinstance(key_columns, str) and len(key_columns) == 1 and isinstance(key, tuple) and len(key) == 1:
+            # the index of a single column is keyed by plain values, so ['id'] with (2,) is looked up as 'id' with 2
+            key = key[0]
+        with self._lock:
+            entry = self._entry(path, sheet_name)
+            positions = self._index(entry, key_columns).get(key)
+        if positions is None:
+            return []
+        return entry.frame.iloc[positions].to_dict('records')
+
+    def lookup(self, path, key_columns, key, sheet_name=None):
+        """ Returns the first record whose key_columns equal key, or None """
+        records = self.lookup_all(path, key_columns, key, sheet_name)
+        return records[0] if records else None
+
+    def invalidate(self, path=None):
+        """ Drops the cached entries of one file, or of every file when path is None """
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                return
+            path = self.resolve_path(path)
+            for key in [key for key in self._entries if key[0] == path]:
+                del self._entries[key]
+
+
+@pytest.fixture(scope="session")
+def data_store():
+    """ Test data store shared by the whole run, every file is parsed once """
+    store = DataStore()
+    yield store
+    store.invalidate()
@@ -1,75 +1,280 @@
-from datetime import datetime
+import itertools
+import queue
+import threading
+from contextlib import contextmanager
 
+import pandas as pd
 import psycopg2
 
+from utils.config import TestData
+
+
+class PoolTimeoutError(Exception):
+    pass
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of DB-API connections.
+
+    connect is any callable returning a new connection, so the pool works with psycopg2 as well as
+    stand-in backends such as sqlite3 in tests.
+    """
+
+    def __init__(self, connect, minconn=None, maxconn=None, timeout=None):
+        self._connect = connect
+        self.maxconn = maxconn if maxconn is not None else TestData.DB_POOL_MAX_CONN
+        self.timeout = timeout if timeout is not None else TestData.DB_POOL_TIMEOUT
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.maxconn)
+        self._lock = threading.Lock()
+        self._connections = []
+        for _ in range(minconn if minconn is not None else TestData.DB_POOL_MIN_CONN):
+            self._idle.put(self._new_connection())
+
+    def _new_connection(self):
+        connection = self._connect()
+        with self._lock:
+            self._connections.append(connection)
+        return connection
+
+    def getconn(self):
+        """ Checks out a connection, waiting up to timeout seconds when all maxconn are in use """
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PoolTimeoutError(f"No free database connection after {self.timeout} seconds")
+        try:
+            while True:
+                try:
+                    connection = self._idle.get_nowait()
+                except queue.Empty:
+                    return self._new_connection()
+                if not getattr(connection, 'closed', 0):
+                    return connection
+                self._discard(connection)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def putconn(self, connection, close=False):
+        """ Returns a connection to the pool, rolling back any open transaction """
+        try:
+            if close or getattr(connection, 'closed', 0):
+                self._discard(connection)
+                return
+            try:
+                connection.rollback()
+            except Exception:
+                self._discard(connection)
+                return
+            self._idle.put(connection)
+        finally:
+            self._slots.release()
+
+    def _discard(self, connection):
+        with self._lock:
+            if connection in self._connections:
+                self._connections.remove(connection)
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def closeall(self):
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            try:
+                connection.close()
+            except Exception:
+                pass
+
 
 class DatabaseHelper:
+    # pools are shared by every helper pointing at the same database and live until close_all_pools()
+    _pools = {}
+    _pools_lock = threading.Lock()
+    _cursor_names = itertools.count()
 
-    def __init__(self, host, username, password, dbname, port):
+    def __init__(self, host, username, password, dbname, port, connection_factory=None):
         self.host = host
         self.username = username
         self.password = password
         self.database = dbname
         self.port = port
+        self.connection_factory = connection_factory
         self.connection = None
         self.cursor = None
 
-    def connect(self):
+    def _connect(self):
+        if self.connection_factory:
+            return self.connection_factory()
+        return psycopg2.connect(
+            host=self.host,
+            user=self.username,
+            password=self.password,
+            dbname=self.database,
+            port=self.port,
+        )
+
+    @property
+    def pool(self):
+        key = (self.host, self.port, self.username, self.database, self.connection_factory)
+        pool = self._pools.get(key)
+        if pool is None:
+            with self._pools_lock:
+                pool = self._pools.get(key)
+                if pool is None:
+                    pool = self._pools[key] = ConnectionPool(self._connect)
+        return pool
+
+    @classmethod
+    def close_all_pools(cls):
+        with cls._pools_lock:
+            pools, cls._pools = list(cls._pools.values()), {}
+        for pool in pools:
+            pool.closeall()
+
+    @contextmanager
+    def pooled_connection(self):
+        """ Checks out a pooled connection, commits on success and rolls back on error """
+        connection = self.pool.getconn()
         try:
-            self.connection = psycopg2.connect(
-                host=self.host,
-                username=self.username,
-                password=self.password,
-                database=self.database,
-            )
+            yield connection
+            connection.commit()
+        finally:
+            self.pool.putconn(connection)
 
+    def connect(self):
+        try:
+            self.connection = self.pool.getconn()
             self.cursor = self.connection.cursor()
             print("Connected to the database.")
         except Exception as e:
             print(f"Error connecting to the database: {e}")
 
-    def execute_query(self, query):
-        self.connection()
+    @staticmethod
+    def _execute(cursor, query, params):
+        if params is None:
+            cursor.execute(query)
+        else:
+            cursor.execute(query, params)
+
+    def _run_query(self, query, params=None):
+        with self.pooled_connection() as connection:
+            cursor = connection.cursor()
+            try:
+                self._execute(cursor, query, params)
+                if cursor.description is None:
+                    return [], None
+                return [desc[0] for desc in cursor.description], cursor.fetchall()
+            finally:
+                cursor.close()
+
+    def execute_query(self, query, params=None):
         try:
-            self.cursor.execute(query)
-            self.connection.commit()
+            column_names, result = self._run_query(query, params)
             print("Query executed successfully.")
-            result = self.cursor.fetchall()
             return result
         except Exception as e:
             print(f"Error executing query: {e}")
             return None
-        finally:
-            self.connection.rollback()
-            self.disconnect()
-
-    def fetch_rows_with_column_names(self, query):
-        rows_with_column_names = []
-        rows = self.execute_query(query)
-        # Fetch column names
-        column_names = [desc[0] for desc in self.cursor.description]
-        # Fetch rows
-        for row in rows:
-            # Create a dictionary for each row with column names as keys
-            row_dict = dict(zip(column_names, rows))
-            rows_with_column_names.append(row_dict)
-        return rows_with_column_names
-
-    def delete_query(self, query):
-        self.connection()
+
+    def fetch_rows_with_column_names(self, query, params=None):
+        try:
+            column_names, rows = self._run_query(query, params)
+        except Exception as e:
+            print(f"Error executing query: {e}")
+            return None
+        # Create a dictionary for each row with column names as keys
+        return [dict(zip(column_names, row)) for row in rows or []]
+
+    def _streaming_cursor(self, connection, batch_size):
+        # named cursors are server-side in psycopg2; backends without them fall back to a client cursor
         try:
-            self.cursor.execute(query)
-            self.connection.commit()
+            cursor = connection.cursor(name=f"db_helper_stream_{next(self._cursor_names)}")
+            cursor.itersize = batch_size
+        except TypeError:
+            cursor = connection.cursor()
+        return cursor
+
+    def _stream_batches(self, query, params, batch_size):
+        batch_size = batch_size or TestData.DB_FETCH_BATCH_SIZE
+        with self.pooled_connection() as connection:
+            cursor = self._streaming_cursor(connection, batch_size)
+            try:
+                self._execute(cursor, query, params)
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    # a named cursor only has a description once the first batch is fetched
+                    column_names = [desc[0] for desc in cursor.description or []]
+                    yield column_names, rows
+                    if not rows:
+                        break
+            finally:
+                cursor.close()
+
+    def stream_query(self, query, params=None, batch_size=None):
+        """
+        Runs a query on a server-side cursor and yields the result in batches, so large result sets
+        are never fully loaded into memory.
+
+        :param query: SQL query
+        :param params: optional query parameters
+        :param batch_size: rows per batch, defaults to TestData.DB_FETCH_BATCH_SIZE
+        :return: generator of row lists
+        eg: for rows in self.db.stream_query("select * from stations", batch_size=5000): ...
+        """
+        for column_names, rows in self._stream_batches(query, params, batch_size):
+            if rows:
+                yield rows
+
+    def fetch_columns(self, query, params=None, batch_size=None, as_frame=True):
+        """
+        Fetches a query result in columnar form, filled batch by batch from a server-side cursor
+        without building a dict per row.
+
+        :param query: SQL query
+        :param params: optional query parameters
+        :param batch_size: rows per batch, defaults to TestData.DB_FETCH_BATCH_SIZE
+        :param as_frame: return a pandas DataFrame, otherwise a dict of NumPy arrays keyed by column name
+        :return: DataFrame or {column_name: ndarray}
+        """
+        column_names = []
+        frames = []
+        for column_names, rows in self._stream_batches(query, params, batch_size):
+            if rows:
+                frames.append(pd.DataFrame.from_records(rows, columns=column_names))
+        if len(frames) > 1:
+            frame = pd.concat(frames, ignore_index=True)
+        elif frames:
+            frame = frames[0]
+        else:
+            frame = pd.DataFrame(columns=column_names)
+        if as_frame:
+            return frame
+        return {name: frame[name].to_numpy() for name in frame.columns}
+
+    def iter_rows(self, query, params=None, batch_size=None):
+        """ Yields the rows of a query one by one, fetched from the server in batches """
+        for rows in self.stream_query(query, params, batch_size):
+            yield from rows
+
+    def delete_query(self, query, params=None):
+        try:
+            with self.pooled_connection() as connection:
+                cursor = connection.cursor()
+                try:
+                    self._execute(cursor, query, params)
+                finally:
+                    cursor.close()
             print("Query executed successfully")
         except Exception as e:
             print(f"Error fetching data: {e}")
             return None
-        finally:
-            self.connection.rollback()
-            self.disconnect()
 
     def disconnect(self):
         if self.connection:
-            self.connection.close()
+            self.pool.putconn(self.connection)
+            self.connection = None
+            self.cursor = None
             print("Disconnected from the database")
-
@@ -0,0 +1,147 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import sys
+import time
+
+import pandas as pd
+from selenium.common import TimeoutException
+
+from utils.browser_pool import worker_download_folder
+from utils.config import TestData
+
+# files browsers write while a download is still in progress
+PARTIAL_SUFFIXES = ('.crdownload', '.part', '.partial', '.download', '.tmp')
+
+
+class _DirectoryWatcher:
+    """ Wakes up on file creation/rename/close in a folder through inotify on Linux, plain sleeps elsewhere """
+    _IN_CLOSE_WRITE = 0x00000008
+    _IN_MOVED_TO = 0x00000080
+    _IN_CREATE = 0x00000100
+
+    def __init__(self, folder):
+        self._fd = None
+        if not sys.platform.startswith('linux'):
+            return
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK)
+        except (OSError, AttributeError):
+            return
+        if fd < 0:
+            return
+        mask = self._IN_CLOSE_WRITE | self._IN_MOVED_TO | self._IN_CREATE
+        if libc.inotify_add_watch(fd, os.fsencode(folder), mask) < 0:
+            os.close(fd)
+            return
+        self._fd = fd
+
+    def wait(self, timeout):
+        if self._fd is None:
+            time.sleep(timeout)
+            return
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if ready:
+            try:
+                # the events only wake us up, the folder is re-checked by the caller
+                os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                pass
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+class DownloadManager:
+    """
+    Waits for browser downloads in the configured download folder to complete.
+
+    A download is complete once the file exists, no partial file (.crdownload, .part, ...) is left for it and its
+    size did not change between two checks. On Linux the folder is watched with inotify, so the wait ends as soon
+    as the browser renames or closes the file; other platforms poll at adaptive intervals.
+
+    eg:
+        downloads = DownloadManager()
+        downloads.prepare("report.csv")
+        self.click_element(export_button)
+        df = downloads.read_csv(downloads.wait_for_download("report.csv"))
+    """
+
+    def __init__(self, folder=None):
+        self.folder = folder or worker_download_folder()
+        self._before = set()
+
+    def prepare(self, file_name=None):
+        """ Call before starting a download: removes an old copy of file_name and remembers the existing files """
+        os.makedirs(self.folder, exist_ok=True)
+        if file_name:
+            file_path = os.path.join(self.folder, file_name)
+            if os.path.exists(file_path):
+                print(f"The '{file_name}' already exists in the download folder. Removing it. ")
+                os.remove(file_path)
+        self._before = set(os.listdir(self.folder))
+
+    def _candidates(self, file_name, names):
+        if file_name:
+            return [file_name] if file_name in names else []
+        return [name for name in names if name not in self._before and not name.endswith(PARTIAL_SUFFIXES)]
+
+    def _in_progress(self, file_name, names):
+        partials = [name for name in names if name.endswith(PARTIAL_SUFFIXES)]
+        if file_name:
+            return any(name.startswith(file_name) for name in partials)
+        # leftovers of downloads that never finished before prepare() must not block the wait
+        return any(name not in self._before for name in partials)
+
+    def wait_for_download(self, file_name=None, timeout=None):
+        """
+        Waits until the download is complete.
+        :param file_name: expected file name, or None for the first new file since prepare()
+        :param timeout: max seconds to wait, defaults to TestData.DOWNLOAD_WAIT_TIME
+        :return: path of the downloaded file
+        """
+        timeout = timeout or TestData.DOWNLOAD_WAIT_TIME
+        os.makedirs(self.folder, exist_ok=True)
+        deadline = time.perf_counter() + timeout
+        interval = TestData.WAIT_POLL_MIN
+        last_sizes = {}
+        watcher = _DirectoryWatcher(self.folder)
+        try:
+            while True:
+                names = os.listdir(self.folder)
+                if not self._in_progress(file_name, names):
+                    for name in self._candidates(file_name, names):
+                        path = os.path.join(self.folder, name)
+                        try:
+                            size = os.path.getsize(path)
+                        except OSError:
+                            continue
+                        if last_sizes.get(name) == size:
+                            return path
+                        last_sizes[name] = size
+                        # confirm the size on the next short poll
+                        interval = TestData.WAIT_POLL_MIN
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    raise TimeoutException(f"Download of '{file_name or 'a new file'}' into {self.folder} "
+                                           f"did not complete within {timeout} seconds")
+                watcher.wait(min(interval, remaining))
+                interval = min(interval * TestData.WAIT_POLL_BACKOFF, TestData.WAIT_POLL_MAX)
+        finally:
+            watcher.close()
+
+    @staticmethod
+    def read_csv(file_path, chunked=False, chunksize=None, **kwargs):
+        """
+        Reads a downloaded CSV file.
+        :param chunked: return an iterator of DataFrames of TestData.CSV_CHUNK_SIZE rows, so large files are never
+        fully loaded into memory
+        :param chunksize: rows per chunk instead of TestData.CSV_CHUNK_SIZE, implies chunked
+        """
+        if chunked and chunksize is None:
+            chunksize = TestData.CSV_CHUNK_SIZE
+        return pd.read_csv(file_path, chunksize=chunksize, **kwargs)
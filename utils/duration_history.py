@@ -0,0 +1,203 @@
+import json
+import os
+import statistics
+import warnings
+
+import pytest
+
+from utils.browser_pool import worker_id
+from utils.config import TestData
+
+PLUGIN_NAME = 'duration_history'
+
+# internals of xdist's LoadScheduling used by the longest-first scheduler, checked against the installed version
+XDIST_INTERNALS = ('node2collection', 'node2pending', 'pending', 'collection', 'maxschedchunk', '_send_tests',
+                   '_check_nodes_have_same_collection')
+
+
+class DurationHistory:
+    """
+    Measured test durations (setup + call + teardown, in seconds) kept across runs in a JSON file.
+
+    Every new measurement is blended into the stored one (exponential moving average with
+    TestData.DURATION_HISTORY_WEIGHT), so one slow run does not reorder the whole suite.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or TestData.DURATION_HISTORY_FILE
+        self.durations = self._read()
+
+    def _read(self):
+        try:
+            with open(self.path) as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def estimate(self, nodeid, markers=()):
+        """
+        Expected duration of a test: its history, else the default of its slowest marker (slow, webtest),
+        else the median of all known tests.
+        """
+        if nodeid in self.durations:
+            return self.durations[nodeid]
+        marker_defaults = [TestData.DURATION_MARKER_DEFAULTS[marker] for marker in markers
+                           if marker in TestData.DURATION_MARKER_DEFAULTS]
+        if marker_defaults:
+            return max(marker_defaults)
+        return statistics.median(self.durations.values()) if self.durations else 0.0
+
+    def update(self, measured):
+        """ Blends {nodeid: seconds} into the history and writes it, keeping tests that did not run """
+        weight = TestData.DURATION_HISTORY_WEIGHT
+        # re-read so runs finishing one after another do not drop each other's tests
+        durations = self._read()
+        for nodeid, seconds in measured.items():
+            previous = durations.get(nodeid)
+            durations[nodeid] = round(seconds if previous is None else weight * seconds + (1 - weight) * previous, 4)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = f'{self.path}.{os.getpid()}.tmp'
+        with open(temp_path, 'w') as file:
+            json.dump(durations, file, indent=1, sort_keys=True)
+        os.replace(temp_path, self.path)
+        self.durations = durations
+
+
+def assign_shards(durations, shard_count):
+    """
+    Splits tests into shard_count shards of about equal total duration (longest processing time first).
+    :param durations: list of expected durations, longest first
+    :return: list with the shard index of every test
+    """
+    totals = [0.0] * shard_count
+    shards = []
+    for duration in durations:
+        shard = totals.index(min(totals))
+        totals[shard] += duration
+        shards.append(shard)
+    return shards
+
+
+def longest_first(items, estimates):
+    """
+    Orders tests longest-first without splitting the tests of a module or class, so module- and class-scoped
+    fixtures are still set up once: modules are ordered by their total expected duration, the classes and
+    functions in a module by theirs, and the tests of a class by their own.
+    :param estimates: dict of nodeid -> expected duration
+    :return: the reordered list of items
+    """
+    module_totals, group_totals, first_seen = {}, {}, {}
+    keys = []
+    for index, item in enumerate(items):
+        module = item.getparent(pytest.Module)
+        klass = item.getparent(pytest.Class)
+        module_id = module.nodeid if module is not None else item.nodeid
+        group_id = klass.nodeid if klass is not None else item.nodeid
+        estimate = estimates[item.nodeid]
+        module_totals[module_id] = module_totals.get(module_id, 0.0) + estimate
+        group_totals[group_id] = group_totals.get(group_id, 0.0) + estimate
+        first_seen.setdefault(module_id, index)
+        first_seen.setdefault(group_id, index)
+        keys.append((module_id, group_id, estimate, index))
+    # ties keep the collection order
+    order = sorted(keys, key=lambda key: (-module_totals[key[0]], first_seen[key[0]], -group_totals[key[1]],
+                                          first_seen[key[1]], -key[2], key[3]))
+    return [items[key[3]] for key in order]
+
+
+class DurationSchedulerPlugin:
+    """
+    Orders the collected tests longest-first by their duration history and records the new durations.
+
+    With TestData.SHARD_COUNT > 1 only the tests of shard TestData.SHARD_INDEX are run, the shards being
+    balanced by expected duration, so parallel CI jobs finish at about the same time. Under pytest-xdist the
+    first tests are dealt round robin and every worker is kept two tests ahead, so the longest-first order
+    holds across workers and no worker begins with a block of the slowest tests.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.history = DurationHistory()
+        self.measured = {}
+        self.skipped = set()
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, config, items):
+        if not items:
+            return
+        estimates = {item.nodeid: self.history.estimate(item.nodeid, [mark.name for mark in item.iter_markers()])
+                     for item in items}
+        items[:] = longest_first(items, estimates)
+
+        shard_count, shard_index = TestData.SHARD_COUNT, TestData.SHARD_INDEX
+        if shard_count > 1:
+            shards = assign_shards([estimates[item.nodeid] for item in items], shard_count)
+            selected = [item for item, shard in zip(items, shards) if shard == shard_index]
+            deselected = [item for item, shard in zip(items, shards) if shard != shard_index]
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = selected
+
+    def pytest_runtest_logreport(self, report):
+        if report.skipped:
+            # a skipped test says nothing about how long it takes to run
+            self.skipped.add(report.nodeid)
+        self.measured[report.nodeid] = self.measured.get(report.nodeid, 0.0) + report.duration
+
+    def pytest_sessionfinish(self, session):
+        # under xdist the controller receives every report and writes the history once
+        measured = {nodeid: seconds for nodeid, seconds in self.measured.items() if nodeid not in self.skipped}
+        if worker_id() != 'master' or not measured:
+            return
+        self.history.update(measured)
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_xdist_make_scheduler(self, config, log):
+        if config.getvalue('dist') != 'load':
+            # loadscope, loadfile, ... keep their own scheduling
+            return None
+        from xdist.scheduler import LoadScheduling
+
+        class LongestFirstScheduling(LoadScheduling):
+            """
+            Deals two tests per worker round robin at the start, then tops every worker up to two queued tests.
+            A worker needs the test after the current one queued before it can run it, so two is the minimum.
+            """
+
+            def schedule(self):
+                collection = next(iter(self.node2collection.values()), None)
+                if self.collection is not None or collection is None or len(collection) < 2 * len(self.nodes) \
+                        or not self._check_nodes_have_same_collection():
+                    # rescheduling, a small collection or a collection mismatch: LoadScheduling handles these
+                    super().schedule()
+                    return
+                self.collection = collection
+                self.pending[:] = range(len(collection))
+                if self.maxschedchunk is None:
+                    self.maxschedchunk = len(collection)
+                # worker 1 gets the longest and the (n + 1)th longest test, worker 2 the second and (n + 2)th, ...
+                for node in self.nodes * 2:
+                    self._send_tests(node, 1)
+                if not self.pending:
+                    for node in self.nodes:
+                        node.shutdown()
+
+            def check_schedule(self, node, duration=0):
+                if self.pending and not node.shutting_down:
+                    queued = len(self.node2pending[node])
+                    if queued < 2:
+                        self._send_tests(node, 2 - queued)
+                    return
+                super().check_schedule(node, duration)
+
+        scheduler = LongestFirstScheduling(config, log)
+        missing = [name for name in XDIST_INTERNALS if not hasattr(scheduler, name)]
+        if missing:
+            warnings.warn(f"Longest-first scheduling is off, this pytest-xdist has no {', '.join(missing)}")
+            return LoadScheduling(config, log)
+        return scheduler
+
+
+def register(config):
+    """ Registers the duration history plugin once, from any conftest.py """
+    if not config.pluginmanager.has_plugin(PLUGIN_NAME):
+        config.pluginmanager.register(DurationSchedulerPlugin(config), PLUGIN_NAME)
@@ -1,41 +1,160 @@
 import itertools
 import os
+import numpy as np
+import openpyxl
 import pandas as pd
 
 import xlrd
 
 
 class Excel_Parser:
+    # operators accepted in the dict form of a query_data predicate
+    OPERATORS = {
+        'eq': lambda column, value: column.eq(value),
+        'ne': lambda column, value: column.ne(value),
+        'lt': lambda column, value: column.lt(value),
+        'le': lambda column, value: column.le(value),
+        'gt': lambda column, value: column.gt(value),
+        'ge': lambda column, value: column.ge(value),
+        'in': lambda column, value: column.isin(value),
+        'between': lambda column, value: column.between(value[0], value[1]),
+    }
 
-    def read_from_excel(self, sheet_name, excel_path):
-        rows_val = []
-        # read from file
-        work_book = xlrd.open_workbook(self, excel_path)
-        sheet = work_book.sheet_by_name(sheet_name)
-
-        # get all values, iterating through rows and columns
-        num_cols = sheet.ncols  # Number of columns
-        for row_idx, col_idx in itertools.product(
-                range(1, sheet.nrows), range(num_cols)
-        ):
-            cell_obj = sheet.cell(row_idx, col_idx)  # Get cell object by row, col
-            # Convert cell to string,split it according to "'" and take the second cell in the array created
-            # e.g.: cell_obj == "text:'something'" --> after convert and splitting == "something"
-            rows_val.append(str(cell_obj).split("'")[1])
-        return rows_val
+    @staticmethod
+    def iter_excel_rows(excel_path, sheet_name):
+        """
+        Yields every non-empty row of a sheet as a tuple of typed values (numbers, dates, strings, booleans).
+
+        .xlsx files are streamed with openpyxl in read-only mode, so the workbook is never fully loaded
+        into memory; .xls files are read row by row with xlrd.
+        """
+        if os.path.splitext(excel_path)[1].lower() == '.xls':
+            work_book = xlrd.open_workbook(excel_path, on_demand=True)
+            try:
+                sheet = work_book.sheet_by_name(sheet_name)
+                for row_idx in range(sheet.nrows):
+                    values = sheet.row_values(row_idx)
+                    for col_idx, cell_type in enumerate(sheet.row_types(row_idx)):
+                        if cell_type == xlrd.XL_CELL_DATE:
+                            values[col_idx] = xlrd.xldate_as_datetime(values[col_idx], work_book.datemode)
+                        elif cell_type == xlrd.XL_CELL_BOOLEAN:
+                            values[col_idx] = bool(values[col_idx])
+                        elif cell_type in (xlrd.XL_CELL_EMPTY, xlrd.XL_CELL_BLANK):
+                            values[col_idx] = None
+                    if any(value is not None for value in values):
+                        yield tuple(values)
+            finally:
+                work_book.release_resources()
+        else:
+            work_book = openpyxl.load_workbook(excel_path, read_only=True, data_only=True)
+            try:
+                for values in work_book[sheet_name].iter_rows(values_only=True):
+                    if any(value is not None for value in values):
+                        yield values
+            finally:
+                work_book.close()
+
+    def read_from_excel(self, sheet_name, excel_path, orient='flat'):
+        """
+        Reads the data rows (everything below the header row) of a sheet with typed values.
+
+        Args:
+            sheet_name (str): Name of the sheet.
+            excel_path (str): Path to the .xls or .xlsx workbook.
+            orient (str): 'flat' - list of all cell values row by row,
+                'rows' - list of dicts keyed by the header row,
+                'columns' - dict of header -> list of column values.
+                Short rows are padded with None, repeated header names get a .1, .2, ... suffix.
+
+        Returns:
+            list or dict: The sheet data in the requested orientation.
+        """
+        if orient not in ('flat', 'rows', 'columns'):
+            raise ValueError("Invalid 'orient' option. Use 'flat', 'rows', or 'columns'.")
+        rows = self.iter_excel_rows(excel_path, sheet_name)
+        header = self._header_names(next(rows, ()))
+        width = len(header)
+        # read-only rows can be shorter than the header when trailing cells are empty: every orientation pads
+        # them with None, and cells right of the last header column are ignored
+        padded = (tuple(row[:width]) + (None,) * (width - len(row)) for row in rows)
+        if orient == 'flat':
+            return list(itertools.chain.from_iterable(padded))
+        if orient == 'rows':
+            return [dict(zip(header, row)) for row in padded]
+        columns = {name: [] for name in header}
+        appenders = [columns[name].append for name in header]
+        for row in padded:
+            for append, value in zip(appenders, row):
+                append(value)
+        return columns
+
+    @staticmethod
+    def _header_names(header):
+        """ Header row as unique column names; repeated names get a .1, .2, ... suffix like pandas.read_csv """
+        names, used = [], set()
+        for name in header:
+            unique, count = name, 0
+            while unique in used:
+                count += 1
+                unique = f"{name}.{count}"
+            used.add(unique)
+            names.append(unique)
+        return names
+
+    @staticmethod
+    def _predicate_mask(column, predicate):
+        if isinstance(predicate, dict):
+            mask = np.ones(len(column), dtype=bool)
+            for operator, value in predicate.items():
+                if operator not in Excel_Parser.OPERATORS:
+                    raise ValueError(f"Unsupported operator '{operator}'. Use one of {list(Excel_Parser.OPERATORS)}")
+                mask &= Excel_Parser.OPERATORS[operator](column, value).to_numpy(dtype=bool)
+            return mask
+        if isinstance(predicate, (list, tuple, set, frozenset)):
+            return column.isin(predicate).to_numpy(dtype=bool)
+        return column.eq(predicate).to_numpy(dtype=bool)
+
+    @staticmethod
+    def query_data(df, filters=None, sort_by=None, ascending=True, retrieve_columns=None, as_arrays=False):
+        """
+        Filters, sorts and selects columns of a DataFrame with vectorized operations.
+
+        Args:
+            df (pandas.DataFrame): The data to query.
+            filters (dict): Column name -> predicate, all of which must hold. A predicate is a value (equality),
+                a list/tuple/set (membership) or a dict of operators from OPERATORS,
+                e.g. {'status': 'active', 'country': ['FI', 'SE'], 'power': {'ge': 22, 'lt': 150},
+                'created': {'between': ('2024-01-01', '2024-06-30')}}.
+            sort_by (str or list): Column(s) to sort the filtered rows by.
+            ascending (bool or list): Sort order, one per sort_by column when a list.
+            retrieve_columns (list): Columns to return, defaults to all columns.
+            as_arrays (bool): Return NumPy arrays instead of lists.
+
+        Returns:
+            dict: Column name -> list (or array) of values, in the same row order for every column.
+        """
+        mask = np.ones(len(df), dtype=bool)
+        for column_name, predicate in (filters or {}).items():
+            mask &= Excel_Parser._predicate_mask(df[column_name], predicate)
+
+        columns = list(retrieve_columns) if retrieve_columns is not None else list(df.columns)
+        sort_columns = [sort_by] if isinstance(sort_by, str) else list(sort_by or [])
+        # only carry the sort keys along with the selected columns, and only for the matching rows
+        result = df.loc[mask, list(dict.fromkeys(columns + sort_columns))]
+        if sort_columns:
+            result = result.sort_values(by=sort_columns, ascending=ascending, kind='stable')
+
+        if as_arrays:
+            return {column: result[column].to_numpy() for column in columns}
+        return {column: result[column].tolist() for column in columns}
 
     @staticmethod
-    def get_csv_data(df, selected_columns, selected_values, retrieve_columns):
-        # Filter the dataFrame based on Selected columns and values
-        filtered_df = df[
-            (df[selected_columns[0]] == selected_values[0]) & (df[selected_columns[1]] == selected_values[1])]
-        filter_df = filtered_df.sort_values(by='column_name', ascending=True)
-        column1 = []
-        column2 = []
-        column3 = []
-        for index, row in filtered_df.iterrows():
-            column1.append(row[retrieve_columns[0]])
-            column2.append(row[retrieve_columns[1]])
-            column3.append(row[retrieve_columns[2]])
-
-        return {"col1": column1, "col2": column2, "col3": column3}
+    def get_csv_data(df, selected_columns, selected_values, retrieve_columns, sort_by=None, ascending=True):
+        """
+        Filters the DataFrame on selected_columns == selected_values and returns retrieve_columns as lists
+        keyed col1, col2, ... in retrieve_columns order.
+        """
+        filters = dict(zip(selected_columns, selected_values))
+        data = Excel_Parser.query_data(df, filters, sort_by=sort_by, ascending=ascending,
+                                       retrieve_columns=retrieve_columns)
+        return {f"col{index}": data[column] for index, column in enumerate(retrieve_columns, start=1)}
@@ -0,0 +1,41 @@
+import weakref
+
+from utils.config import TestData
+
+# appends the highlight to the element's own style in one call
+_HIGHLIGHT_SCRIPT = """
+var style = arguments[0].getAttribute('style') || '';
+arguments[0].setAttribute('style', style + '; background-color: yellow; border: 1px solid ' + arguments[1] + ';');
+"""
+
+# last element interacted with per driver, highlighted in the screenshot of a failing test
+_last_elements = weakref.WeakKeyDictionary()
+
+
+def highlight(driver, element, color="green"):
+    driver.execute_script(_HIGHLIGHT_SCRIPT, element, color)
+
+
+def before_click(driver, element, color="green"):
+    """ Applies TestData.HIGHLIGHT_MODE to an element about to be clicked """
+    if TestData.HIGHLIGHT_MODE == 'debug':
+        highlight(driver, element, color)
+    elif TestData.HIGHLIGHT_MODE == 'on_failure':
+        _last_elements[driver] = element
+
+
+def forget(driver):
+    """ Drops the remembered element of the driver, so a pooled driver does not carry it into the next test """
+    _last_elements.pop(driver, None)
+
+
+def highlight_last_element(driver, color="red"):
+    """ Highlights the last clicked element of the driver, used right before a failure screenshot """
+    element = _last_elements.pop(driver, None)
+    if element is None:
+        return
+    try:
+        highlight(driver, element, color)
+    except Exception:
+        # the element may be gone after a navigation, the screenshot is still taken
+        pass
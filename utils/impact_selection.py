@@ -0,0 +1,234 @@
+import hashlib
+import inspect
+import json
+import os
+import sys
+import threading
+import types
+
+import pytest
+
+from utils.config import TestData
+
+PLUGIN_NAME = 'test_impact'
+
+
+class ImpactMap:
+    """
+    Project files each test depends on, with the content hash every file had when the test last passed.
+
+    Stored in TestData.TEST_IMPACT_FILE as {nodeid: {relative path: sha1}}. A test is affected when one of its
+    files changed since then, was removed, or when it has no passing record yet.
+    """
+
+    def __init__(self, path=None, root=None):
+        self.path = path or TestData.TEST_IMPACT_FILE
+        self.root = root or TestData.ROOT_PATH
+        self.tests = self._read()
+        self._hashes = {}
+
+    def _read(self):
+        try:
+            with open(self.path) as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def relative(self, file_path):
+        """ Path relative to the project root, None for files outside of TestData.TEST_IMPACT_PATHS """
+        try:
+            relative = os.path.relpath(os.path.abspath(file_path), self.root).replace(os.sep, '/')
+        except ValueError:
+            # on Windows, a file on another drive than the project
+            return None
+        if relative in TestData.TEST_IMPACT_ALWAYS:
+            return relative
+        if relative.endswith('.py') and relative.split('/', 1)[0] in TestData.TEST_IMPACT_PATHS:
+            return relative
+        return None
+
+    def file_hash(self, relative):
+        """ sha1 of the file content, None when the file no longer exists; computed once per run """
+        if relative not in self._hashes:
+            try:
+                with open(os.path.join(self.root, relative), 'rb') as file:
+                    self._hashes[relative] = hashlib.sha1(file.read()).hexdigest()
+            except OSError:
+                self._hashes[relative] = None
+        return self._hashes[relative]
+
+    def changed_files(self, nodeid):
+        """ Dependencies of the test that changed since it last passed, None when the test has no record """
+        files = self.tests.get(nodeid)
+        if files is None:
+            return None
+        return [relative for relative, digest in files.items() if self.file_hash(relative) != digest]
+
+    def record(self, nodeid, relatives):
+        self.tests[nodeid] = {relative: self.file_hash(relative) for relative in sorted(relatives)}
+
+    def forget(self, nodeid):
+        self.tests.pop(nodeid, None)
+
+    def save(self, recorded):
+        """ Writes the records of the given tests, keeping the records of tests that did not run """
+        tests = self._read()
+        for nodeid in recorded:
+            if nodeid in self.tests:
+                tests[nodeid] = self.tests[nodeid]
+            else:
+                tests.pop(nodeid, None)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = f'{self.path}.{os.getpid()}.tmp'
+        with open(temp_path, 'w') as file:
+            json.dump(tests, file, indent=1, sort_keys=True)
+        os.replace(temp_path, self.path)
+
+
+class ImpactSelectionPlugin:
+    """
+    Runs only the tests affected by changed project files (TestData.TEST_IMPACT_MODE = 'select') or records
+    the files every test depends on without selecting ('record').
+
+    The files of a test are its own module, the conftest.py files above it, the project modules it imports
+    directly, every project file with code that ran during its setup, call and teardown phases (through a trace
+    function that only sees function calls, on the test's thread and the threads it starts), so the code of the
+    function-scoped fixtures it requests is counted too, and TestData.TEST_IMPACT_ALWAYS.
+    The modules of registered pytest plugins (timings, duration history, ...) run around every test and are
+    not counted as executed. Records are only kept for passing tests, so failing tests are selected again on
+    the next run.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.mode = TestData.TEST_IMPACT_MODE
+        self.impact = ImpactMap()
+        self.recorded = set()
+        self.failed = set()
+        self.selected = None
+        self.collected = 0
+        self._executed = set()
+        self._recording = False
+        self._previous_trace = None
+        self._plugin_files = None
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_collection_modifyitems(self, config, items):
+        self.collected = len(items)
+        if self.mode != 'select':
+            return
+        selected, deselected = [], []
+        for item in items:
+            changed = self.impact.changed_files(item.nodeid)
+            (selected if changed is None or changed else deselected).append(item)
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = selected
+        self.selected = len(selected)
+
+    def _trace(self, frame, event, arg):
+        if not self._recording:
+            # a thread started during an earlier test, give it the trace function it would have started with
+            sys.settrace(threading.gettrace())
+            return None
+        filename = frame.f_code.co_filename
+        if filename.startswith(self.impact.root):
+            self._executed.add(filename)
+        # no local trace function: only the call of every frame is seen, not its lines
+        return self._previous_trace(frame, event, arg) if self._previous_trace is not None else None
+
+    def plugin_files(self):
+        """ Source files of the registered plugin objects and modules, conftest.py files excepted """
+        if self._plugin_files is None:
+            files = set()
+            for plugin in self.config.pluginmanager.get_plugins():
+                module = plugin if isinstance(plugin, types.ModuleType) else inspect.getmodule(type(plugin))
+                file_path = getattr(module, '__file__', None)
+                if file_path and os.path.basename(file_path) != 'conftest.py':
+                    files.add(file_path)
+            self._plugin_files = files
+        return self._plugin_files
+
+    def _static_files(self, item):
+        files = {str(item.path)}
+        directory = os.path.dirname(str(item.path))
+        while directory.startswith(self.impact.root):
+            files.add(os.path.join(directory, 'conftest.py'))
+            directory = os.path.dirname(directory)
+        for value in vars(getattr(item, 'module', None) or types.SimpleNamespace()).values():
+            module = value if isinstance(value, types.ModuleType) else inspect.getmodule(value)
+            file_path = getattr(module, '__file__', None)
+            if file_path:
+                files.add(file_path)
+        return files
+
+    def _traced_phase(self):
+        """ Body of the setup/call/teardown hook wrappers: traces the executed files while the phase runs """
+        if self.mode not in ('record', 'select'):
+            yield
+            return
+        previous, previous_threads = sys.gettrace(), threading.gettrace()
+        self._previous_trace = previous
+        self._recording = True
+        sys.settrace(self._trace)
+        threading.settrace(self._trace)
+        try:
+            yield
+        finally:
+            self._recording = False
+            sys.settrace(previous)
+            threading.settrace(previous_threads)
+            self._previous_trace = None
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_setup(self, item):
+        yield from self._traced_phase()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item):
+        yield from self._traced_phase()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_teardown(self, item):
+        yield from self._traced_phase()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item):
+        if self.mode not in ('record', 'select'):
+            yield
+            return
+        self._executed = set()
+        yield
+        files = self._static_files(item) | (self._executed - self.plugin_files())
+        relatives = {self.impact.relative(file_path) for file_path in files if os.path.exists(file_path)}
+        relatives.discard(None)
+        relatives.update(TestData.TEST_IMPACT_ALWAYS)
+        if item.nodeid in self.failed:
+            # no record, so the test is selected until it passes
+            self.impact.forget(item.nodeid)
+        else:
+            self.impact.record(item.nodeid, relatives)
+        self.recorded.add(item.nodeid)
+
+    def pytest_runtest_logreport(self, report):
+        if report.failed:
+            self.failed.add(report.nodeid)
+
+    def pytest_sessionfinish(self, session):
+        if self.selected == 0 and session.exitstatus == pytest.ExitCode.NO_TESTS_COLLECTED:
+            # nothing changed is not an error
+            session.exitstatus = pytest.ExitCode.OK
+        if self.recorded:
+            self.impact.save(self.recorded)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.selected is not None:
+            terminalreporter.write_line(f'Test impact: {self.selected} of {self.collected} tests affected by changes')
+        elif self.mode == 'record' and self.recorded:
+            terminalreporter.write_line(f'Test impact: recorded the files of {len(self.recorded)} tests')
+
+
+def register(config):
+    """ Registers the test impact plugin once, from any conftest.py """
+    if TestData.TEST_IMPACT_MODE != 'off' and not config.pluginmanager.has_plugin(PLUGIN_NAME):
+        config.pluginmanager.register(ImpactSelectionPlugin(config), PLUGIN_NAME)
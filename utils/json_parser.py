@@ -1,15 +1,112 @@
 import json
+import mmap
 import os
+import threading
+from array import array
 
 from utils.config import TestData
 
 
 class JsonParser:
-    def __init__(self, json_path):
+    # record offset indexes of JSONL files, shared by every parser and keyed by (path, mtime, size)
+    _offset_indexes = {}
+    _index_lock = threading.Lock()
+
+    def __init__(self, json_path, use_mmap=False):
         self.json_path = os.path.join(TestData.DATA_FILES_PATH, json_path)
+        self.use_mmap = use_mmap
+        self._file = None
+        self._mmap = None
+        # file version (path, mtime, size) the open handle and mmap belong to
+        self._file_key = None
 
     def read_from_json(self):
         # read from file
         with open(self.json_path, 'r') as json_file:
             json_reader = json.load(json_file)
         return json_reader
+
+    def iter_records(self):
+        """
+        Lazily yields the records of a JSONL file one line at a time, skipping blank lines.
+        eg: for record in JsonParser("stations.jsonl").iter_records(): ...
+        """
+        with open(self.json_path, 'rb') as json_file:
+            for line in json_file:
+                if line.strip():
+                    yield json.loads(line)
+
+    def _build_offset_index(self):
+        offsets = array('Q')
+        position = 0
+        with open(self.json_path, 'rb') as json_file:
+            for line in json_file:
+                if line.strip():
+                    offsets.append(position)
+                position += len(line)
+        return offsets
+
+    def _file_version(self):
+        """ Returns the (path, mtime, size) key of the current file and its offset index """
+        stat = os.stat(self.json_path)
+        key = (self.json_path, stat.st_mtime_ns, stat.st_size)
+        offsets = self._offset_indexes.get(key)
+        if offsets is None:
+            offsets = self._build_offset_index()
+            with self._index_lock:
+                for stale_key in [k for k in self._offset_indexes if k[0] == self.json_path]:
+                    del self._offset_indexes[stale_key]
+                self._offset_indexes[key] = offsets
+        return key, offsets
+
+    def offset_index(self):
+        """ Returns the byte offset of every record, scanning the file only once per file version """
+        return self._file_version()[1]
+
+    def record_count(self):
+        return len(self.offset_index())
+
+    def _open(self, key):
+        if self._file is not None and self._file_key != key:
+            # the file was rewritten since it was opened, the old handle or mapping still sees the old bytes
+            self.close()
+        if self._file is None:
+            self._file = open(self.json_path, 'rb')
+            self._file_key = key
+            if self.use_mmap and os.fstat(self._file.fileno()).st_size:
+                self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def get_record(self, index):
+        """
+        Returns the record at the given position (negative indexes count from the end) without reading
+        the rest of the file.
+        """
+        key, offsets = self._file_version()
+        offset = offsets[index]
+        self._open(key)
+        if self._mmap is not None:
+            end = self._mmap.find(b'\n', offset)
+            line = self._mmap[offset:end if end != -1 else len(self._mmap)]
+        else:
+            self._file.seek(offset)
+            line = self._file.readline()
+        return json.loads(line)
+
+    def get_records(self, indexes):
+        """ Returns the records at the given positions, in the order requested """
+        return [self.get_record(index) for index in indexes]
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._file_key = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,188 @@
+import json
+import threading
+import time
+import weakref
+from collections import namedtuple
+from urllib.parse import urlsplit
+
+from utils.config import TestData
+
+# one finished (or failed) network request; times in milliseconds, size in encoded bytes on the wire
+RequestTiming = namedtuple('RequestTiming', [
+    'request_id', 'url', 'method', 'resource_type', 'status', 'ttfb_ms', 'download_ms', 'size', 'failed'
+])
+
+_TRACKED_EVENTS = (
+    'Network.requestWillBeSent',
+    'Network.responseReceived',
+    'Network.loadingFinished',
+    'Network.loadingFailed',
+)
+
+
+class NetworkMonitor:
+    """
+    Incremental reader of the Chrome 'performance' log.
+
+    Each poll() reads only the entries logged since the previous poll, parses only the four Network events it
+    needs, tracks in-flight requests by requestId and turns every finished request into a RequestTiming.
+    The driver must be started with goog:loggingPrefs {'performance': 'ALL'} (see utils.browser_pool).
+
+    Reading the log consumes it, so there is exactly one monitor per driver: get it with for_driver() and
+    never call driver.get_log('performance') anywhere else.
+    """
+    _monitors = weakref.WeakKeyDictionary()
+    _monitors_lock = threading.Lock()
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.records = []
+        self._inflight = {}
+        self._dropped = 0  # records removed by clear(), keeps consumer cursors valid
+        self._cursors = {}
+        self._origins = set()
+        self.last_activity = time.monotonic()
+
+    @classmethod
+    def for_driver(cls, driver):
+        """ Returns the monitor of the driver, creating it on first use """
+        with cls._monitors_lock:
+            monitor = cls._monitors.get(driver)
+            if monitor is None:
+                monitor = cls._monitors[driver] = cls(driver)
+            return monitor
+
+    @property
+    def inflight_count(self):
+        return len(self._inflight)
+
+    def poll(self):
+        """ Consumes the new log entries and returns the requests that finished since the last poll """
+        finished = []
+        for entry in self.driver.get_log('performance'):
+            raw = entry['message']
+            # cheap substring check so unrelated events are never JSON decoded
+            if '"Network.' not in raw or not any(event in raw for event in _TRACKED_EVENTS):
+                continue
+            message = json.loads(raw)['message']
+            method = message.get('method')
+            params = message.get('params', {})
+            handler = self._handlers.get(method)
+            if handler:
+                record = handler(self, params)
+                if record:
+                    finished.append(record)
+        self.records.extend(finished)
+        return finished
+
+    def _request_will_be_sent(self, params):
+        request = params.get('request', {})
+        url = request.get('url', '')
+        if url.startswith('data:'):
+            return None
+        parts = urlsplit(url)
+        if parts.scheme in ('http', 'https'):
+            self._origins.add(f'{parts.scheme}://{parts.netloc}')
+        self.last_activity = time.monotonic()
+        self._inflight[params['requestId']] = {
+            'seen': time.monotonic(),
+            'url': url,
+            'method': request.get('method'),
+            'resource_type': params.get('type'),
+            'start': params.get('timestamp'),
+            'response': None,
+            'status': None,
+        }
+        return None
+
+    def _response_received(self, params):
+        request = self._inflight.get(params['requestId'])
+        if request is not None:
+            self.last_activity = time.monotonic()
+            request['response'] = params.get('timestamp')
+            request['status'] = params.get('response', {}).get('status')
+            request['resource_type'] = params.get('type') or request['resource_type']
+        return None
+
+    def _finish(self, params, failed):
+        request = self._inflight.pop(params['requestId'], None)
+        if request is None:
+            return None
+        self.last_activity = time.monotonic()
+        end = params.get('timestamp')
+        start, response = request['start'], request['response']
+        return RequestTiming(
+            request_id=params['requestId'],
+            url=request['url'],
+            method=request['method'],
+            resource_type=request['resource_type'],
+            status=request['status'],
+            ttfb_ms=round((response - start) * 1000, 1) if response and start else None,
+            download_ms=round((end - response) * 1000, 1) if end and response else None,
+            size=params.get('encodedDataLength', 0),
+            failed=failed,
+        )
+
+    def _loading_finished(self, params):
+        return self._finish(params, failed=False)
+
+    def _loading_failed(self, params):
+        return self._finish(params, failed=True)
+
+    _handlers = {
+        'Network.requestWillBeSent': _request_will_be_sent,
+        'Network.responseReceived': _response_received,
+        'Network.loadingFinished': _loading_finished,
+        'Network.loadingFailed': _loading_failed,
+    }
+
+    def _drop_stale_inflight(self):
+        # requests that never get loadingFinished/loadingFailed (aborted, cached by a service worker, ...) would
+        # otherwise count as in flight forever
+        oldest = time.monotonic() - TestData.NETWORK_INFLIGHT_MAX_AGE
+        for request_id in [request_id for request_id, request in self._inflight.items() if request['seen'] < oldest]:
+            del self._inflight[request_id]
+
+    def is_idle(self, quiet_ms=500, max_inflight=0):
+        """ True when at most max_inflight requests are open and nothing happened for quiet_ms milliseconds """
+        self.poll()
+        self._drop_stale_inflight()
+        return (len(self._inflight) <= max_inflight
+                and (time.monotonic() - self.last_activity) * 1000 >= quiet_ms)
+
+    def status_codes(self):
+        self.poll()
+        return [record.status for record in self.records if record.status is not None]
+
+    def new_records(self, consumer):
+        """
+        Returns the records finished since the previous call with the same consumer name, so several readers
+        (e.g. page metrics of different page objects) share the monitor without seeing a request twice.
+        """
+        self.poll()
+        start = max(self._cursors.get(consumer, 0) - self._dropped, 0)
+        self._cursors[consumer] = self._dropped + len(self.records)
+        return self.records[start:]
+
+    def visited_origins(self):
+        """ http(s) origins the browser sent requests to since the last reset() """
+        self.poll()
+        return set(self._origins)
+
+    def navigated(self):
+        """ Forgets the open requests of the previous document, call it before navigating to another page """
+        self.poll()
+        self._inflight.clear()
+
+    def clear(self):
+        """ Forgets the collected records, e.g. before measuring the next page """
+        self.poll()
+        self._dropped += len(self.records)
+        self.records = []
+
+    def reset(self):
+        """ Consumes the pending log and forgets everything, e.g. when a pooled driver is handed to the next test """
+        self.clear()
+        self._inflight.clear()
+        self._origins.clear()
+        self.last_activity = time.monotonic()
@@ -0,0 +1,115 @@
+import json
+import os
+import threading
+
+from utils.config import TestData
+
+# Navigation Timing and Resource Timing of the current document, read in a single script call
+_COLLECT_SCRIPT = """
+var nav = performance.getEntriesByType('navigation')[0];
+var resources = performance.getEntriesByType('resource');
+var resourceBytes = 0;
+for (var i = 0; i < resources.length; i++) { resourceBytes += resources[i].transferSize || 0; }
+return {
+    url: location.href,
+    ttfb_ms: nav ? nav.responseStart - nav.startTime : null,
+    dom_content_loaded_ms: nav ? nav.domContentLoadedEventEnd - nav.startTime : null,
+    load_ms: nav && nav.loadEventEnd ? nav.loadEventEnd - nav.startTime : null,
+    document_bytes: nav ? nav.transferSize || 0 : 0,
+    resource_count: resources.length,
+    resource_bytes: resourceBytes
+};
+"""
+
+
+class PageMetrics:
+    """
+    Collects page performance metrics and keeps them per test.
+
+    The setup fixture starts a test for its driver, page objects record metrics for that driver after page
+    actions, and at teardown the metrics of the test are appended to TestData.PAGE_METRICS_FILE as one JSON line.
+    """
+    _by_driver = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def collect(driver, network_records=None, label=None):
+        """
+        Reads navigation/resource timing of the current page, combined with the CDP network records of the
+        page action when given.
+        :param driver:
+        :param network_records: RequestTiming records from utils.network_monitor
+        :param label: name of the page action, e.g. 'open_url'
+        :return: dict of metrics
+        """
+        metrics = driver.execute_script(_COLLECT_SCRIPT)
+        metrics['label'] = label
+        if network_records is not None:
+            metrics['requests'] = len(network_records)
+            metrics['failed_requests'] = sum(1 for record in network_records if record.failed)
+            metrics['network_bytes'] = sum(record.size or 0 for record in network_records)
+        # cross-origin resources report a transferSize of 0, so prefer the CDP byte count when it is larger
+        metrics['total_bytes'] = max(metrics['document_bytes'] + metrics['resource_bytes'],
+                                     metrics.get('network_bytes', 0))
+        return metrics
+
+    @classmethod
+    def start(cls, driver, test_id):
+        with cls._lock:
+            cls._by_driver[driver] = (test_id, [])
+
+    @classmethod
+    def record(cls, driver, metrics):
+        with cls._lock:
+            entry = cls._by_driver.get(driver)
+        if entry is not None:
+            entry[1].append(metrics)
+
+    @classmethod
+    def peek(cls, driver):
+        """ Metrics recorded so far for the test running on the driver """
+        with cls._lock:
+            entry = cls._by_driver.get(driver)
+        return list(entry[1]) if entry else []
+
+    @classmethod
+    def finish(cls, driver, path=None):
+        """ Ends the test running on the driver and appends its metrics to the results file """
+        with cls._lock:
+            entry = cls._by_driver.pop(driver, None)
+        if not entry or not entry[1]:
+            return []
+        test_id, metrics = entry
+        path = path or TestData.PAGE_METRICS_FILE
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'test': test_id, 'pages': metrics}) + '\n')
+        return metrics
+
+    @staticmethod
+    def summary(metrics):
+        """ Slowest load time and largest page weight among the recorded pages """
+        load_times = [page['load_ms'] for page in metrics if page.get('load_ms') is not None]
+        return {
+            'max_load_ms': max(load_times) if load_times else None,
+            'max_bytes': max((page['total_bytes'] for page in metrics), default=None),
+        }
+
+    @staticmethod
+    def assert_budget(metrics, max_load_ms=None, max_bytes=None, max_requests=None, max_ttfb_ms=None):
+        """
+        Asserts that every recorded page stays within the given budgets; budgets left as None are not checked.
+        """
+        errors = []
+        for page in metrics:
+            where = f"{page.get('label') or 'page'} {page['url']}"
+            if max_load_ms is not None and page.get('load_ms') is not None and page['load_ms'] > max_load_ms:
+                errors.append(f"{where}: load time {page['load_ms']:.0f} ms exceeds {max_load_ms} ms")
+            if max_ttfb_ms is not None and page.get('ttfb_ms') is not None and page['ttfb_ms'] > max_ttfb_ms:
+                errors.append(f"{where}: TTFB {page['ttfb_ms']:.0f} ms exceeds {max_ttfb_ms} ms")
+            if max_bytes is not None and page['total_bytes'] > max_bytes:
+                errors.append(f"{where}: {page['total_bytes']} bytes exceeds {max_bytes} bytes")
+            requests = page.get('requests', page['resource_count'] + 1)
+            if max_requests is not None and requests > max_requests:
+                errors.append(f"{where}: {requests} requests exceeds {max_requests}")
+        assert not errors, "Performance budget exceeded:\n" + "\n".join(errors)
@@ -0,0 +1,112 @@
+import hashlib
+import io
+import os
+import queue
+import threading
+
+from utils.config import TestData
+
+try:
+    from PIL import Image
+except ImportError:  # without Pillow the PNG is stored as captured and used as its own thumbnail
+    Image = None
+
+
+class ScreenshotPipeline:
+    """
+    Stores failure screenshots without slowing down the test that failed.
+
+    capture() only grabs the PNG bytes from the driver and hashes them; decoding, downscaling to
+    TestData.SCREENSHOT_MAX_WIDTH, JPEG encoding and the thumbnail are done by a background thread.
+    Identical screenshots (same content hash) are stored once and shared by every test that produced them.
+
+    eg:
+        screenshots = ScreenshotPipeline(reports_dir / 'screenshots')
+        image, thumbnail = screenshots.capture(driver)
+        ...
+        screenshots.close()
+    """
+    _STOP = object()
+
+    def __init__(self, folder):
+        self.folder = str(folder)
+        self._seen = set()
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _start(self):
+        # the folder and the worker thread are only created once the first screenshot is taken
+        with self._lock:
+            if self._thread is None:
+                os.makedirs(self.folder, exist_ok=True)
+                self._thread = threading.Thread(target=self._run, name='screenshot-writer', daemon=True)
+                self._thread.start()
+
+    @staticmethod
+    def file_names(digest):
+        """ Image and thumbnail file names of a screenshot """
+        if Image is None:
+            return f'{digest}.png', f'{digest}.png'
+        return f'{digest}.jpg', f'{digest}_thumb.jpg'
+
+    def capture(self, driver):
+        """
+        Takes a screenshot of the driver and queues it for storing.
+        :return: (image, thumbnail) paths relative to the parent of the screenshot folder, None when the
+        screenshot could not be taken
+        """
+        try:
+            png = driver.get_screenshot_as_png()
+        except Exception as e:
+            print(e)
+            return None
+        digest = hashlib.sha1(png).hexdigest()
+        with self._lock:
+            new = digest not in self._seen
+            self._seen.add(digest)
+        if new:
+            self._start()
+            self._queue.put((digest, png))
+        folder_name = os.path.basename(self.folder)
+        return tuple(f'{folder_name}/{name}' for name in self.file_names(digest))
+
+    def flush(self):
+        """ Blocks until every queued screenshot is written """
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self):
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(self._STOP)
+            self._thread.join()
+
+    def _run(self):
+        while True:
+            record = self._queue.get()
+            try:
+                if record is self._STOP:
+                    return
+                self._store(*record)
+            except Exception as e:
+                print(f"Could not store screenshot {record[0]}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _store(self, digest, png):
+        image_name, thumbnail_name = self.file_names(digest)
+        if os.path.exists(os.path.join(self.folder, thumbnail_name)):
+            # stored by an earlier run into the same report folder
+            return
+        if Image is None:
+            with open(os.path.join(self.folder, image_name), 'wb') as file:
+                file.write(png)
+            return
+        image = Image.open(io.BytesIO(png)).convert('RGB')
+        if image.width > TestData.SCREENSHOT_MAX_WIDTH:
+            height = round(image.height * TestData.SCREENSHOT_MAX_WIDTH / image.width)
+            image = image.resize((TestData.SCREENSHOT_MAX_WIDTH, height), Image.LANCZOS)
+        image.save(os.path.join(self.folder, image_name), 'JPEG', quality=TestData.SCREENSHOT_JPEG_QUALITY,
+                   optimize=True)
+        image.thumbnail(TestData.SCREENSHOT_THUMB_SIZE)
+        image.save(os.path.join(self.folder, thumbnail_name), 'JPEG', quality=TestData.SCREENSHOT_JPEG_QUALITY)
@@ -0,0 +1,266 @@
+import json
+import os
+import time
+from datetime import datetime
+
+from api.logger import BufferedFileSink
+from utils.browser_pool import worker_id
+from utils.config import TestData
+
+PLUGIN_NAME = 'stream_report'
+
+# static viewer, loads the JSONL records next to it and renders one page of rows at a time
+_VIEWER_HTML = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>%(title)s</title>
+<style>
+body { font-family: Helvetica, Arial, sans-serif; font-size: 13px; margin: 16px; }
+table { border-collapse: collapse; width: 100%%; }
+th, td { border: 1px solid #ddd; padding: 4px 6px; text-align: left; vertical-align: top; }
+tr.passed td.outcome { color: green; } tr.failed td.outcome, tr.error td.outcome { color: red; }
+tr.skipped td.outcome { color: orange; }
+pre { white-space: pre-wrap; max-height: 300px; overflow: auto; margin: 4px 0; }
+#controls > * { margin-right: 8px; }
+</style>
+</head>
+<body>
+<h1>%(title)s</h1>
+<p id="summary">Loading %(records)s ...</p>
+<div id="controls">
+  <select id="outcome"><option value="">all outcomes</option><option>passed</option><option>failed</option>
+  <option>error</option><option>skipped</option><option>xfailed</option><option>xpassed</option></select>
+  <input id="search" placeholder="filter test id or description">
+  <button id="previous">&lt;</button><span id="page"></span><button id="next">&gt;</button>
+  <button id="reload">Reload</button>
+  <label><input type="checkbox" id="follow"> refresh every %(refresh)s s</label>
+  <label id="open-file" style="display:none">records file: <input type="file" id="file"></label>
+</div>
+<table>
+  <thead><tr><th>Outcome</th><th>Test</th><th>Description</th><th>Duration (s)</th><th>Finished</th></tr></thead>
+  <tbody id="rows"></tbody>
+</table>
+<script>
+var PAGE_SIZE = %(page_size)s, records = [], session = null, summary = null, matches = [], page = 0;
+// bytes of the records file already parsed, reloads only fetch what was appended after them
+var offset = 0;
+
+function parse(line) {
+  // the last line can be half written while the run is in progress
+  try { return JSON.parse(line); } catch (e) { return null; }
+}
+
+function escape(text) {
+  return String(text == null ? '' : text).replace(/[&<>"]/g, function (c) {
+    return {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'}[c];
+  });
+}
+
+function reset() {
+  records = [];
+  session = summary = null;
+  offset = 0;
+}
+
+function append(text) {
+  // every line is parsed once, filtering then only compares fields; returns false when a new run started over
+  var lines = text.split('\\n');
+  for (var i = 0; i < lines.length; i++) {
+    var record = lines[i] ? parse(lines[i]) : null;
+    if (!record) continue;
+    if (record.type === 'test') {
+      record.search = (record.nodeid + ' ' + (record.description || '')).toLowerCase();
+      records.push(record);
+    } else if (record.type === 'session') {
+      if (session) return false;
+      session = record;
+    } else if (record.type === 'summary') {
+      summary = record;
+    }
+  }
+  return true;
+}
+
+function load(text) {
+  reset();
+  append(text);
+  filter();
+}
+
+function filter() {
+  var outcome = document.getElementById('outcome').value;
+  var search = document.getElementById('search').value.trim().toLowerCase();
+  matches = records.filter(function (record) {
+    return (!outcome || record.outcome === outcome) && (!search || record.search.indexOf(search) >= 0);
+  });
+  page = Math.min(page, Math.max(0, Math.ceil(matches.length / PAGE_SIZE) - 1));
+  render();
+}
+
+function render() {
+  var rows = [], start = page * PAGE_SIZE;
+  matches.slice(start, start + PAGE_SIZE).forEach(function (record) {
+    rows.push('<tr class="' + record.outcome + '"><td class="outcome">' + record.outcome + '</td><td>' +
+      escape(record.nodeid) + (record.extras || []).join('') +
+      (record.log ? '<pre>' + escape(record.log) + '</pre>' : '') + '</td><td>' + escape(record.description) +
+      '</td><td>' + record.duration.toFixed(2) + '</td><td>' + escape(record.finished) + '</td></tr>');
+  });
+  document.getElementById('rows').innerHTML = rows.join('');
+  var pages = Math.max(1, Math.ceil(matches.length / PAGE_SIZE));
+  document.getElementById('page').textContent = 'page ' + (page + 1) + ' / ' + pages + ' (' + matches.length + ' tests)';
+  var text = session ? 'Started ' + session.started + '. ' : '';
+  text += summary ? 'Finished in ' + summary.duration.toFixed(1) + ' s: ' + JSON.stringify(summary.outcomes)
+                  : records.length + ' results so far, the run is in progress.';
+  document.getElementById('summary').textContent = text;
+}
+
+function reload(full) {
+  if (full) offset = 0;
+  var headers = offset ? {'Range': 'bytes=' + offset + '-'} : {};
+  fetch('%(records)s', {cache: 'no-store', headers: headers}).then(function (response) {
+    if (response.status === 416) {
+      // nothing new, unless a new run rewrote the file shorter than what was read
+      var size = parseInt((response.headers.get('Content-Range') || '').split('/')[1], 10);
+      if (size < offset) reload(true);
+      return;
+    }
+    if (!response.ok) throw new Error(response.statusText);
+    return response.arrayBuffer().then(function (buffer) {
+      // 206 is the tail after offset; servers without range support answer 200 with the whole file
+      if (response.status !== 206) reset();
+      var bytes = new Uint8Array(buffer), end = bytes.lastIndexOf(10) + 1;
+      // a half written last line is left for the next reload
+      if (!append(new TextDecoder().decode(bytes.subarray(0, end)))) return reload(true);
+      offset += end;
+      filter();
+    });
+  }).catch(function () {
+    // browsers block fetch() on file:// pages, the records file can be opened by hand instead
+    document.getElementById('summary').textContent = 'Could not load %(records)s, open it below or serve ' +
+      'this folder over http (python -m http.server).';
+    document.getElementById('open-file').style.display = '';
+  });
+}
+
+document.getElementById('file').onchange = function (event) {
+  var reader = new FileReader();
+  reader.onload = function () { load(reader.result); };
+  reader.readAsText(event.target.files[0]);
+};
+document.getElementById('outcome').onchange = function () { page = 0; filter(); };
+document.getElementById('search').oninput = function () { page = 0; filter(); };
+document.getElementById('previous').onclick = function () { if (page > 0) { page--; render(); } };
+document.getElementById('next').onclick = function () {
+  if ((page + 1) * PAGE_SIZE < matches.length) { page++; render(); }
+};
+document.getElementById('reload').onclick = function () { reload(); };
+setInterval(function () {
+  if (document.getElementById('follow').checked && !summary) reload();
+}, %(refresh)s * 1000);
+reload();
+</script>
+</body>
+</html>
+"""
+
+
+class StreamReport:
+    """
+    Report written while the run goes on (TestData.REPORT_MODE = 'stream').
+
+    Every finished test is appended as one JSON line to TestData.STREAM_REPORT_RECORDS by a background writer
+    once its teardown is reported, so only the tests still running are kept in memory and results can be read
+    during the run. A test has a single record: a teardown error is added to the record of its setup or call.
+    A static viewer page next to the records shows them one page at a time, and on reload only fetches the
+    records appended since (HTTP Range request). The first line describes the session, the last one is a
+    summary written when the run ends.
+    """
+
+    def __init__(self, reports_dir, title=None):
+        self.reports_dir = str(reports_dir)
+        self.records_path = os.path.join(self.reports_dir, TestData.STREAM_REPORT_RECORDS)
+        self.viewer_path = os.path.join(self.reports_dir, TestData.STREAM_REPORT_VIEWER)
+        self.title = title or TestData.REPORT_TITLE
+        self.outcomes = {}
+        self._running = {}
+        self._start = time.perf_counter()
+        self._sink = None
+
+    def _write(self, record):
+        self._sink.write(json.dumps(record, default=str), with_date=False)
+
+    def pytest_sessionstart(self, session):
+        if worker_id() != 'master':
+            # under xdist the controller receives the reports of every worker and writes the records
+            return
+        with open(self.viewer_path, 'w', encoding='utf-8') as file:
+            file.write(_VIEWER_HTML % {'title': self.title, 'records': TestData.STREAM_REPORT_RECORDS,
+                                       'page_size': TestData.STREAM_REPORT_PAGE_SIZE,
+                                       'refresh': TestData.STREAM_REPORT_REFRESH})
+        # a new run starts a new records file
+        open(self.records_path, 'w').close()
+        self._sink = BufferedFileSink(self.records_path)
+        self._write({'type': 'session', 'title': self.title, 'started': datetime.now().isoformat(timespec='seconds')})
+
+    @staticmethod
+    def _outcome(report):
+        if hasattr(report, 'wasxfail'):
+            return 'xfailed' if report.skipped else 'xpassed'
+        if report.failed and report.when != 'call':
+            return 'error'
+        return report.outcome
+
+    def pytest_runtest_logreport(self, report):
+        if self._sink is None:
+            return
+        record = self._running.get(report.nodeid)
+        if record is None:
+            record = self._running[report.nodeid] = {
+                'type': 'test', 'nodeid': report.nodeid, 'when': 'call', 'outcome': 'passed', 'duration': 0.0,
+                'description': '', 'page_summary': {}, 'extras': {}, 'log': '',
+            }
+        record['duration'] += report.duration
+        record['description'] = getattr(report, 'description', record['description'])
+        record['page_summary'] = getattr(report, 'page_summary', record['page_summary'])
+        # pytest-html keeps extras in report.extras, the conftest hook adds them to report.extra
+        record['extras'].update((extra.get('content'), None) for extra in
+                                getattr(report, 'extras', []) + getattr(report, 'extra', [])
+                                if extra.get('format_type') == 'html')
+        if report.when == 'call' or not report.passed:
+            if report.when != 'teardown' or record['outcome'] in ('passed', 'xpassed'):
+                # the setup or call decides the outcome, a failing teardown only turns a passed test into an error
+                record['when'], record['outcome'] = report.when, self._outcome(report)
+            if not report.passed:
+                record['log'] = '\n\n'.join(filter(None, [record['log'], report.longreprtext]))
+        if report.when == 'teardown':
+            self._finish(self._running.pop(report.nodeid))
+
+    def _finish(self, record):
+        self.outcomes[record['outcome']] = self.outcomes.get(record['outcome'], 0) + 1
+        record.update(duration=round(record['duration'], 3), extras=list(record['extras']),
+                      log=record['log'][-TestData.STREAM_REPORT_MAX_LOG:],
+                      finished=datetime.now().isoformat(timespec='seconds'))
+        self._write(record)
+
+    def pytest_sessionfinish(self, session):
+        if self._sink is None:
+            return
+        # tests interrupted before their teardown was reported
+        for record in self._running.values():
+            self._finish(record)
+        self._running.clear()
+        self._write({'type': 'summary', 'outcomes': self.outcomes,
+                     'duration': round(time.perf_counter() - self._start, 3)})
+        self._sink.close()
+        self._sink = None
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if worker_id() == 'master':
+            terminalreporter.write_line(f'Streamed report: {self.viewer_path}')
+
+
+def register(config, reports_dir):
+    """ Registers the streaming report writing into reports_dir once """
+    if not config.pluginmanager.has_plugin(PLUGIN_NAME):
+        config.pluginmanager.register(StreamReport(reports_dir), PLUGIN_NAME)
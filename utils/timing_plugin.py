@@ -0,0 +1,222 @@
+import functools
+import importlib
+import inspect
+import json
+import os
+import threading
+import time
+import warnings
+from urllib.parse import urlsplit
+
+import pytest
+
+from api.logger import Logger
+from utils.browser_pool import worker_id
+from utils.config import TestData
+
+PLUGIN_NAME = 'test_timings'
+
+
+def _query_label(method_name):
+    """ Labels a DatabaseHelper call with its first query line, so the same query aggregates across tests """
+    def label(args, kwargs):
+        query = kwargs.get('query', args[1] if len(args) > 1 else '')
+        query = ' '.join(str(query).split())
+        return f'{method_name}: {query[:80]}'
+    return label
+
+
+def _http_label(method_name):
+    """ Labels a pooled request with its method and path """
+    def label(args, kwargs):
+        request = args[1]
+        return f'{request.method} {urlsplit(request.url).path or "/"}'
+    return label
+
+
+# (module, class, category, methods or None for every public method defined on the class, label factory)
+INSTRUMENTED = [
+    ('pages.BasePage', 'BasePage', 'page', None, None),
+    ('api.session', 'PooledHTTPAdapter', 'http', ['send'], _http_label),
+    ('utils.db_connection', 'DatabaseHelper', 'db',
+     ['execute_query', 'fetch_rows_with_column_names', 'fetch_columns', 'delete_query'], _query_label),
+]
+
+
+class TimingRecorder:
+    """
+    Collects the time spent in instrumented operations, per test.
+
+    Only the outermost call of a category is recorded on a thread, so a BasePage method calling other
+    BasePage methods is counted once. Calls from helper threads (e.g. the link checker) are attributed to
+    the test that is running.
+    """
+    _lock = threading.Lock()
+    _local = threading.local()
+    current_test = None
+    operations = {}
+
+    @classmethod
+    def start_test(cls, test_id):
+        with cls._lock:
+            cls.current_test = test_id
+            cls.operations.setdefault(test_id, [])
+
+    @classmethod
+    def finish_test(cls):
+        with cls._lock:
+            test_id, cls.current_test = cls.current_test, None
+            return cls.operations.pop(test_id, [])
+
+    @classmethod
+    def record(cls, category, name, seconds):
+        with cls._lock:
+            cls.operations.setdefault(cls.current_test, []).append((category, name, seconds))
+
+    @classmethod
+    def timed(cls, category, name, function, label=None):
+        """
+        Wraps function so every outermost call is recorded as an operation of the given category.
+        :param name: operation name, the qualified name of the function when None
+        """
+        name = name or function.__qualname__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            active = getattr(cls._local, 'active', None)
+            if active is None:
+                active = cls._local.active = set()
+            if category in active:
+                return function(*args, **kwargs)
+            active.add(category)
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                active.discard(category)
+                cls.record(category, label(args, kwargs) if label else name, time.perf_counter() - start)
+
+        wrapper.__timed__ = True
+        return wrapper
+
+
+def instrument(klass, category, methods=None, label=None):
+    """
+    Replaces methods of klass with timed wrappers, once.
+    :param methods: method names, or None for every public method defined on the class itself
+    :param label: factory called with the method name, returning a function (args, kwargs) -> operation name;
+    operations are named 'Class.method' without it
+    """
+    names = methods or [name for name in vars(klass) if not name.startswith('_')]
+    for name in names:
+        attribute = inspect.getattr_static(klass, name)
+        decorator = None
+        if isinstance(attribute, (staticmethod, classmethod)):
+            decorator, function = type(attribute), attribute.__func__
+        elif inspect.isfunction(attribute):
+            function = attribute
+        else:
+            continue
+        if getattr(function, '__timed__', False):
+            continue
+        wrapper = TimingRecorder.timed(category, f'{klass.__name__}.{name}', function,
+                                       label(name) if label else None)
+        setattr(klass, name, decorator(wrapper) if decorator else wrapper)
+
+
+class TimingPlugin:
+    """
+    Records the setup/call/teardown wall time of every test and the time spent in page object methods,
+    pooled HTTP requests and database queries.
+
+    At the end of the session the timings are written to TestData.TEST_TIMINGS_FILE and the slowest tests
+    and operations are listed in the terminal summary. With TestData.API_LOG_TEST_LIFECYCLE every test is also
+    logged to the api.logger log file when it starts and finishes.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.tests = {}
+        self.log_tests = TestData.API_LOG_TEST_LIFECYCLE
+        for module_name, class_name, category, methods, label in INSTRUMENTED:
+            try:
+                module = importlib.import_module(module_name)
+            except Exception as e:
+                # the other operations are still timed
+                warnings.warn(f"Timings: {module_name} is not instrumented: {e}")
+                continue
+            instrument(getattr(module, class_name), category, methods, label)
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item):
+        function = getattr(item, 'function', None) if self.log_tests else None
+        TimingRecorder.start_test(item.nodeid)
+        if function is not None:
+            Logger.log_test_start(function)
+        yield
+        operations = TimingRecorder.finish_test()
+        entry = self.tests.setdefault(item.nodeid, {'phases': {}})
+        entry['operations'] = [{'category': category, 'name': name, 'seconds': round(seconds, 4)}
+                               for category, name, seconds in operations]
+        if function is not None:
+            Logger.log_test_finish(function, f"{sum(entry['phases'].values()):.3f}s")
+
+    def pytest_runtest_logreport(self, report):
+        entry = self.tests.setdefault(report.nodeid, {'phases': {}})
+        entry['phases'][report.when] = round(report.duration, 4)
+        if report.when == 'call' or report.outcome != 'passed':
+            entry['outcome'] = report.outcome
+
+    def _test_rows(self):
+        rows = [(nodeid, sum(entry['phases'].values()), entry) for nodeid, entry in self.tests.items()]
+        return sorted(rows, key=lambda row: row[1], reverse=True)
+
+    def _operation_rows(self):
+        totals = {}
+        for entry in self.tests.values():
+            for operation in entry.get('operations', []):
+                key = (operation['category'], operation['name'])
+                count, total, longest = totals.get(key, (0, 0.0, 0.0))
+                totals[key] = (count + 1, total + operation['seconds'], max(longest, operation['seconds']))
+        rows = [(category, name, count, total, longest) for (category, name), (count, total, longest)
+                in totals.items()]
+        return sorted(rows, key=lambda row: row[3], reverse=True)
+
+    def timings_file(self):
+        if worker_id() == 'master':
+            return TestData.TEST_TIMINGS_FILE
+        root, extension = os.path.splitext(TestData.TEST_TIMINGS_FILE)
+        return f'{root}_{worker_id()}{extension}'
+
+    def pytest_sessionfinish(self, session):
+        if not self.tests:
+            return
+        tests = [dict(nodeid=nodeid, total=round(total, 4), **entry) for nodeid, total, entry in self._test_rows()]
+        operations = [{'category': category, 'name': name, 'count': count, 'total': round(total, 4),
+                       'max': round(longest, 4)} for category, name, count, total, longest in self._operation_rows()]
+        path = self.timings_file()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as file:
+            json.dump({'worker': worker_id(), 'tests': tests, 'operations': operations}, file, indent=1)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.tests:
+            return
+        count = TestData.TIMING_SUMMARY_COUNT
+        terminalreporter.section('slowest tests')
+        for nodeid, total, entry in self._test_rows()[:count]:
+            phases = ' '.join(f'{when}={seconds:.2f}s' for when, seconds in entry['phases'].items())
+            terminalreporter.write_line(f'{total:8.2f}s  {nodeid}  ({phases})')
+        operations = self._operation_rows()[:count]
+        if operations:
+            terminalreporter.section('slowest operations')
+            for category, name, calls, total, longest in operations:
+                terminalreporter.write_line(f'{total:8.2f}s  {category:<4} {name}  '
+                                            f'(calls={calls}, max={longest:.2f}s)')
+        terminalreporter.write_line(f'Timings written to {self.timings_file()}')
+
+
+def register(config):
+    """ Registers the timing plugin once, from any conftest.py """
+    if not config.pluginmanager.has_plugin(PLUGIN_NAME):
+        config.pluginmanager.register(TimingPlugin(config), PLUGIN_NAME)
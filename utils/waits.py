@@ -0,0 +1,82 @@
+import time
+from collections import defaultdict
+
+from selenium.common import NoSuchElementException, StaleElementReferenceException, TimeoutException
+
+from utils.config import TestData
+
+
+class AdaptiveWait:
+    """
+    Polls a condition until it returns a truthy value and returns that value as soon as it does.
+
+    Polling starts at TestData.WAIT_POLL_MIN seconds and backs off towards TestData.WAIT_POLL_MAX, so short
+    waits finish almost immediately while long waits do not flood the driver with calls. The duration of
+    every wait is recorded per page URL.
+    """
+
+    def __init__(self, driver, ignored_exceptions=(NoSuchElementException, StaleElementReferenceException)):
+        self.driver = driver
+        self.ignored_exceptions = tuple(ignored_exceptions)
+        self.timings = defaultdict(list)
+
+    def _current_url(self):
+        try:
+            return self.driver.current_url
+        except Exception:
+            return None
+
+    def until(self, condition, timeout, name=None, message=''):
+        """
+        Waits until condition(driver) returns a truthy value.
+
+        :param condition: callable taking the driver
+        :param timeout: max seconds to wait
+        :param name: label of the wait in the recorded timings, defaults to the condition name
+        :param message: message of the TimeoutException raised when the condition never holds
+        :return: the truthy value returned by the condition
+        """
+        name = name or getattr(condition, '__name__', repr(condition))
+        interval = TestData.WAIT_POLL_MIN
+        start = time.perf_counter()
+        deadline = start + timeout
+        try:
+            while True:
+                try:
+                    value = condition(self.driver)
+                    if value:
+                        return value
+                except self.ignored_exceptions:
+                    pass
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    raise TimeoutException(message or f"Condition '{name}' not met within {timeout} seconds")
+                time.sleep(min(interval, remaining))
+                interval = min(interval * TestData.WAIT_POLL_BACKOFF, TestData.WAIT_POLL_MAX)
+        finally:
+            self.timings[self._current_url()].append((name, time.perf_counter() - start))
+
+
+def document_ready(driver):
+    return driver.execute_script("return document.readyState") == "complete"
+
+
+class resources_settled:
+    """
+    Condition that holds once no new Resource Timing entry has appeared for quiet_ms milliseconds.
+    Works in every browser, without the Chrome performance log.
+    """
+
+    def __init__(self, quiet_ms=500):
+        self.quiet_ms = quiet_ms
+        self.__name__ = f"resources_settled({quiet_ms}ms)"
+        self._count = None
+        self._changed_at = None
+
+    def __call__(self, driver):
+        count = driver.execute_script("return performance.getEntriesByType('resource').length")
+        now = time.perf_counter()
+        if count != self._count:
+            self._count, self._changed_at = count, now
+            return False
+        return (now - self._changed_at) * 1000 >= self.quiet_ms